@@ -1,3 +1,438 @@
+import mmap
+import os
+import struct
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Common CRC parameter sets (width, polynomial, init, reflect in/out, final XOR)
+# taken from the standard CRC catalogue. Each entry can be passed to CRCEngine
+# as keyword arguments, e.g. CRCEngine(**CRC_PRESETS["CRC-32"]).
+CRC_PRESETS = {
+    "CRC-8": dict(width=8, poly=0x07, init=0x00, refin=False, refout=False, xorout=0x00),
+    "CRC-16/ARC": dict(width=16, poly=0x8005, init=0x0000, refin=True, refout=True, xorout=0x0000),
+    "CRC-16/CCITT-FALSE": dict(width=16, poly=0x1021, init=0xFFFF, refin=False, refout=False, xorout=0x0000),
+    "CRC-16/KERMIT": dict(width=16, poly=0x1021, init=0x0000, refin=True, refout=True, xorout=0x0000),
+    "CRC-32": dict(width=32, poly=0x04C11DB7, init=0xFFFFFFFF, refin=True, refout=True, xorout=0xFFFFFFFF),
+    "CRC-32C": dict(width=32, poly=0x1EDC6F41, init=0xFFFFFFFF, refin=True, refout=True, xorout=0xFFFFFFFF),
+}
+
+
+def reflect_bits(value, width):
+    """
+    Reverse the order of the lowest 'width' bits of value.
+
+    Parameters:
+    value (int): The value to reflect.
+    width (int): Number of bits to reflect.
+
+    Returns:
+    int: The bit-reversed value.
+    """
+    result = 0
+    for _ in range(width):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+class CRCEngine:
+    def __init__(self, width, poly, init=0, refin=False, refout=False, xorout=0):
+        """
+        Initialize a table-driven CRC engine for any generator polynomial.
+
+        The engine processes whole bytes using a precomputed 256-entry table,
+        and eight bytes at a time using eight "slicing-by-8" tables, instead of
+        one shift/XOR per message bit.
+
+        Parameters:
+        width (int): Number of CRC bits (e.g. 8, 16 or 32).
+        poly (int): Generator polynomial without its leading x^width term (e.g. 0x1021).
+        init (int): Initial value of the CRC register.
+        refin (bool): If True, each input byte is processed least significant bit first.
+        refout (bool): If True, the final CRC is bit-reversed before the final XOR.
+        xorout (int): Value XORed with the CRC before it is returned.
+        """
+        if width < 1:
+            raise ValueError("CRC width must be at least 1 bit")
+        self.width = width
+        self.mask = (1 << width) - 1
+        self.poly = poly & self.mask
+        self.init = init & self.mask
+        self.refin = refin
+        self.refout = refout
+        self.xorout = xorout & self.mask
+        self.params = dict(width=width, poly=self.poly, init=self.init,
+                           refin=refin, refout=refout, xorout=self.xorout)
+
+        # Non-reflected CRCs narrower than a byte are computed in a register
+        # padded up to 8 bits, so a whole byte can be fed in at once
+        self._shift = 0 if refin else max(0, 8 - width)
+        self._reg_width = width + self._shift
+        self._reg_mask = (1 << self._reg_width) - 1
+
+        # Build the byte table and the seven extra slicing-by-8 tables
+        self.table = self._build_table()
+        self.slice_tables = self._build_slice_tables() if self._reg_width <= 64 else None
+
+    def _build_table(self):
+        """
+        Build the 256-entry table holding the CRC register update for each byte value.
+
+        Returns:
+        list: 256 register values.
+        """
+        table = []
+        if self.refin:
+            # Reflected algorithm: the register shifts right, so use the reversed polynomial
+            poly = reflect_bits(self.poly, self.width)
+            for byte in range(256):
+                crc = byte
+                for _ in range(8):
+                    crc = (crc >> 1) ^ poly if crc & 1 else crc >> 1
+                table.append(crc)
+        else:
+            # Normal algorithm: the register shifts left, byte enters at the top
+            poly = self.poly << self._shift
+            top_bit = 1 << (self._reg_width - 1)
+            for byte in range(256):
+                crc = byte << (self._reg_width - 8)
+                for _ in range(8):
+                    crc = (crc << 1) ^ poly if crc & top_bit else crc << 1
+                table.append(crc & self._reg_mask)
+        return table
+
+    def _build_slice_tables(self):
+        """
+        Build the slicing-by-8 tables. Table k gives the effect of a byte
+        followed by k zero bytes, so eight bytes can be folded in with eight lookups.
+
+        Returns:
+        list: Eight lists of 256 register values (tables[0] is the byte table).
+        """
+        table = self.table
+        tables = [table]
+        for _ in range(7):
+            previous = tables[-1]
+            if self.refin:
+                tables.append([(crc >> 8) ^ table[crc & 0xFF] for crc in previous])
+            else:
+                tables.append([((crc << 8) & self._reg_mask) ^ table[crc >> (self._reg_width - 8)]
+                               for crc in previous])
+        return tables
+
+    def update(self, register, data):
+        """
+        Feed bytes into a raw CRC register using the 256-entry table.
+
+        Parameters:
+        register (int): The current register value (start from initial_register()).
+        data (bytes, bytearray or memoryview): The bytes to process.
+
+        Returns:
+        int: The updated register value.
+        """
+        table = self.table
+        if self.refin:
+            for byte in data:
+                register = (register >> 8) ^ table[(register ^ byte) & 0xFF]
+        else:
+            top = self._reg_width - 8
+            mask = self._reg_mask
+            for byte in data:
+                register = ((register << 8) & mask) ^ table[((register >> top) ^ byte) & 0xFF]
+        return register
+
+    def update_slice8(self, register, data):
+        """
+        Feed bytes into a raw CRC register eight bytes at a time (slicing-by-8).
+        Any tail shorter than eight bytes is handled by the byte table.
+
+        Parameters:
+        register (int): The current register value (start from initial_register()).
+        data (bytes, bytearray or memoryview): The bytes to process.
+
+        Returns:
+        int: The updated register value.
+        """
+        if self.slice_tables is None:
+            return self.update(register, data)
+
+        t0, t1, t2, t3, t4, t5, t6, t7 = self.slice_tables
+        data = memoryview(data).cast("B")
+        blocks = len(data) // 8
+
+        if self.refin:
+            # Little-endian words: the first byte lines up with the low end of the register
+            for (word,) in struct.iter_unpack("<Q", data[:blocks * 8]):
+                word ^= register
+                register = (t7[word & 0xFF] ^ t6[(word >> 8) & 0xFF] ^
+                            t5[(word >> 16) & 0xFF] ^ t4[(word >> 24) & 0xFF] ^
+                            t3[(word >> 32) & 0xFF] ^ t2[(word >> 40) & 0xFF] ^
+                            t1[(word >> 48) & 0xFF] ^ t0[word >> 56])
+        else:
+            # Big-endian words: the first byte lines up with the top of the register
+            align = 64 - self._reg_width
+            for (word,) in struct.iter_unpack(">Q", data[:blocks * 8]):
+                word ^= register << align
+                register = (t7[word >> 56] ^ t6[(word >> 48) & 0xFF] ^
+                            t5[(word >> 40) & 0xFF] ^ t4[(word >> 32) & 0xFF] ^
+                            t3[(word >> 24) & 0xFF] ^ t2[(word >> 16) & 0xFF] ^
+                            t1[(word >> 8) & 0xFF] ^ t0[word & 0xFF])
+
+        return self.update(register, data[blocks * 8:])
+
+    def initial_register(self):
+        """
+        Returns:
+        int: The register value to start a new calculation from.
+        """
+        if self.refin:
+            return reflect_bits(self.init, self.width)
+        return self.init << self._shift
+
+    def finalize(self, register):
+        """
+        Turn a raw register value into the final CRC (undo padding, reflect, final XOR).
+
+        Parameters:
+        register (int): The register value after all data has been processed.
+
+        Returns:
+        int: The CRC value.
+        """
+        crc = register >> self._shift
+        if self.refin != self.refout:
+            crc = reflect_bits(crc, self.width)
+        return crc ^ self.xorout
+
+    def _zero_bit_operator(self):
+        """
+        Build the GF(2) matrix for running the (unpadded) register through one zero bit.
+        The matrix is stored as a list of columns: column i is the image of bit i.
+        """
+        if self.refin:
+            poly = reflect_bits(self.poly, self.width)
+            return [poly] + [1 << (i - 1) for i in range(1, self.width)]
+        top_bit = 1 << (self.width - 1)
+        columns = []
+        for i in range(self.width):
+            value = 1 << i
+            value = (value << 1) ^ self.poly if value & top_bit else value << 1
+            columns.append(value & self.mask)
+        return columns
+
+    def _advance(self, register, n_bytes):
+        """
+        Run an unpadded register through n_bytes zero bytes in O(log n_bytes)
+        matrix squarings, without touching any data.
+        """
+        def apply(matrix, vector):
+            result = 0
+            i = 0
+            while vector:
+                if vector & 1:
+                    result ^= matrix[i]
+                vector >>= 1
+                i += 1
+            return result
+
+        # Start from the operator for one zero byte (eight zero bits)
+        operator = self._zero_bit_operator()
+        for _ in range(3):
+            operator = [apply(operator, column) for column in operator]
+
+        while n_bytes:
+            if n_bytes & 1:
+                register = apply(operator, register)
+            n_bytes >>= 1
+            if n_bytes:
+                operator = [apply(operator, column) for column in operator]
+        return register
+
+    def _unfinalize(self, crc):
+        """
+        Undo the final XOR and output reflection, giving the unpadded register value.
+        """
+        crc ^= self.xorout
+        if self.refin != self.refout:
+            crc = reflect_bits(crc, self.width)
+        return crc
+
+    def combine(self, crc_a, crc_b, len_b):
+        """
+        Combine the CRCs of two consecutive chunks into the CRC of both chunks.
+
+        Parameters:
+        crc_a (int): CRC of the first chunk (as returned by checksum).
+        crc_b (int): CRC of the second chunk (as returned by checksum).
+        len_b (int): Length of the second chunk in bytes.
+
+        Returns:
+        int: The CRC of the first chunk followed by the second.
+        """
+        register_a = self._unfinalize(crc_a)
+        register_b = self._unfinalize(crc_b)
+        # crc_b already contains the effect of the initial value, so take it
+        # out of crc_a before moving crc_a past the second chunk
+        initial = self.initial_register() >> self._shift
+        register = self._advance(register_a ^ initial, len_b) ^ register_b
+        return self.finalize(register << self._shift)
+
+    def checksum(self, data, slicing=True):
+        """
+        Calculate the CRC of a complete message.
+
+        Parameters:
+        data (bytes, bytearray or memoryview): The message.
+        slicing (bool): Use the slicing-by-8 tables (True) or the single byte table (False).
+
+        Returns:
+        int: The CRC value.
+        """
+        update = self.update_slice8 if slicing else self.update
+        return self.finalize(update(self.initial_register(), data))
+
+
+# Per-process state for crc_file workers: the engine and the memory-mapped file
+_worker_engine = None
+_worker_view = None
+
+
+def _init_crc_worker(path, params):
+    """
+    Set up a crc_file worker process: build the engine and map the file read-only.
+    """
+    global _worker_engine, _worker_view
+    _worker_engine = CRCEngine(**params)
+    with open(path, "rb") as f:
+        _worker_view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _crc_chunk(offset, length):
+    """
+    Calculate the CRC of one chunk of the worker's mapped file.
+
+    Returns:
+    tuple: (offset, crc, length) so results can be put back in file order.
+    """
+    return offset, _worker_engine.checksum(_worker_view[offset:offset + length]), length
+
+
+def crc_file(path, spec="CRC-32", workers=None, chunk_size=None):
+    """
+    Calculate the CRC of a file without reading it into memory.
+
+    The file is memory-mapped and split into chunks aligned to the mmap
+    allocation granularity. Each worker process maps the same file and
+    checksums its chunks in place (no copy of the data is made), then the
+    partial CRCs are merged in file order with CRCEngine.combine.
+
+    Parameters:
+    path (str): Path of the file to checksum.
+    spec (CRCEngine, str or dict): An engine, a key of CRC_PRESETS, or CRCEngine keyword arguments.
+    workers (int): Number of worker processes (default: os.cpu_count()). 1 runs in-process.
+    chunk_size (int): Bytes per chunk (default: file size split into 4 chunks per worker).
+
+    Returns:
+    int: The CRC of the whole file.
+    """
+    if isinstance(spec, CRCEngine):
+        engine = spec
+    elif isinstance(spec, str):
+        engine = CRCEngine(**CRC_PRESETS[spec])
+    else:
+        engine = CRCEngine(**spec)
+
+    size = os.path.getsize(path)
+    if size == 0:
+        return engine.checksum(b"")  # mmap cannot map an empty file
+
+    workers = workers or os.cpu_count() or 1
+    granularity = mmap.ALLOCATIONGRANULARITY
+    if chunk_size is None:
+        chunk_size = max(1 << 20, -(-size // (workers * 4)))
+    chunk_size = -(-chunk_size // granularity) * granularity  # Round up to the alignment
+
+    # Small files or a single worker: checksum the mapping directly
+    if workers == 1 or size <= chunk_size:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return engine.checksum(view)
+            finally:
+                view.release()
+
+    chunks = [(offset, min(chunk_size, size - offset)) for offset in range(0, size, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_crc_worker,
+                             initargs=(path, engine.params)) as pool:
+        results = sorted(pool.map(_crc_chunk, *zip(*chunks)))
+
+    # Merge the partial CRCs left to right
+    crc = results[0][1]
+    for _, chunk_crc, length in results[1:]:
+        crc = engine.combine(crc, chunk_crc, length)
+    return crc
+
+
+def benchmark_crc_file(size_mb=32, workers=None, legacy_kb=64):
+    """
+    Print the throughput in MB/s of crc_file against the existing implementations.
+
+    The bit-serial CRC.calculate_crc_bitwise and crc_ccitt work on '0'/'1'
+    strings and are far slower, so they are timed on a smaller sample of
+    legacy_kb kilobytes.
+
+    Parameters:
+    size_mb (int): Size of the temporary test file in megabytes.
+    workers (int): Worker processes for the parallel run (default: os.cpu_count()).
+    legacy_kb (int): Sample size in kilobytes for the string-based implementations.
+    """
+    from Week_8_CRC import crc_ccitt
+
+    data = os.urandom(size_mb << 20)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(data)
+        path = f.name
+
+    def report(label, n_bytes, func):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<40} {n_bytes / elapsed / 1e6:10.2f} MB/s")
+        return result
+
+    try:
+        engine = CRCEngine(**CRC_PRESETS["CRC-32"])
+        serial = report("crc_file (1 worker)", len(data), lambda: crc_file(path, engine, workers=1))
+        parallel = report(f"crc_file ({workers or os.cpu_count()} workers)", len(data),
+                          lambda: crc_file(path, engine, workers=workers))
+        assert serial == parallel
+
+        sample = data[:legacy_kb << 10]
+        bits = "".join(f"{byte:08b}" for byte in sample)
+        report("CRC class (bit-serial, binary string)", len(sample),
+               lambda: CRC(bits, "1" + f"{engine.poly:032b}").calculate_crc_bitwise())
+        report("crc_ccitt (binary string)", len(sample), lambda: crc_ccitt(bits))
+    finally:
+        os.remove(path)
+
+
+# Engines built by CRC.calculate_crc, keyed on (width, poly), so the tables
+# for a generator polynomial are built once rather than on every call
+_ENGINES = {}
+
+
+def _engine_for(width, poly):
+    """
+    Fetch (or build and cache) the plain CRCEngine for a generator polynomial.
+    """
+    engine = _ENGINES.get((width, poly))
+    if engine is None:
+        engine = _ENGINES[width, poly] = CRCEngine(width=width, poly=poly)
+    return engine
+
+
 class CRC:
     def __init__(self, message, generator_polynomial):
         """
@@ -15,6 +450,27 @@ class CRC:
         """
         Calculate the CRC check bits for the given message and generator polynomial.
 
+        The message is packed into bytes and handed to a table-driven CRCEngine,
+        which is cached per generator polynomial. Leading zero bits do not
+        change a CRC that starts from zero, so the message is left-padded with
+        zeros up to a whole number of bytes.
+
+        Returns:
+        str: The CRC check bits as a binary string.
+        """
+        if self.r < 1:
+            return self.calculate_crc_bitwise()
+
+        engine = _engine_for(self.r, int(self.generator_polynomial, 2))
+        n_bytes = (len(self.message) + 7) // 8
+        data = int(self.message, 2).to_bytes(n_bytes, "big") if self.message else b""
+        return bin(engine.checksum(data))[2:].zfill(self.r)
+
+    def calculate_crc_bitwise(self):
+        """
+        Calculate the CRC check bits one message bit at a time. This is the
+        original reference implementation, kept to check the table-driven version.
+
         Returns:
         str: The CRC check bits as a binary string.
         """
@@ -52,13 +508,24 @@ class CRC:
         return self.calculate_crc()
 
 # Example usage
-# Create a CRC object with a message and a generator polynomial
-message = "11010011101100"  # Example binary message
-generator_polynomial = "1101"  # Example binary generator polynomial (P(x) = 1101)
+if __name__ == "__main__":
+    # Create a CRC object with a message and a generator polynomial
+    message = "11010011101100"  # Example binary message
+    generator_polynomial = "1101"  # Example binary generator polynomial (P(x) = 1101)
+
+    # Instantiate the CRC class
+    crc_calculator = CRC(message, generator_polynomial)
+
+    # Call the get_crc method to get the CRC check bits
+    crc_bits = crc_calculator.get_crc()
+    print("CRC Check Bits:", crc_bits)
+
+    # The table-driven result must match the bit-serial reference implementation
+    assert crc_bits == crc_calculator.calculate_crc_bitwise()
 
-# Instantiate the CRC class
-crc_calculator = CRC(message, generator_polynomial)
+    # Table-driven engine on raw bytes, using a standard CRC-32 parameter set
+    crc32 = CRCEngine(**CRC_PRESETS["CRC-32"])
+    print("CRC-32 of b'123456789': %08X" % crc32.checksum(b"123456789"))  # CBF43926
 
-# Call the get_crc method to get the CRC check bits
-crc_bits = crc_calculator.get_crc()
-print("CRC Check Bits:", crc_bits)
+    # Throughput of the parallel memory-mapped CRC against the string-based versions
+    benchmark_crc_file(size_mb=16)
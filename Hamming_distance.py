@@ -0,0 +1,237 @@
+import functools
+import math
+
+import numpy as np
+
+
+def hamming_distance(a, b):
+    # XOR the numbers and count the 1s in the binary representation of the result
+    return (a ^ b).bit_count()
+
+
+def popcount(words):
+    """
+    Count the set bits of every element of a uint64 array.
+
+    Parameters:
+    words (numpy.ndarray): Array of uint64 values.
+
+    Returns:
+    numpy.ndarray: Array of the same shape with the bit count of each value.
+    """
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+ has a native popcount
+        return np.bitwise_count(words)
+
+    # SWAR popcount for older NumPy versions
+    words = words - ((words >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    words = (words & np.uint64(0x3333333333333333)) + ((words >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    words = (words + (words >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((words * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.uint8)
+
+
+def as_code_array(codes):
+    """
+    Bring a batch of fingerprints into the (N, W) uint64 layout used below,
+    where W is the number of 64-bit words per code (1 for 64-bit, 4 for 256-bit).
+
+    Parameters:
+    codes (numpy.ndarray): (N,) array of 64-bit codes or (N, W) array of words.
+
+    Returns:
+    numpy.ndarray: (N, W) uint64 array.
+    """
+    codes = np.asarray(codes, dtype=np.uint64)
+    return codes.reshape(len(codes), -1) if codes.ndim else codes.reshape(1, 1)
+
+
+def hamming_distance_one_to_many(query, codes):
+    """
+    Hamming distances from one code to every code in a batch.
+
+    Parameters:
+    query (numpy.ndarray or int): One code (a uint64 or a (W,) array of words).
+    codes (numpy.ndarray): (N,) or (N, W) array of codes.
+
+    Returns:
+    numpy.ndarray: (N,) array of distances.
+    """
+    codes = as_code_array(codes)
+    query = np.asarray(query, dtype=np.uint64).reshape(1, -1)
+    return popcount(codes ^ query).sum(axis=1, dtype=np.int64)
+
+
+def hamming_distance_many_to_many(queries, codes, block_size=1024):
+    """
+    Hamming distance matrix between two batches of codes. Queries and codes are
+    processed in block_size x block_size tiles, one word at a time, so the
+    temporary XOR array never holds more than block_size**2 words.
+
+    Parameters:
+    queries (numpy.ndarray): (Q,) or (Q, W) array of codes.
+    codes (numpy.ndarray): (N,) or (N, W) array of codes.
+    block_size (int): Number of queries and codes per tile.
+
+    Returns:
+    numpy.ndarray: (Q, N) array of distances.
+    """
+    queries = as_code_array(queries)
+    codes = as_code_array(codes)
+    distances = np.empty((len(queries), len(codes)), dtype=np.int64)
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size]
+        for code_start in range(0, len(codes), block_size):
+            tile = distances[start:start + block_size, code_start:code_start + block_size]
+            tile[...] = 0
+            for word in range(codes.shape[1]):
+                tile += popcount(block[:, word, None] ^ codes[None, code_start:code_start + block_size, word])
+    return distances
+
+
+@functools.lru_cache(maxsize=64)
+def flip_masks(length, radius):
+    """
+    All masks of 'length' bits with at most 'radius' bits set, in order of weight.
+    Masks of weight w + 1 are built from those of weight w by setting one bit
+    above their highest set bit, so every mask is produced exactly once. The
+    table is cached and read-only, as every query probes with the same masks.
+
+    Parameters:
+    length (int): Number of bits in a mask (at most 64).
+    radius (int): Maximum number of set bits.
+
+    Returns:
+    numpy.ndarray: uint64 array of sum(comb(length, w) for w <= radius) masks.
+    """
+    tables = [np.zeros(1, dtype=np.uint64)]
+    masks = np.zeros(1, dtype=np.uint64)
+    next_bit = np.zeros(1, dtype=np.int64)  # Lowest bit each mask may still set
+    for _ in range(min(radius, length)):
+        counts = length - next_bit
+        parents = np.repeat(np.arange(len(masks)), counts)
+        # Position of each child's new bit: next_bit of its parent plus 0, 1, 2, ...
+        offsets = np.arange(len(parents)) - np.repeat(np.cumsum(counts) - counts, counts)
+        bits = next_bit[parents] + offsets
+        masks = masks[parents] | (np.uint64(1) << bits.astype(np.uint64))
+        next_bit = bits + 1
+        tables.append(masks)
+    table = np.concatenate(tables)
+    table.flags.writeable = False
+    return table
+
+
+class MultiIndexHash:
+    """
+    Multi-index hashing for radius queries over binary codes.
+
+    Each code is split into m disjoint substrings. If two codes are within
+    distance r, at least one of their substrings differs in at most r // m bits
+    (pigeonhole principle), so only the buckets near each query substring need
+    to be searched, and those candidates are then checked with the full distance.
+    Each substring table keeps the code ids sorted by substring value, so a
+    bucket lookup is a binary search rather than a per-key Python object.
+    When a radius is so large that probing the buckets would cost more than
+    comparing against every code (for example r=17 with m=2 means about 15
+    million probes per substring), the query falls back to a linear scan.
+    """
+
+    def __init__(self, codes, m=4):
+        """
+        Build the substring tables.
+
+        Parameters:
+        codes (numpy.ndarray): (N,) or (N, W) array of codes to index.
+        m (int): Number of substrings to split each code into.
+        """
+        self.codes = as_code_array(codes)
+        self.bits = self.codes.shape[1] * 64
+        if not 1 <= m <= self.bits or self.bits // m > 63:
+            raise ValueError("substrings must be between 1 and 63 bits long")
+        self.m = m
+
+        # Substring j covers bits [bounds[j], bounds[j + 1]) of the code
+        self.bounds = [j * self.bits // m for j in range(m + 1)]
+
+        self.tables = []
+        for j in range(m):
+            keys = self._substring(self.codes, j)
+            order = np.argsort(keys, kind="stable")
+            self.tables.append((keys[order], order))
+
+    def _substring(self, codes, j):
+        """
+        Extract substring j of every code as a uint64 array.
+        """
+        start, stop = self.bounds[j], self.bounds[j + 1]
+        length = stop - start
+        word, offset = divmod(start, 64)
+        value = codes[:, word] >> np.uint64(offset)
+        if offset + length > 64:  # Substring spans two words
+            value |= codes[:, word + 1] << np.uint64(64 - offset)
+        return value & np.uint64((1 << length) - 1)
+
+    def _probe_count(self, radius):
+        """
+        Number of bucket probes a query with this radius makes over all tables.
+        """
+        total = 0
+        for j in range(self.m):
+            length = self.bounds[j + 1] - self.bounds[j]
+            total += sum(math.comb(length, w) for w in range(min(radius, length) + 1))
+        return total
+
+    def query(self, query, radius):
+        """
+        Find every indexed code within a given Hamming distance of the query.
+
+        Parameters:
+        query (numpy.ndarray or int): One code (a uint64 or a (W,) array of words).
+        radius (int): Maximum Hamming distance.
+
+        Returns:
+        tuple: (ids, distances) arrays, sorted by id.
+        """
+        query = np.asarray(query, dtype=np.uint64).reshape(1, -1)
+        sub_radius = radius // self.m
+
+        if self._probe_count(sub_radius) > len(self.codes):
+            # Too many probes to beat a linear scan
+            distances = hamming_distance_one_to_many(query, self.codes)
+            ids = np.flatnonzero(distances <= radius)
+            return ids, distances[ids]
+
+        candidates = []
+        for j, (sorted_keys, order) in enumerate(self.tables):
+            length = self.bounds[j + 1] - self.bounds[j]
+            probes = self._substring(query, j)[0] ^ flip_masks(length, sub_radius)
+            lo = np.searchsorted(sorted_keys, probes, side="left")
+            hi = np.searchsorted(sorted_keys, probes, side="right")
+            for a, b in zip(lo[lo < hi], hi[lo < hi]):
+                candidates.append(order[a:b])
+
+        if not candidates:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.int64)
+
+        # Verify the candidates with the full distance
+        ids = np.unique(np.concatenate(candidates))
+        distances = hamming_distance_one_to_many(query, self.codes[ids])
+        keep = distances <= radius
+        return ids[keep], distances[keep]
+
+
+# Example
+if __name__ == "__main__":
+    num1 = 0b1011001
+    num2 = 0b1001101
+    print(hamming_distance(num1, num2))  # Output: 2
+
+    # Bulk distances over 64-bit fingerprints
+    rng = np.random.default_rng(0)
+    fingerprints = rng.integers(0, 2**63, size=100_000, dtype=np.uint64)
+    print(hamming_distance_one_to_many(fingerprints[0], fingerprints[:5]))
+    print(hamming_distance_many_to_many(fingerprints[:3], fingerprints[:4]))
+
+    # Sub-linear radius query with multi-index hashing
+    index = MultiIndexHash(fingerprints, m=4)
+    near_duplicate = fingerprints[42] ^ np.uint64(0b10010001)  # Flip 3 bits
+    ids, distances = index.query(near_duplicate, radius=6)
+    print(f"Codes within distance 6: {ids}, distances: {distances}")
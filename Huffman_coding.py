@@ -1,5 +1,8 @@
 import heapq
 import math
+import time
+
+import numpy as np
 
 # Node Class: Represents a tree node with character, frequency, and pointers to left and right children.
 class Node:
@@ -93,6 +96,450 @@ def calculate_entropy(characters):
     return entropy
 
 
+# Array-based construction: code lengths without building a tree of Node objects.
+def huffman_code_lengths(frequencies, presorted=False):
+    """
+    Computes optimal Huffman code lengths in O(n) with the two-queue method,
+    run in place over a single array (Moffat and Katajainen). The sorted
+    leaves form the first queue and the internal nodes, which are created in
+    non-decreasing weight order, form the second queue in the same array.
+
+    Parameters:
+    frequencies (list): Frequency (or count) of each symbol.
+    presorted (bool): True if frequencies are already in non-decreasing order (skips the sort).
+
+    Returns:
+    numpy.ndarray: Code length for each symbol (0 for symbols with zero frequency).
+    """
+    frequencies = np.asarray(frequencies)
+    lengths = np.zeros(len(frequencies), dtype=np.int64)
+    order = np.arange(len(frequencies)) if presorted else np.argsort(frequencies, kind="stable")
+    order = order[frequencies[order] > 0]
+    n = len(order)
+    if n <= 1:
+        lengths[order] = 1  # A lone symbol still needs one bit
+        return lengths
+
+    A = frequencies[order].tolist()
+
+    # Phase 1: combine the two lightest items of the two queues; A[next] becomes
+    # the new internal node's weight and the children store their parent's index
+    leaf = 0
+    root = 0
+    for next_node in range(n - 1):
+        for child in range(2):
+            if leaf >= n or (root < next_node and A[root] < A[leaf]):
+                weight = A[root]
+                A[root] = next_node
+                root += 1
+            else:
+                weight = A[leaf]
+                leaf += 1
+            A[next_node] = weight if child == 0 else A[next_node] + weight
+
+    # Phase 2: turn parent pointers into internal node depths (root is A[n - 2])
+    A[n - 2] = 0
+    for next_node in range(n - 3, -1, -1):
+        A[next_node] = A[A[next_node]] + 1
+
+    # Phase 3: count internal nodes per depth to get leaf depths, longest first
+    available = 1
+    used = 0
+    depth = 0
+    root = n - 2
+    next_node = n - 1
+    while available > 0:
+        while root >= 0 and A[root] == depth:
+            used += 1
+            root -= 1
+        while available > used:
+            A[next_node] = depth
+            next_node -= 1
+            available -= 1
+        available = 2 * used
+        depth += 1
+        used = 0
+
+    lengths[order] = A
+    return lengths
+
+
+def huffman_code_lengths_limited(frequencies, max_length):
+    """
+    Computes optimal code lengths that are no longer than max_length bits
+    using the package-merge algorithm, so the codes stay table-decodable.
+
+    Each level's list holds the sorted leaf weights merged with "packages"
+    (pairs) from the level below. Only weights and package flags are stored;
+    a symbol's code length is the number of levels in which it is selected.
+
+    Parameters:
+    frequencies (list): Frequency (or count) of each symbol.
+    max_length (int): Maximum allowed code length in bits.
+
+    Returns:
+    numpy.ndarray: Code length for each symbol (0 for symbols with zero frequency).
+    """
+    frequencies = np.asarray(frequencies)
+    lengths = np.zeros(len(frequencies), dtype=np.int64)
+    order = np.argsort(frequencies, kind="stable")
+    order = order[frequencies[order] > 0]
+    n = len(order)
+    if n <= 1:
+        lengths[order] = 1
+        return lengths
+    if n > 1 << max_length:
+        raise ValueError(f"{n} symbols cannot be coded in {max_length} bits")
+
+    leaves = frequencies[order].astype(np.float64)
+
+    # Build the lists from the deepest level up, keeping a package flag per item
+    levels = []
+    items = leaves
+    is_package = np.zeros(n, dtype=bool)
+    levels.append(is_package)
+    for _ in range(max_length - 1):
+        packages = items[0:len(items) - 1:2] + items[1::2]
+        merged = np.concatenate([leaves, packages])
+        flags = np.concatenate([np.zeros(n, dtype=bool), np.ones(len(packages), dtype=bool)])
+        rank = np.argsort(merged, kind="stable")  # Leaves come first on ties
+        items = merged[rank]
+        is_package = flags[rank]
+        levels.append(is_package)
+
+    # Select the 2n - 2 cheapest items at the top level and walk down: the
+    # selection is always a prefix of each list, whose leaves are the lightest
+    # symbols, and each selected package selects two items one level down
+    counts = np.zeros(n + 1, dtype=np.int64)
+    selected = 2 * n - 2
+    for is_package in reversed(levels):
+        packages_selected = int(np.count_nonzero(is_package[:selected]))
+        counts[selected - packages_selected] += 1  # The lightest leaves get one more bit
+        selected = 2 * packages_selected
+    lengths[order] = np.cumsum(counts[::-1])[::-1][1:]
+    return lengths
+
+
+def benchmark_huffman_builders(sizes=(256, 4096, 65536, 262144), max_length=None):
+    """
+    Prints the time to compute code lengths with the heap-based huffman_tree,
+    the two-queue builder and package-merge, for several alphabet sizes.
+
+    Parameters:
+    sizes (tuple): Alphabet sizes to test.
+    max_length (int): Length limit for package-merge (default: 4 bits above the minimum).
+    """
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        frequencies = rng.zipf(1.3, size=size)  # Skewed, like word or match-length alphabets
+        limit = max_length or (size - 1).bit_length() + 4
+
+        start = time.perf_counter()
+        tree_lengths = code_lengths_from_tree(huffman_tree(list(enumerate(frequencies.tolist()))), size)
+        heap_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        two_queue_lengths = huffman_code_lengths(frequencies)
+        two_queue_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        limited_lengths = huffman_code_lengths_limited(frequencies, limit)
+        limited_time = time.perf_counter() - start
+
+        # Both unlimited builders must give the same total code length
+        assert np.dot(frequencies, tree_lengths) == np.dot(frequencies, two_queue_lengths)
+        print(f"n={size:<8} heap {heap_time * 1e3:9.2f} ms  two-queue {two_queue_time * 1e3:9.2f} ms  "
+              f"package-merge (L={limit}) {limited_time * 1e3:9.2f} ms  "
+              f"max length {int(two_queue_lengths.max())} -> {int(limited_lengths.max())}")
+
+
+# Canonical Huffman Coding: the codebook is fully described by the code length of each symbol.
+def code_lengths_from_tree(root, alphabet_size):
+    """
+    Reads the code length (leaf depth) of every symbol from a Huffman Tree.
+
+    Parameters:
+    root (Node): The root of the Huffman Tree (leaf chars are integer symbols).
+    alphabet_size (int): Number of possible symbols.
+
+    Returns:
+    list: Code length for each symbol (0 for symbols that do not occur).
+    """
+    lengths = [0] * alphabet_size
+    stack = [(root, 0)]
+    while stack:  # Iterative walk, so deep trees cannot hit the recursion limit
+        node, depth = stack.pop()
+        if node.left is None and node.right is None:
+            lengths[node.char] = max(depth, 1)  # A lone symbol still needs one bit
+        else:
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+    return lengths
+
+
+class CanonicalCodebook:
+    """
+    Canonical Huffman codebook for byte data.
+
+    Codes are assigned in order of (length, symbol), so only the code lengths
+    need to be stored. Encoding bit-packs with NumPy and decoding uses a
+    TABLE_BITS-wide lookup table that can emit several symbols per lookup.
+    """
+
+    TABLE_BITS = 14
+
+    def __init__(self, lengths):
+        """
+        Initializes the codebook from code lengths.
+
+        Parameters:
+        lengths (list): Code length for each of the 256 byte values (0 if unused).
+        """
+        self.lengths = list(lengths) + [0] * (256 - len(lengths))
+        self.max_length = max(self.lengths)
+        if sum(2.0 ** -l for l in self.lengths if l) > 1:
+            raise ValueError("Code lengths do not form a prefix code")
+
+        # Step 1: Assign canonical codes, shortest first, ties broken by symbol value
+        self.sorted_symbols = sorted((s for s in range(256) if self.lengths[s]), key=lambda s: (self.lengths[s], s))
+        self.codes = [0] * 256
+        code = 0
+        previous_length = 0
+        for symbol in self.sorted_symbols:
+            code <<= self.lengths[symbol] - previous_length
+            self.codes[symbol] = code
+            previous_length = self.lengths[symbol]
+            code += 1
+
+        # Step 2: Per-length first code and offset, used to decode codes longer than the table
+        self.first_code = [0] * (self.max_length + 2)
+        self.first_index = [0] * (self.max_length + 2)
+        self.count = [0] * (self.max_length + 2)
+        for symbol in self.sorted_symbols:
+            self.count[self.lengths[symbol]] += 1
+        for index, symbol in reversed(list(enumerate(self.sorted_symbols))):
+            length = self.lengths[symbol]
+            self.first_code[length] = self.codes[symbol]
+            self.first_index[length] = index
+
+        self.table = self._build_table()
+
+    @classmethod
+    def from_frequencies(cls, frequencies, max_length=None):
+        """
+        Builds the codebook from symbol frequencies.
+
+        Parameters:
+        frequencies (list): Frequency (or count) of each byte value.
+        max_length (int): Optional limit on the code length (uses package-merge).
+
+        Returns:
+        CanonicalCodebook: The codebook.
+        """
+        if max_length is None:
+            return cls(huffman_code_lengths(frequencies).tolist())
+        return cls(huffman_code_lengths_limited(frequencies, max_length).tolist())
+
+    @classmethod
+    def from_data(cls, data, max_length=None):
+        """
+        Builds the codebook from the byte frequencies of some data.
+        """
+        frequencies = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        return cls.from_frequencies(frequencies, max_length)
+
+    def serialize(self):
+        """
+        Stores the codebook as code lengths only: two lengths per byte (128 bytes)
+        when every length fits in 4 bits, otherwise one length per byte (256 bytes).
+
+        Returns:
+        bytes: The serialised codebook.
+        """
+        if self.max_length <= 15:
+            return bytes((self.lengths[i] << 4) | self.lengths[i + 1] for i in range(0, 256, 2))
+        return bytes(self.lengths)
+
+    @classmethod
+    def deserialize(cls, data):
+        """
+        Rebuilds a codebook from the output of serialize.
+        """
+        if len(data) == 128:
+            return cls([length for byte in data for length in (byte >> 4, byte & 0x0F)])
+        if len(data) == 256:
+            return cls(list(data))
+        raise ValueError("Serialised codebook must be 128 or 256 bytes")
+
+    def _build_table(self):
+        """
+        Builds the decoding table. Entry i describes the next TABLE_BITS bits of
+        input equal to i: the symbols that can be fully decoded from them and
+        how many bits they use (0 bits means the next code is longer than the table).
+        """
+        bits = self.TABLE_BITS
+        size = 1 << bits
+
+        # Single-symbol table: every index starting with a code maps to that code
+        single = [None] * size
+        for symbol in self.sorted_symbols:
+            length = self.lengths[symbol]
+            if length <= bits:
+                start = self.codes[symbol] << (bits - length)
+                for index in range(start, start + (1 << (bits - length))):
+                    single[index] = (symbol, length)
+
+        # Multi-symbol table: keep decoding while whole codes fit in the remaining bits
+        table = []
+        for index in range(size):
+            symbols = bytearray()
+            used = 0
+            while True:
+                entry = single[(index << used) & (size - 1)]
+                if entry is None or used + entry[1] > bits:
+                    break
+                symbols.append(entry[0])
+                used += entry[1]
+            table.append((bytes(symbols), used))
+        return table
+
+    def encode(self, data, block_size=1 << 16):
+        """
+        Encodes bytes into a packed bit stream (most significant bit first).
+
+        Parameters:
+        data (bytes): The data to encode.
+        block_size (int): Number of symbols to process per NumPy pass.
+
+        Returns:
+        bytearray: The encoded bits, zero padded to a whole byte.
+        """
+        symbols_all = np.frombuffer(data, dtype=np.uint8)
+        lengths = np.array(self.lengths, dtype=np.int64)
+        if len(symbols_all) and not lengths[symbols_all].all():
+            raise ValueError("Data contains a symbol that is not in the codebook")
+
+        # Bit pattern of every code, left aligned in a row of max_length bits,
+        # plus a mask of which bits of each row belong to the code
+        columns = np.arange(self.max_length)
+        patterns = np.array([[(self.codes[s] >> (self.lengths[s] - 1 - j)) & 1 if j < self.lengths[s] else 0
+                              for j in columns] for s in range(256)], dtype=np.uint8)
+        valid = columns[None, :] < lengths[:, None]
+
+        out = bytearray()
+        carry = np.zeros(0, dtype=np.uint8)  # Bits left over from the previous block
+        for start in range(0, len(symbols_all), block_size):
+            symbols = symbols_all[start:start + block_size]
+
+            # Gathering the rows and keeping only the valid bits concatenates the codes in order
+            bits = np.concatenate([carry, patterns[symbols][valid[symbols]]])
+
+            whole = len(bits) - len(bits) % 8
+            out += np.packbits(bits[:whole]).tobytes()
+            carry = bits[whole:]
+
+        out += np.packbits(carry).tobytes()
+        return out
+
+    def _decode_long(self, data, bit_pos):
+        """
+        Decodes one code longer than the table, bit by bit, starting at bit_pos.
+
+        Returns:
+        tuple: (symbol, code length).
+        """
+        code = 0
+        for length in range(1, self.max_length + 1):
+            position = bit_pos + length - 1
+            code = (code << 1) | ((int(data[position >> 3]) >> (7 - (position & 7))) & 1)
+            if self.count[length] and 0 <= code - self.first_code[length] < self.count[length]:
+                return self.sorted_symbols[self.first_index[length] + code - self.first_code[length]], length
+        raise ValueError("Invalid Huffman code in input")
+
+    def decode(self, data, n_symbols, block_size=1 << 16):
+        """
+        Decodes a packed bit stream produced by encode.
+
+        Parameters:
+        data (bytes): The encoded bits.
+        n_symbols (int): Number of symbols to decode.
+        block_size (int): Number of input bytes to prepare per block.
+
+        Returns:
+        bytes: The decoded data.
+        """
+        table = self.table
+        bits = self.TABLE_BITS
+        mask = (1 << bits) - 1
+        shift = 24 - bits  # Lookups read a 24-bit window starting at the current byte
+
+        # Zero padding lets the last lookups read past the end of the data
+        padded = np.concatenate([np.frombuffer(data, dtype=np.uint8),
+                                 np.zeros(3 + (self.max_length + 7) // 8, dtype=np.uint8)]).astype(np.uint32)
+        out = bytearray()
+        bit_pos = 0
+        for block_start in range(0, len(data) + 1, block_size):
+            block_end = min(block_start + block_size, len(data) + 1)
+
+            # windows[i] holds the 3 bytes starting at byte block_start + i
+            window_bytes = padded[block_start:block_end + 2]
+            windows = ((window_bytes[:-2] << 16) | (window_bytes[1:-1] << 8) | window_bytes[2:]).tolist()
+            end_bit = block_end * 8
+            base = block_start * 8
+
+            while bit_pos < end_bit and len(out) < n_symbols:
+                offset = bit_pos - base
+                symbols, used = table[(windows[offset >> 3] >> (shift - (offset & 7))) & mask]
+                if used:
+                    out += symbols
+                    bit_pos += used
+                else:
+                    symbol, length = self._decode_long(padded, bit_pos)
+                    out.append(symbol)
+                    bit_pos += length
+
+        del out[n_symbols:]  # The last lookup may decode padding bits
+        # Zero padding can decode as real symbols, so also check the bits actually used
+        used_bits = int(np.array(self.lengths)[np.frombuffer(out, dtype=np.uint8)].sum())
+        if len(out) < n_symbols or used_bits > len(data) * 8:
+            raise ValueError("Encoded data ended early")
+        return bytes(out)
+
+
+def huffman_compress(data):
+    """
+    Compresses bytes with a canonical Huffman code built from their frequencies.
+
+    Output layout: serialised codebook length (1 byte), codebook, number of
+    symbols (8 bytes, big-endian), then the encoded bits.
+
+    Parameters:
+    data (bytes): The data to compress.
+
+    Returns:
+    bytes: The compressed data.
+    """
+    codebook = CanonicalCodebook.from_data(data)
+    header = codebook.serialize()
+    return bytes([len(header) // 128]) + header + len(data).to_bytes(8, "big") + codebook.encode(data)
+
+
+def huffman_decompress(data):
+    """
+    Decompresses the output of huffman_compress.
+
+    Parameters:
+    data (bytes): The compressed data.
+
+    Returns:
+    bytes: The original data.
+    """
+    header_end = 1 + data[0] * 128
+    codebook = CanonicalCodebook.deserialize(data[1:header_end])
+    n_symbols = int.from_bytes(data[header_end:header_end + 8], "big")
+    return codebook.decode(memoryview(data)[header_end + 8:], n_symbols)
+
+
 # Example usage
 if __name__ == "__main__":
     # Input characters and their frequencies
@@ -108,3 +555,12 @@ if __name__ == "__main__":
     # Calculate and print the entropy of the symbols
     entropy = calculate_entropy(characters)
     print(f"\nEntropy of the symbols: {entropy:.4f} bits/symbol")
+
+    # Canonical Huffman compression of a byte string
+    text = b"this is an example of a huffman tree" * 100
+    packed = huffman_compress(text)
+    assert huffman_decompress(packed) == text
+    print(f"Compressed {len(text)} bytes to {len(packed)} bytes")
+
+    # Compare the tree, two-queue and length-limited builders on large alphabets
+    benchmark_huffman_builders()
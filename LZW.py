@@ -1,3 +1,7 @@
+import time
+import zlib
+
+
 def lzw_encoding(input_string, initial_dictionary):
     """
     Perform LZW encoding on an input string.
@@ -35,6 +39,250 @@ def lzw_encoding(input_string, initial_dictionary):
     return codewords
 
 
+def lzw_decode(codewords, initial_dictionary):
+    """
+    Perform LZW decoding of codewords produced by lzw_encoding.
+
+    Parameters:
+    codewords (list): The list of codewords to decode.
+    initial_dictionary (dict): The same initial dictionary used for encoding.
+
+    Returns:
+    str: The decoded string.
+    """
+    if not codewords:
+        return ""
+
+    # Reverse dictionary: codeword -> sequence, growing exactly as the encoder's did
+    dictionary = {code: seq for seq, code in initial_dictionary.items()}
+    next_code = len(initial_dictionary) + 1
+
+    w = dictionary[codewords[0]]
+    output = [w]
+    for code in codewords[1:]:
+        if code in dictionary:
+            entry = dictionary[code]
+        elif code == next_code:
+            # The encoder used the entry it had just created (the "cScSc" case)
+            entry = w + w[0]
+        else:
+            raise ValueError(f"Invalid LZW codeword: {code}")
+        output.append(entry)
+
+        # Add the sequence the encoder added one step earlier
+        dictionary[next_code] = w + entry[0]
+        next_code += 1
+        w = entry
+
+    return "".join(output)
+
+
+# Codes for the byte-oriented compressor: 0-255 are literal bytes,
+# CLEAR_CODE resets the dictionary and new entries start at FIRST_CODE
+CLEAR_CODE = 256
+FIRST_CODE = 257
+MIN_BITS = 9
+MAX_BITS = 16
+
+
+class LZWCompressor:
+    """
+    Incremental LZW compressor for unbounded byte streams.
+
+    Feed it chunks as they arrive; each call returns the compressed bytes that
+    are ready so far, and flush() returns the rest. The output is identical to
+    compress() on the concatenated input.
+
+    The dictionary is keyed on (prefix code, next byte) integer pairs, packed
+    into one int, so each input byte costs one O(1) lookup no matter how long
+    the current phrase is, and memory is bounded by the 2^16-entry dictionary.
+    """
+
+    def __init__(self):
+        self.dictionary = {}
+        self.next_code = FIRST_CODE
+        self.w = -1  # Code of the current sequence (-1 before the first byte)
+        self.bit_buffer = 0
+        self.bit_count = 0
+
+    def feed(self, chunk):
+        """
+        Compress the next chunk of input.
+
+        Parameters:
+        chunk (bytes): The next bytes of the stream.
+
+        Returns:
+        bytes: Compressed bytes completed by this chunk (may be empty).
+        """
+        max_code = 1 << MAX_BITS
+
+        # Every input byte produces at most one code of at most MAX_BITS bits,
+        # plus occasional CLEAR_CODEs, so this buffer never needs to grow
+        out = bytearray(len(chunk) * MAX_BITS // 8 + len(chunk) // (max_code - FIRST_CODE) * 2 + 8)
+        pos = 0
+
+        # Work on local copies of the state for speed
+        dictionary = self.dictionary
+        next_code = self.next_code
+        w = self.w
+        bit_buffer = self.bit_buffer
+        bit_count = self.bit_count
+
+        for k in chunk:
+            if w < 0:
+                w = k
+                continue
+            code = dictionary.get((w << 8) | k)
+            if code is not None:
+                w = code  # Extend the current sequence
+                continue
+
+            # Output w with the width needed for the largest code emitted so far
+            bit_buffer |= w << bit_count
+            bit_count += min((next_code - 1).bit_length(), MAX_BITS)
+
+            if next_code < max_code:
+                dictionary[(w << 8) | k] = next_code
+                next_code += 1
+            else:
+                # Dictionary full: tell the decoder to start again
+                bit_buffer |= CLEAR_CODE << bit_count
+                bit_count += MAX_BITS
+                dictionary.clear()
+                next_code = FIRST_CODE
+            w = k
+
+            while bit_count >= 8:
+                out[pos] = bit_buffer & 0xFF
+                pos += 1
+                bit_buffer >>= 8
+                bit_count -= 8
+
+        self.next_code = next_code
+        self.w = w
+        self.bit_buffer = bit_buffer
+        self.bit_count = bit_count
+
+        del out[pos:]
+        return bytes(out)
+
+    def flush(self):
+        """
+        Output the final sequence and any remaining bits. The compressor is
+        reset afterwards, so it can be reused for a new stream.
+
+        Returns:
+        bytes: The last compressed bytes of the stream.
+        """
+        bit_buffer = self.bit_buffer
+        bit_count = self.bit_count
+        if self.w >= 0:
+            bit_buffer |= self.w << bit_count
+            bit_count += min((self.next_code - 1).bit_length(), MAX_BITS)
+
+        out = bytearray((bit_count + 7) // 8)
+        for pos in range(len(out)):
+            out[pos] = bit_buffer & 0xFF
+            bit_buffer >>= 8
+
+        self.__init__()
+        return bytes(out)
+
+
+def compress(data):
+    """
+    Compress bytes with LZW, packing the codes into a variable-width bit stream.
+
+    Codes start 9 bits wide and grow by one bit each time the dictionary
+    outgrows the current width, up to 16 bits. When the dictionary is full a
+    CLEAR_CODE is emitted and it starts again from the 256 single bytes.
+
+    Parameters:
+    data (bytes): The data to compress.
+
+    Returns:
+    bytes: The compressed bit stream (codes packed least significant bit first).
+    """
+    compressor = LZWCompressor()
+    return compressor.feed(data) + compressor.flush()
+
+
+def decompress(data):
+    """
+    Decompress a bit stream produced by compress.
+
+    Parameters:
+    data (bytes): The compressed data.
+
+    Returns:
+    bytes: The original data.
+    """
+    out = bytearray()
+    table = [bytes([i]) for i in range(256)] + [b""]  # Index 256 is CLEAR_CODE
+    w = None
+
+    # Read codes from the bit stream; the padding in the last byte is always
+    # shorter than a code, so running out of whole codes marks the end
+    bit_buffer = 0
+    bit_count = 0
+    pos = 0
+    n = len(data)
+    while True:
+        width = min(len(table).bit_length(), MAX_BITS) if w is not None else MIN_BITS
+        while bit_count < width and pos < n:
+            bit_buffer |= data[pos] << bit_count
+            pos += 1
+            bit_count += 8
+        if bit_count < width:
+            break
+        code = bit_buffer & ((1 << width) - 1)
+        bit_buffer >>= width
+        bit_count -= width
+
+        if code == CLEAR_CODE:
+            del table[FIRST_CODE:]
+            w = None
+            continue
+
+        if code < len(table):
+            entry = table[code]
+        elif code == len(table) and w is not None:
+            entry = w + w[:1]  # The sequence the encoder had only just added
+        else:
+            raise ValueError(f"Invalid LZW code: {code}")
+        out += entry
+
+        if w is not None and len(table) < 1 << MAX_BITS:
+            table.append(w + entry[:1])
+        w = entry
+
+    return bytes(out)
+
+
+def benchmark_lzw(data):
+    """
+    Print the compression ratio and MB/s of compress/decompress against zlib.
+
+    Parameters:
+    data (bytes): Sample data, e.g. the contents of a log file.
+    """
+    # Throughput is always measured against the uncompressed size
+    def report(label, func, payload):
+        start = time.perf_counter()
+        result = func(payload)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {len(data) / elapsed / 1e6:8.2f} MB/s")
+        return result
+
+    packed = report("lzw compress", compress, data)
+    assert report("lzw decompress", decompress, packed) == data
+    packed_zlib = report("zlib compress", zlib.compress, data)
+    report("zlib decompress", zlib.decompress, packed_zlib)
+    print(f"Compression ratio: lzw {len(data) / max(len(packed), 1):.2f}, "
+          f"zlib {len(data) / max(len(packed_zlib), 1):.2f}")
+
+
 # Example Usage
 if __name__ == "__main__":
     # Input string and initial dictionary
@@ -45,3 +293,19 @@ if __name__ == "__main__":
     encoded_output = lzw_encoding(input_string, initial_dictionary)
 
     print("Encoded Output:", encoded_output)
+
+    # Decode it again
+    print("Decoded Output:", lzw_decode(encoded_output, initial_dictionary))
+
+    # Byte-oriented compression with variable-width codes
+    sample = b"TOBEORNOTTOBEORTOBEORNOT" * 1000
+    packed = compress(sample)
+    assert decompress(packed) == sample
+    print(f"Compressed {len(sample)} bytes to {len(packed)} bytes")
+
+    # Streaming compression, one chunk at a time
+    compressor = LZWCompressor()
+    chunks = [compressor.feed(sample[i:i + 4096]) for i in range(0, len(sample), 4096)]
+    chunks.append(compressor.flush())
+    assert b"".join(chunks) == packed
+    benchmark_lzw(sample)
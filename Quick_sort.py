@@ -1,11 +1,139 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # The NumPy fast path is optional
+    np = None
+
+
+def _sort_bucket(keys_name, index_name, dtype, n, start, end):
+    """
+    Sort one sample-sort bucket in place inside shared memory (runs in a worker process).
+    When index_name is given, the matching original positions are permuted alongside the keys.
+    """
+    keys_shm = shared_memory.SharedMemory(name=keys_name)
+    try:
+        keys = np.ndarray((n,), dtype=dtype, buffer=keys_shm.buf)
+        if index_name is None:
+            keys[start:end].sort(kind="quicksort")
+        else:
+            index_shm = shared_memory.SharedMemory(name=index_name)
+            try:
+                index = np.ndarray((n,), dtype=np.int64, buffer=index_shm.buf)
+                order = np.argsort(keys[start:end], kind="stable")
+                keys[start:end] = keys[start:end][order]
+                index[start:end] = index[start:end][order]
+                del index
+            finally:
+                index_shm.close()
+        del keys
+    finally:
+        keys_shm.close()
+
+
 class QuickSort:
-    def __init__(self, array):
+    # Below this size a partition is finished off with insertion sort
+    INSERTION_SORT_CUTOFF = 16
+    # Splitter sample drawn per bucket in parallel sample sort
+    OVERSAMPLING = 64
+
+    def __init__(self, array, mode="auto", key=None, workers=None, dtype=None, run_size=1 << 24, output=None,
+                 in_place=False):
+        """
+        Parameters:
+        array (list, numpy.ndarray, str or pathlib.Path): The values to sort, or for "external"
+                    mode the path of a raw binary file of values.
+        mode (str): "auto" picks "external" for a pathlib.Path (a str is sorted as a sequence
+                    of characters; pass mode="external" to sort the file it names),
+                    "numpy" for homogeneous numeric input
+                    and "introsort" otherwise.
+                    "introsort" sorts in place with bounded memory and O(n log n) worst case.
+                    "numpy" sorts a numeric array (or list) with NumPy.
+                    "parallel" sample-sorts a numeric array with a process pool over shared memory.
+                    "external" sorts a file larger than RAM in sorted runs merged block by block.
+                    "functional" is the original version that builds new lists per partition.
+        key (callable): Sort by key(x) instead of x. For lists key is called per element;
+                    for NumPy data (ndarrays and files) it is called on whole arrays, e.g. np.abs.
+        workers (int): Worker processes for "parallel" mode (default: os.cpu_count()).
+        dtype: Element type of the file in "external" mode (default: float64).
+        run_size (int): Elements per in-memory run in "external" mode.
+        output (str): Output file for "external" mode (default: the input path + ".sorted").
+        in_place (bool): Sort the caller's list or ndarray itself. By default it is left
+                    unchanged and sort() returns a sorted copy.
+        """
         self.array = array
+        self.mode = mode
+        self.key = key
+        self.workers = workers
+        self.dtype = dtype
+        self.run_size = run_size
+        self.output = output
+        self.in_place = in_place
 
     def sort(self):
-        self.array = self._quick_sort(self.array)
+        mode = self.mode
+        if mode == "auto":
+            if isinstance(self.array, os.PathLike):
+                mode = "external"
+            elif self._is_numeric() and (self.key is None or isinstance(self.array, np.ndarray)):
+                mode = "numpy"
+            else:
+                mode = "introsort"
+
+        if not self.in_place and mode not in ("functional", "external"):
+            # Work on a copy so the caller's data is left as it was
+            if np is not None and isinstance(self.array, np.ndarray):
+                self.array = self.array.copy()
+            else:
+                self.array = list(self.array)
+
+        if mode == "functional":
+            self.array = self._functional_sort()
+        elif mode == "introsort":
+            self._keyed_introsort()
+        elif mode == "numpy":
+            self._numpy_sort()
+        elif mode == "parallel":
+            self._parallel_sort()
+        elif mode == "external":
+            self.array = self._external_sort()
+        else:
+            raise ValueError(f"Unknown sort mode: {mode}")
         return self.array
 
+    def _keys(self):
+        """
+        The sort keys: per element for lists, one vectorised call for ndarrays.
+        """
+        if np is not None and isinstance(self.array, np.ndarray):
+            return self.key(self.array)
+        return [self.key(x) for x in self.array]
+
+    def _functional_sort(self):
+        if self.key is None:
+            return self._quick_sort(self.array)
+        # Decorate with (key, position) so equal keys never compare the values themselves
+        decorated = self._quick_sort(list(zip(self._keys(), range(len(self.array)))))
+        return [self.array[i] for _, i in decorated]
+
+    def _keyed_introsort(self):
+        if self.key is None:
+            self._introsort(self.array, 0, len(self.array))
+            return
+        keys = self._keys()
+        decorated = list(zip(keys.tolist() if np is not None and isinstance(keys, np.ndarray) else keys,
+                             range(len(self.array))))
+        self._introsort(decorated, 0, len(decorated))
+        order = [i for _, i in decorated]
+        if np is not None and isinstance(self.array, np.ndarray):
+            self.array[:] = self.array[order]
+        else:
+            self.array[:] = [self.array[i] for i in order]
+
     def _quick_sort(self, arr):
         if len(arr) <= 1:
             return arr
@@ -16,8 +144,346 @@ class QuickSort:
             right = [x for x in arr if x > pivot]
             return self._quick_sort(left) + middle + self._quick_sort(right)
 
+    # NumPy fast path
+    def _is_numeric(self):
+        """
+        True if the input can be handed to NumPy without changing any value:
+        a numeric ndarray, or a list whose elements are all ints or all floats.
+        """
+        if np is None:
+            return False
+        if isinstance(self.array, np.ndarray):
+            return self.array.dtype.kind in "iuf"
+        if not self.array:
+            return False
+        first_type = type(self.array[0])
+        if first_type not in (int, float) or not all(type(x) is first_type for x in self.array):
+            return False
+        # Ints that do not fit one NumPy integer type would be promoted to float64 (losing
+        # precision) or object; leave those to introsort. The extremes decide the dtype.
+        kind = np.asarray([max(self.array), min(self.array)]).dtype.kind
+        return kind in ("iu" if first_type is int else "f")
+
+    def _numpy_sort(self):
+        """
+        Sort with NumPy's own introsort. ndarrays are sorted in place; lists
+        are converted, sorted, and written back into the same list object.
+        """
+        if self.key is not None:
+            order = np.argsort(np.asarray(self._keys()), kind="stable")
+            if isinstance(self.array, np.ndarray):
+                self.array[:] = self.array[order]
+            else:
+                self.array[:] = [self.array[i] for i in order.tolist()]
+        elif isinstance(self.array, np.ndarray):
+            self.array.sort(kind="quicksort")
+        else:
+            values = np.array(self.array)
+            values.sort(kind="quicksort")
+            self.array[:] = values.tolist()
+
+    # Parallel sample sort
+    def _parallel_sort(self):
+        """
+        Sample sort: choose bucket splitters from a random sample, move every
+        key into its bucket in a shared memory block, and let worker processes
+        sort the buckets in place. Buckets are contiguous and ordered, so the
+        shared block is sorted once all workers finish.
+        """
+        is_list = not isinstance(self.array, np.ndarray)
+        values = np.asarray(self.array)
+        keys = np.ascontiguousarray(np.asarray(self._keys()) if self.key is not None else values)
+        n = len(keys)
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or n < workers * self.OVERSAMPLING * 16:
+            self._numpy_sort()  # Not worth starting processes
+            return
+
+        # Step 1: Splitters from a sorted random sample
+        rng = np.random.default_rng()
+        sample = np.sort(keys[rng.integers(0, n, size=workers * self.OVERSAMPLING)])
+        splitters = sample[self.OVERSAMPLING::self.OVERSAMPLING][:workers - 1]
+
+        # Step 2: Group by bucket. A stable argsort of 16-bit bucket ids is a radix sort, O(n)
+        buckets = np.searchsorted(splitters, keys, side="right").astype(np.uint16)
+        order = np.argsort(buckets, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(buckets, minlength=workers))])
+
+        keys_shm = shared_memory.SharedMemory(create=True, size=max(keys.nbytes, 1))
+        index_shm = shared_memory.SharedMemory(create=True, size=max(n * 8, 1)) if self.key is not None else None
+        try:
+            shared_keys = np.ndarray((n,), dtype=keys.dtype, buffer=keys_shm.buf)
+            np.take(keys, order, out=shared_keys)
+            if index_shm is not None:
+                shared_index = np.ndarray((n,), dtype=np.int64, buffer=index_shm.buf)
+                shared_index[:] = order
+
+            # Step 3: Sort each bucket in its own worker process
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                jobs = [pool.submit(_sort_bucket, keys_shm.name, index_shm and index_shm.name,
+                                    keys.dtype, n, int(bounds[b]), int(bounds[b + 1]))
+                        for b in range(workers) if bounds[b + 1] > bounds[b]]
+                for job in jobs:
+                    job.result()
+
+            # Step 4: Write the result back into the caller's array or list
+            if index_shm is None:
+                result = shared_keys.copy() if is_list else None
+                if not is_list:
+                    self.array[:] = shared_keys
+            else:
+                result = values[shared_index]
+                if not is_list:
+                    self.array[:] = result
+            if is_list:
+                self.array[:] = result.tolist()
+            del shared_keys
+            if index_shm is not None:
+                del shared_index
+        finally:
+            for shm in (keys_shm, index_shm):
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
+    # External merge sort
+    def _external_sort(self):
+        """
+        Sort a raw binary file that may not fit in memory. Runs of run_size
+        elements are sorted in memory and written to a memory-mapped temporary
+        file, then merged a block of each run at a time: the elements of every
+        block up to the smallest block tail key are merged with a vectorised
+        stable sort and written out together.
+
+        Returns:
+        numpy.memmap: The sorted output file.
+        """
+        dtype = np.dtype(self.dtype or np.float64)
+        path = os.fspath(self.array)
+        output = self.output or path + ".sorted"
+        n = os.path.getsize(path) // dtype.itemsize
+        if n == 0:
+            open(output, "wb").close()
+            return np.empty(0, dtype=dtype)
+
+        def sort_keys(values):
+            return self.key(values) if self.key is not None else values
+
+        source = np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+        run_size = max(1, self.run_size)
+        n_runs = -(-n // run_size)
+
+        # Phase 1: sorted runs (a single run goes straight to the output)
+        fd, runs_path = tempfile.mkstemp(suffix=".runs", dir=os.path.dirname(os.path.abspath(output)))
+        os.close(fd)
+        try:
+            runs = np.memmap(output if n_runs == 1 else runs_path, dtype=dtype, mode="w+", shape=(n,))
+            for start in range(0, n, run_size):
+                chunk = np.array(source[start:start + run_size])
+                if self.key is None:
+                    chunk.sort(kind="quicksort")
+                else:
+                    chunk = chunk[np.argsort(sort_keys(chunk), kind="stable")]
+                runs[start:start + run_size] = chunk
+            runs.flush()
+            if n_runs == 1:
+                return runs
+
+            # Phase 2: k-way merge of buffered blocks. Every element up to the smallest
+            # block tail key is final, so that slice of all blocks is merged with one
+            # stable sort and written out in bulk; at least one block is used up each time
+            out = np.memmap(output, dtype=dtype, mode="w+", shape=(n,))
+            block = max(1024, run_size // (n_runs + 1))
+            positions = [start for start in range(0, n, run_size)]
+            ends = [min(start + run_size, n) for start in positions]
+            buffers = [None] * n_runs
+            buffer_keys = [None] * n_runs
+            written = 0
+            while written < n:
+                for r in range(n_runs):
+                    if (buffers[r] is None or not len(buffers[r])) and positions[r] < ends[r]:
+                        stop = min(positions[r] + block, ends[r])
+                        buffers[r] = np.array(runs[positions[r]:stop])
+                        buffer_keys[r] = np.asarray(sort_keys(buffers[r]))
+                        positions[r] = stop
+
+                # Blocks holding the end of their run do not bound the merge
+                live = [r for r in range(n_runs) if buffers[r] is not None and len(buffers[r])]
+                bounding = [r for r in live if positions[r] < ends[r]]
+                bound = min(buffer_keys[r][-1] for r in bounding) if bounding else None
+
+                # The first run whose block ends on the bound may still hold more keys equal
+                # to it in its next block, so later runs must hold their equal keys back
+                first = next((r for r in bounding if buffer_keys[r][-1] == bound), None)
+
+                values, keys = [], []
+                for r in live:
+                    if bound is None:
+                        count = len(buffers[r])
+                    else:
+                        side = "right" if r <= first else "left"
+                        count = int(np.searchsorted(buffer_keys[r], bound, side=side))
+                    values.append(buffers[r][:count])
+                    keys.append(buffer_keys[r][:count])
+                    buffers[r] = buffers[r][count:]
+                    buffer_keys[r] = buffer_keys[r][count:]
+
+                # Runs are concatenated in input order, so the stable sort keeps equal keys in order
+                values = np.concatenate(values)
+                order = np.argsort(np.concatenate(keys), kind="stable")
+                out[written:written + len(values)] = values[order]
+                written += len(values)
+            out.flush()
+            del runs
+            return out
+        finally:
+            if os.path.exists(runs_path):
+                os.remove(runs_path)
+
+    # In-place introsort
+    def _introsort(self, arr, lo, hi):
+        """
+        Sort arr[lo:hi] in place: quicksort with median-of-three pivots and
+        3-way partitioning, switching to heapsort if the recursion gets deeper
+        than 2*log2(n), and insertion sort for small partitions.
+        """
+        depth_limit = 2 * max(hi - lo, 1).bit_length()
+        self._introsort_loop(arr, lo, hi, depth_limit)
+        self._insertion_sort(arr, lo, hi)
+
+    def _introsort_loop(self, arr, lo, hi, depth_limit):
+        while hi - lo > self.INSERTION_SORT_CUTOFF:
+            if depth_limit == 0:
+                self._heapsort(arr, lo, hi)
+                return
+            depth_limit -= 1
+
+            lt, gt = self._partition(arr, lo, hi)
+
+            # Recurse into the smaller side and loop on the larger one,
+            # so the call stack stays O(log n) deep
+            if lt - lo < hi - gt:
+                self._introsort_loop(arr, lo, lt, depth_limit)
+                lo = gt
+            else:
+                self._introsort_loop(arr, gt, hi, depth_limit)
+                hi = lt
+
+    def _partition(self, arr, lo, hi):
+        """
+        3-way partition of arr[lo:hi] around a median-of-three pivot.
+
+        Returns:
+        tuple: (lt, gt) such that arr[lo:lt] < pivot, arr[lt:gt] == pivot and arr[gt:hi] > pivot.
+        """
+        mid = (lo + hi) // 2
+        a, b, c = arr[lo], arr[mid], arr[hi - 1]
+        if a < b:
+            pivot = b if b < c else (c if a < c else a)
+        else:
+            pivot = a if a < c else (c if b < c else b)
+
+        lt, i, gt = lo, lo, hi
+        while i < gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                gt -= 1
+                arr[gt], arr[i] = x, arr[gt]
+            else:
+                i += 1
+        return lt, gt
+
+    def _insertion_sort(self, arr, lo, hi):
+        for i in range(lo + 1, hi):
+            x = arr[i]
+            j = i - 1
+            while j >= lo and x < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = x
+
+    def _heapsort(self, arr, lo, hi):
+        n = hi - lo
+        for start in range(n // 2 - 1, -1, -1):
+            self._sift_down(arr, lo, start, n)
+        for end in range(n - 1, 0, -1):
+            arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+            self._sift_down(arr, lo, 0, end)
+
+    def _sift_down(self, arr, lo, root, n):
+        """
+        Restore the max-heap property for the heap stored in arr[lo:lo + n].
+        """
+        x = arr[lo + root]
+        child = 2 * root + 1
+        while child < n:
+            if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+                child += 1
+            if not x < arr[lo + child]:
+                break
+            arr[lo + root] = arr[lo + child]
+            root = child
+            child = 2 * root + 1
+        arr[lo + root] = x
+
+
+def benchmark_quicksort(sizes=(10**6, 10**7), workers=None, in_memory_limit=10**8, run_size=1 << 24):
+    """
+    Print the time each mode takes for arrays of several sizes. Sizes above
+    in_memory_limit (e.g. 10**9) are only run through the external merge sort,
+    with the input file written in chunks so it never has to fit in memory.
+
+    Parameters:
+    sizes (tuple): Numbers of float64 elements to sort.
+    workers (int): Worker processes for parallel mode (default: os.cpu_count()).
+    in_memory_limit (int): Largest size that is also sorted in memory.
+    run_size (int): Elements per run for the external sort.
+    """
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        timings = []
+        if size <= in_memory_limit:
+            data = rng.random(size)
+            for mode in ("numpy", "parallel"):
+                array = data.copy()
+                start = time.perf_counter()
+                QuickSort(array, mode=mode, workers=workers, in_place=True).sort()
+                timings.append((mode, time.perf_counter() - start))
+            if size <= 10**6:  # The pure Python sort is only practical for small inputs
+                array = data.tolist()
+                start = time.perf_counter()
+                QuickSort(array, mode="introsort", in_place=True).sort()
+                timings.append(("introsort", time.perf_counter() - start))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.bin")
+            with open(path, "wb") as f:
+                for start in range(0, size, run_size):
+                    f.write(rng.random(min(run_size, size - start)).tobytes())
+            start = time.perf_counter()
+            result = QuickSort(path, mode="external", run_size=run_size).sort()
+            timings.append(("external", time.perf_counter() - start))
+            del result
+
+        print(f"n={size:<12}" + "  ".join(f"{mode} {seconds:8.3f} s" for mode, seconds in timings))
+
+
 # Example usage:
-arr = [3, 6, 8, 10, 1, 2, 1]
-quick_sorter = QuickSort(arr)
-sorted_arr = quick_sorter.sort()
-print("Sorted array:", sorted_arr)
+if __name__ == "__main__":
+    arr = [3, 6, 8, 10, 1, 2, 1]
+    quick_sorter = QuickSort(arr)
+    sorted_arr = quick_sorter.sort()
+    print("Sorted array:", sorted_arr)
+
+    # In-place introsort works for any comparable values, e.g. strings
+    words = ["pear", "apple", "fig", "banana", "cherry"]
+    print("Sorted words:", QuickSort(words, mode="introsort").sort())
+
+    # Sort by a key, e.g. word length
+    print("Sorted by length:", QuickSort(list(words), key=len).sort())
+
+    benchmark_quicksort(sizes=(10**6,))
@@ -1,42 +1,652 @@
+import collections
+import functools
+import io
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
-# Plaintext to be encrypted
-plaintext = b'0123456'  # Note: plaintext should be in bytes
-
-# Step 1: Generate the private key
-private_key = rsa.generate_private_key(
-    public_exponent=65537,  # Common public exponent
-    key_size=2048,          # Key size in bits
-    backend=default_backend()
-)
 
-# Step 2: Obtain the public key from the private key
-public_key = private_key.public_key()
-
-# Step 3: Encrypt the plaintext using the public key
-ciphertext = public_key.encrypt(
-    plaintext,
-    padding.OAEP(
+def oaep_padding():
+    """
+    OAEP padding with MGF1/SHA-256, as used for all RSA encryption in this file.
+    """
+    return padding.OAEP(
         mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask generation function
         algorithm=hashes.SHA256(),                   # Hash algorithm
         label=None
     )
-)
 
-# Step 4: Decrypt the ciphertext using the private key
-decodedtext = private_key.decrypt(
-    ciphertext,
-    padding.OAEP(
-        mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask generation function
-        algorithm=hashes.SHA256(),                   # Hash algorithm
-        label=None
+
+# Envelope encryption: the payload is encrypted with a fresh AES-256-GCM key
+# and only that 32-byte key is encrypted ("wrapped") with RSA-OAEP.
+#
+# Layout: MAGIC | chunk size (4 bytes) | wrapped key length (2 bytes) | wrapped key
+#         | nonce prefix (7 bytes) | chunk 0 | chunk 1 | ...
+# Each chunk is the AES-GCM ciphertext of up to chunk size bytes plus a 16-byte
+# tag. Its nonce is the prefix, a 4-byte chunk counter and a 1-byte "last chunk"
+# flag, so chunks cannot be reordered, dropped or truncated without detection.
+ENVELOPE_MAGIC = b"ENV1"
+ENVELOPE_CHUNK_SIZE = 64 * 1024
+MAX_ENVELOPE_CHUNK_SIZE = 16 * 1024 * 1024  # Bounds the read size taken from an unauthenticated header
+TAG_SIZE = 16
+
+
+def _read_exact(src, size):
+    """
+    Read up to size bytes, retrying short reads (as sockets and pipes may return).
+    """
+    data = src.read(size)
+    if not data or len(data) == size:
+        return data
+    parts = [data]
+    remaining = size - len(data)
+    while remaining:
+        data = src.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+def _chunk_nonce(prefix, counter, last):
+    return prefix + struct.pack(">IB", counter, 1 if last else 0)
+
+
+def envelope_encrypt(public_key, src, dst, chunk_size=ENVELOPE_CHUNK_SIZE):
+    """
+    Encrypt a stream of any size with a single RSA operation.
+
+    Parameters:
+    public_key: RSA public key used to wrap the per-message AES key.
+    src: Readable binary file-like object with the plaintext.
+    dst: Writable binary file-like object for the envelope.
+    chunk_size (int): Plaintext bytes per AES-GCM chunk (memory use is about two chunks).
+
+    Raises:
+    ValueError: If chunk_size is not between 1 and MAX_ENVELOPE_CHUNK_SIZE.
+    """
+    if not 0 < chunk_size <= MAX_ENVELOPE_CHUNK_SIZE:
+        raise ValueError("chunk_size must be between 1 and %d bytes" % MAX_ENVELOPE_CHUNK_SIZE)
+    key = AESGCM.generate_key(bit_length=256)
+    wrapped_key = public_key.encrypt(key, oaep_padding())
+    prefix = os.urandom(7)
+
+    header = ENVELOPE_MAGIC + struct.pack(">IH", chunk_size, len(wrapped_key)) + wrapped_key + prefix
+    dst.write(header)
+
+    # Read one chunk ahead so the last chunk can be flagged as such
+    aes = AESGCM(key)
+    counter = 0
+    chunk = _read_exact(src, chunk_size)
+    while True:
+        next_chunk = _read_exact(src, chunk_size)
+        last = not next_chunk
+        dst.write(aes.encrypt(_chunk_nonce(prefix, counter, last), chunk, header))
+        if last:
+            break
+        chunk = next_chunk
+        counter += 1
+
+
+def envelope_decrypt(private_key, src, dst):
+    """
+    Decrypt a stream written by envelope_encrypt. Each chunk is authenticated
+    before it is written, so dst never receives unverified plaintext.
+
+    Parameters:
+    private_key: RSA private key matching the public key used to encrypt.
+    src: Readable binary file-like object with the envelope.
+    dst: Writable binary file-like object for the plaintext.
+
+    Raises:
+    ValueError: If the envelope is malformed, truncated or has been modified.
+    """
+    fixed = _read_exact(src, len(ENVELOPE_MAGIC) + 6)
+    if len(fixed) != len(ENVELOPE_MAGIC) + 6 or not fixed.startswith(ENVELOPE_MAGIC):
+        raise ValueError("Not an envelope")
+    chunk_size, key_length = struct.unpack(">IH", fixed[len(ENVELOPE_MAGIC):])
+    # The header is only authenticated with the first chunk, so check the size before reading with it
+    if not 0 < chunk_size <= MAX_ENVELOPE_CHUNK_SIZE:
+        raise ValueError("Invalid envelope chunk size %d" % chunk_size)
+    wrapped_key = _read_exact(src, key_length)
+    prefix = _read_exact(src, 7)
+    if len(wrapped_key) != key_length or len(prefix) != 7:
+        raise ValueError("Truncated envelope header")
+    header = fixed + wrapped_key + prefix
+
+    aes = AESGCM(private_key.decrypt(wrapped_key, oaep_padding()))
+    counter = 0
+    chunk = _read_exact(src, chunk_size + TAG_SIZE)
+    while True:
+        next_chunk = _read_exact(src, chunk_size + TAG_SIZE)
+        last = not next_chunk
+        try:
+            dst.write(aes.decrypt(_chunk_nonce(prefix, counter, last), chunk, header))
+        except InvalidTag:
+            raise ValueError("Envelope chunk %d failed authentication" % counter) from None
+        if last:
+            break
+        chunk = next_chunk
+        counter += 1
+
+
+def envelope_encrypt_bytes(public_key, plaintext):
+    """
+    Convenience wrapper: envelope-encrypt a bytes object.
+    """
+    out = io.BytesIO()
+    envelope_encrypt(public_key, io.BytesIO(plaintext), out)
+    return out.getvalue()
+
+
+def envelope_decrypt_bytes(private_key, envelope):
+    """
+    Convenience wrapper: decrypt an envelope held in a bytes object.
+    """
+    out = io.BytesIO()
+    envelope_decrypt(private_key, io.BytesIO(envelope), out)
+    return out.getvalue()
+
+
+# Key storage: private keys are deserialised once and cached, instead of being
+# generated or parsed again for every operation.
+def load_private_key(data, password=None):
+    """
+    Load a private key from PEM or DER bytes.
+
+    Parameters:
+    data (bytes): The serialised key.
+    password (bytes): Password if the key is encrypted, else None.
+
+    Returns:
+    The private key object.
+    """
+    if data.lstrip().startswith(b"-----BEGIN"):
+        return serialization.load_pem_private_key(data, password=password, backend=default_backend())
+    return serialization.load_der_private_key(data, password=password, backend=default_backend())
+
+
+def private_key_to_der(private_key):
+    """
+    Serialise a private key as unencrypted PKCS#8 DER, the form handed to worker processes.
+    """
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
     )
-)
 
-# Step 5: Print the texts
-print("Plaintext: %s" % plaintext.decode('utf-8'))  # Decode bytes to string
-print("Ciphertext: %s" % ciphertext.hex())          # Represent ciphertext as hex
-print("Decodedtext: %s" % decodedtext.decode('utf-8'))  # Decode bytes to string
+
+class KeyStore:
+    def __init__(self):
+        """
+        Named private keys, kept serialised and deserialised at most once each.
+        """
+        self._serialized = {}  # name -> (bytes, password)
+        self._keys = {}        # name -> cached private key object
+        self._pools = {}       # name -> KeyWorkerPool for batch operations
+
+    def add(self, name, data, password=None):
+        """
+        Register a serialised (PEM or DER) private key under a name.
+        """
+        self._serialized[name] = (data, password)
+        self._keys.pop(name, None)
+        pool = self._pools.pop(name, None)
+        if pool is not None:
+            pool.close()  # Its workers hold the key being replaced
+
+    def load_file(self, name, path, password=None):
+        """
+        Register the private key stored in a PEM or DER file.
+        """
+        with open(path, "rb") as f:
+            self.add(name, f.read(), password)
+
+    def get_or_create(self, path, key_size=2048, password=None):
+        """
+        Load the key stored at path, generating and saving it (PEM) only if the
+        file does not exist yet. The key is registered under its path.
+
+        Returns:
+        The private key object.
+        """
+        if not os.path.exists(path):
+            key = rsa.generate_private_key(public_exponent=65537, key_size=key_size, backend=default_backend())
+            encryption = (serialization.BestAvailableEncryption(password) if password
+                          else serialization.NoEncryption())
+            pem = key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, encryption)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)  # Owner-only permissions
+            with os.fdopen(fd, "wb") as f:
+                f.write(pem)
+            self.add(path, pem, password)
+            self._keys[path] = key
+            return key
+        self.load_file(path, path, password)
+        return self.get(path)
+
+    def get(self, name):
+        """
+        Return the private key object for a name, deserialising it on first use.
+        """
+        key = self._keys.get(name)
+        if key is None:
+            data, password = self._serialized[name]
+            key = self._keys[name] = load_private_key(data, password)
+        return key
+
+    def der(self, name):
+        """
+        Return the key as unencrypted DER bytes, e.g. to hand to worker processes.
+        """
+        return private_key_to_der(self.get(name))
+
+    def worker_pool(self, name, workers=None):
+        """
+        Return the KeyWorkerPool for a name, starting it on first use. The pool
+        stays up for later batches until the key is replaced or the store is closed.
+        """
+        pool = self._pools.get(name)
+        if pool is None:
+            pool = self._pools[name] = KeyWorkerPool(self.get(name), workers)
+        return pool
+
+    def close(self):
+        """
+        Shut down the worker pools started by worker_pool().
+        """
+        while self._pools:
+            self._pools.popitem()[1].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Batch operations: each worker process deserialises the key once in its
+# initializer and then handles a share of the batch.
+_worker_key = None
+
+
+def _init_key_worker(der):
+    global _worker_key
+    _worker_key = load_private_key(der)
+
+
+def _decrypt(private_key, ciphertext):
+    return private_key.decrypt(ciphertext, oaep_padding())
+
+
+def _sign(private_key, message):
+    return private_key.sign(message, pss_padding(), hashes.SHA256())
+
+
+def _with_worker_key(operation, item):
+    return operation(_worker_key, item)
+
+
+def pss_padding():
+    """
+    PSS padding with MGF1/SHA-256 for signatures.
+    """
+    return padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+
+
+class KeyWorkerPool:
+    def __init__(self, private_key, workers=None):
+        """
+        Long-lived process pool for batch operations with one private key. Each
+        worker deserialises the key once, in its initializer, and keeps it for
+        every later batch, so repeated batches pay neither process start-up nor
+        key parsing again.
+
+        Parameters:
+        private_key: Private key object, or its PEM/DER bytes.
+        workers (int): Number of worker processes (default: os.cpu_count()).
+        """
+        if isinstance(private_key, bytes):
+            private_key = load_private_key(private_key)
+        self.private_key = private_key
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_key_worker,
+                                             initargs=(private_key_to_der(private_key),))
+
+    def map(self, operation, items, chunksize=64):
+        """
+        Apply operation(key, item) to every item. Batches of at most one chunk
+        run in-process, where a round trip to the workers would cost more.
+
+        Returns:
+        list: The results, in the same order as the items.
+        """
+        items = list(items)
+        if len(items) <= chunksize:
+            return [operation(self.private_key, item) for item in items]
+        return list(self._executor.map(functools.partial(_with_worker_key, operation), items, chunksize=chunksize))
+
+    def decrypt(self, ciphertexts, chunksize=64):
+        """
+        Decrypt many OAEP ciphertexts (see decrypt_batch).
+        """
+        return self.map(_decrypt, ciphertexts, chunksize)
+
+    def sign(self, messages, chunksize=64):
+        """
+        Sign many messages with RSA-PSS and SHA-256 (see sign_batch).
+        """
+        return self.map(_sign, messages, chunksize)
+
+    def close(self):
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _run_batch(private_key, items, operation, workers, chunksize):
+    """
+    Apply operation(key, item) to every item: through private_key itself if it
+    is a KeyWorkerPool, else in-process or across a pool started for this batch.
+    """
+    if isinstance(private_key, KeyWorkerPool):
+        return private_key.map(operation, items, chunksize)
+    if isinstance(private_key, bytes):
+        private_key = load_private_key(private_key)
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) <= chunksize:
+        return [operation(private_key, item) for item in items]
+    with KeyWorkerPool(private_key, workers) as pool:
+        return pool.map(operation, items, chunksize)
+
+
+def decrypt_batch(private_key, ciphertexts, workers=None, chunksize=64):
+    """
+    Decrypt many OAEP ciphertexts across a process pool.
+
+    Parameters:
+    private_key: Private key object, or its PEM/DER bytes, or a KeyWorkerPool.
+        A pool started for this call alone is shut down again afterwards, so for
+        repeated batches pass a KeyWorkerPool (or KeyStore.worker_pool(name)).
+    ciphertexts (iterable): The ciphertexts to decrypt.
+    workers (int): Number of worker processes (default: os.cpu_count()). 1 runs in-process.
+        Ignored when private_key is a KeyWorkerPool.
+    chunksize (int): Ciphertexts sent to a worker at a time.
+
+    Returns:
+    list: The plaintexts, in the same order as the ciphertexts.
+    """
+    return _run_batch(private_key, ciphertexts, _decrypt, workers, chunksize)
+
+
+def sign_batch(private_key, messages, workers=None, chunksize=64):
+    """
+    Sign many messages (RSA-PSS with SHA-256) across a process pool.
+
+    Parameters:
+    private_key: Private key object, or its PEM/DER bytes, or a KeyWorkerPool.
+        A pool started for this call alone is shut down again afterwards, so for
+        repeated batches pass a KeyWorkerPool (or KeyStore.worker_pool(name)).
+    messages (iterable): The messages to sign.
+    workers (int): Number of worker processes (default: os.cpu_count()). 1 runs in-process.
+        Ignored when private_key is a KeyWorkerPool.
+    chunksize (int): Messages sent to a worker at a time.
+
+    Returns:
+    list: The signatures, in the same order as the messages.
+    """
+    return _run_batch(private_key, messages, _sign, workers, chunksize)
+
+
+def benchmark_rsa_batch(count=2000, workers=None, key_size=2048):
+    """
+    Print ops/sec of decrypt_batch and sign_batch against one inline call per item.
+
+    Parameters:
+    count (int): Number of operations per measurement.
+    workers (int): Worker processes for the batch runs (default: os.cpu_count()).
+    key_size (int): RSA key size in bits.
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size, backend=default_backend())
+    public_key = private_key.public_key()
+    ciphertexts = [public_key.encrypt(os.urandom(32), oaep_padding()) for _ in range(count)]
+
+    def report(label, func):
+        start = time.perf_counter()
+        func()
+        print(f"{label:<36} {count / (time.perf_counter() - start):10.1f} ops/sec")
+
+    workers = workers or os.cpu_count() or 1
+    report("decrypt (single calls)", lambda: [private_key.decrypt(c, oaep_padding()) for c in ciphertexts])
+    report(f"decrypt_batch ({workers} workers)", lambda: decrypt_batch(private_key, ciphertexts, workers=workers))
+    with KeyWorkerPool(private_key, workers) as pool:
+        pool.decrypt(ciphertexts[:2 * workers * 64])  # Start the workers
+        report(f"KeyWorkerPool.decrypt ({workers} workers)", lambda: pool.decrypt(ciphertexts))
+        report("sign (single calls)", lambda: [private_key.sign(c, pss_padding(), hashes.SHA256()) for c in ciphertexts])
+        report(f"KeyWorkerPool.sign ({workers} workers)", lambda: pool.sign(ciphertexts))
+
+
+# Key pool: ephemeral keypairs are generated ahead of time in worker processes,
+# so handing one out never waits for key generation.
+def _generate_key_der(key_size, public_exponent):
+    """
+    Generate one private key in a worker process.
+
+    Returns:
+    tuple: (DER bytes of the key, generation time in seconds).
+    """
+    start = time.perf_counter()
+    key = rsa.generate_private_key(public_exponent=public_exponent, key_size=key_size, backend=default_backend())
+    return private_key_to_der(key), time.perf_counter() - start
+
+
+class KeyPool:
+    def __init__(self, key_size=2048, high_water=16, workers=None, public_exponent=65537):
+        """
+        Pool of pre-generated RSA keypairs, refilled in the background.
+
+        Parameters:
+        key_size (int): Key size in bits.
+        high_water (int): Number of ready keys (plus keys being generated) to maintain.
+        workers (int): Number of generator processes (default: os.cpu_count()).
+        public_exponent (int): RSA public exponent.
+        """
+        self.key_size = key_size
+        self.high_water = high_water
+        self.public_exponent = public_exponent
+        self._ready = collections.deque()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._closed = False
+        self._error = None  # First exception raised by a generator process, not yet reported
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.generation_time_total = 0.0
+        self.generation_time_max = 0.0
+
+        self._refill()
+
+    def _refill(self):
+        """
+        Submit generation jobs until ready + pending keys reach the high-water mark.
+        Jobs are submitted under the lock, so none can follow close().
+        """
+        futures = []
+        with self._lock:
+            if self._closed:
+                return
+            for _ in range(self.high_water - len(self._ready) - self._pending):
+                futures.append(self._executor.submit(_generate_key_der, self.key_size, self.public_exponent))
+                self._pending += 1
+        # Outside the lock: a job that has already finished runs its callback right here
+        for future in futures:
+            future.add_done_callback(self._on_generated)
+
+    def _on_generated(self, future):
+        """
+        Called when a worker finishes a key: deserialise it and add it to the pool.
+        A failed job's exception is kept for get_keypair() to raise.
+        """
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                if self._error is None:
+                    self._error = error
+                return
+            der, elapsed = future.result()
+            self._record_generation(elapsed)
+            self._ready.append(load_private_key(der))
+
+    def _record_generation(self, elapsed):
+        self.generated += 1
+        self.generation_time_total += elapsed
+        self.generation_time_max = max(self.generation_time_max, elapsed)
+
+    def get_keypair(self):
+        """
+        Take a keypair from the pool and trigger a background refill. If the pool
+        is empty (a miss), a key is generated inline instead.
+
+        Returns:
+        tuple: (private_key, public_key).
+
+        Raises:
+        Exception: The error a background generation job failed with, once, so
+            that failures (e.g. an invalid key size) are not silently dropped.
+        """
+        with self._lock:
+            error, self._error = self._error, None
+            if error is not None:
+                raise error
+            private_key = self._ready.popleft() if self._ready else None
+            if private_key is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if private_key is None:
+            der, elapsed = _generate_key_der(self.key_size, self.public_exponent)
+            with self._lock:
+                self._record_generation(elapsed)
+            private_key = load_private_key(der)
+        self._refill()
+        return private_key, private_key.public_key()
+
+    def metrics(self):
+        """
+        Returns:
+        dict: Pool size, pending jobs, hit/miss counts and generation latency (seconds).
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "ready": len(self._ready),
+                "pending": self._pending,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "generated": self.generated,
+                "generation_time_mean": self.generation_time_total / self.generated if self.generated else 0.0,
+                "generation_time_max": self.generation_time_max,
+            }
+
+    def close(self):
+        """
+        Stop refilling and shut down the generator processes.
+        """
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Plaintext to be encrypted
+    plaintext = b'0123456'  # Note: plaintext should be in bytes
+
+    # Step 1: Generate the private key
+    private_key = rsa.generate_private_key(
+        public_exponent=65537,  # Common public exponent
+        key_size=2048,          # Key size in bits
+        backend=default_backend()
+    )
+
+    # Step 2: Obtain the public key from the private key
+    public_key = private_key.public_key()
+
+    # Step 3: Encrypt the plaintext using the public key
+    ciphertext = public_key.encrypt(
+        plaintext,
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask generation function
+            algorithm=hashes.SHA256(),                   # Hash algorithm
+            label=None
+        )
+    )
+
+    # Step 4: Decrypt the ciphertext using the private key
+    decodedtext = private_key.decrypt(
+        ciphertext,
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),  # Mask generation function
+            algorithm=hashes.SHA256(),                   # Hash algorithm
+            label=None
+        )
+    )
+
+    # Step 5: Print the texts
+    print("Plaintext: %s" % plaintext.decode('utf-8'))  # Decode bytes to string
+    print("Ciphertext: %s" % ciphertext.hex())          # Represent ciphertext as hex
+    print("Decodedtext: %s" % decodedtext.decode('utf-8'))  # Decode bytes to string
+
+    # Step 6: Envelope encryption for payloads larger than RSA-OAEP can take directly
+    payload = os.urandom(1_000_000)
+    envelope = envelope_encrypt_bytes(public_key, payload)
+    assert envelope_decrypt_bytes(private_key, envelope) == payload
+    print("Envelope: %d byte payload -> %d byte envelope" % (len(payload), len(envelope)))
+
+    # Step 7: Cache the key in a key store and decrypt batches across its long-lived worker pool
+    with KeyStore() as store:
+        store.add("demo", private_key_to_der(private_key))
+        batch = [public_key.encrypt(b"token-%d" % i, oaep_padding()) for i in range(8)]
+        pool = store.worker_pool("demo", workers=2)
+        print("Batch decrypted: %s" % pool.decrypt(batch, chunksize=2))
+        print("Batch signed: %d signatures" % len(sign_batch(pool, batch, chunksize=2)))
+    benchmark_rsa_batch(count=200)
+
+    # Step 8: Hand out ephemeral keypairs from a pre-generated pool
+    with KeyPool(high_water=4, workers=2) as pool:
+        time.sleep(1)  # Give the pool time to fill
+        for _ in range(6):
+            session_key, session_public_key = pool.get_keypair()
+        print("Key pool metrics: %s" % pool.metrics())
@@ -25,8 +25,155 @@ def crc_ccitt(data: str, poly: int = 0x1021, init_crc: int = 0xFFFF) -> str:
 
     return f"{crc:016b}"  # Return CRC as a 16-bit binary string
 
+
+# Tables are built once per polynomial and shared by every CrcCcitt object
+_TABLES = {}
+
+
+def _ccitt_table(poly: int) -> list:
+    """
+    Build (or fetch from the cache) the 256-entry table for a 16-bit MSB-first CRC.
+
+    :param poly: The CRC polynomial (e.g. 0x1021).
+    :return: A list of 256 CRC register values, one per input byte.
+    """
+    table = _TABLES.get(poly)
+    if table is None:
+        table = []
+        for byte in range(256):
+            crc = byte << 8
+            for _ in range(8):  # One shift per bit of the byte, not per bit of the CRC
+                crc = (crc << 1) ^ poly if crc & 0x8000 else crc << 1
+            table.append(crc & 0xFFFF)
+        _TABLES[poly] = table
+    return table
+
+
+class CrcCcitt:
+    """
+    Incremental CRC-CCITT (CRC-16/CCITT-FALSE by default) with a hashlib-style interface.
+
+    Data is fed in bytes at a time with update(), so large files and socket
+    streams can be checksummed chunk by chunk without being held in memory.
+    """
+
+    name = "crc-ccitt"
+    digest_size = 2
+    block_size = 1
+
+    def __init__(self, data: bytes = b"", poly: int = 0x1021, init_crc: int = 0xFFFF):
+        """
+        :param data: Optional initial bytes to process.
+        :param poly: The CRC polynomial (default: x16 + x12 + x5 + 1 -> 0x1021).
+        :param init_crc: The initial value of the CRC (default: 0xFFFF).
+        """
+        self.poly = poly
+        self.init_crc = init_crc
+        self.crc = init_crc
+        self._table = _ccitt_table(poly)
+        if data:
+            self.update(data)
+
+    def update(self, data: bytes) -> None:
+        """
+        Feed more bytes into the running CRC.
+
+        :param data: The bytes to process (bytes, bytearray or memoryview).
+        """
+        table = self._table
+        crc = self.crc
+        for byte in memoryview(data).cast("B"):
+            crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+        self.crc = crc
+
+    def digest(self) -> bytes:
+        """
+        :return: The current CRC as 2 big-endian bytes.
+        """
+        return self.crc.to_bytes(2, "big")
+
+    def hexdigest(self) -> str:
+        """
+        :return: The current CRC as a 4-character hexadecimal string.
+        """
+        return f"{self.crc:04x}"
+
+    def copy(self) -> "CrcCcitt":
+        """
+        :return: An independent copy of this CRC object, including its running state.
+        """
+        other = CrcCcitt.__new__(CrcCcitt)
+        other.poly = self.poly
+        other.init_crc = self.init_crc
+        other.crc = self.crc
+        other._table = self._table
+        return other
+
+
+def _gf2_mulmod(a: int, b: int, poly: int) -> int:
+    """
+    Multiply two 16-bit polynomials over GF(2) modulo x^16 + poly.
+    """
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        b >>= 1
+        a = (a << 1) ^ poly if a & 0x8000 else a << 1
+        a &= 0xFFFF
+    return result
+
+
+def _x_pow_mod(n_bits: int, poly: int) -> int:
+    """
+    Compute x^n_bits modulo x^16 + poly by repeated squaring.
+    """
+    result = 1  # The polynomial "1"
+    square = 2  # The polynomial "x"
+    while n_bits:
+        if n_bits & 1:
+            result = _gf2_mulmod(result, square, poly)
+        square = _gf2_mulmod(square, square, poly)
+        n_bits >>= 1
+    return result
+
+
+def crc_combine(crc_a: int, crc_b: int, len_b: int, poly: int = 0x1021, init_crc: int = 0xFFFF) -> int:
+    """
+    Combine the CRCs of two consecutive chunks into the CRC of the whole stream.
+
+    Both chunk CRCs must have been computed independently from the same initial
+    value (e.g. on separate cores). Running the register through len_b more
+    bytes is a multiplication by x^(8 * len_b) modulo the polynomial, which
+    takes O(log len_b) steps instead of reprocessing the data.
+
+    :param crc_a: The CRC of the first chunk.
+    :param crc_b: The CRC of the second chunk.
+    :param len_b: The length of the second chunk in bytes.
+    :param poly: The CRC polynomial (default: 0x1021).
+    :param init_crc: The initial value both CRCs were computed from (default: 0xFFFF).
+    :return: The CRC of the first chunk followed by the second.
+    """
+    # The initial value's contribution is already included in crc_b, so
+    # remove it from crc_a before shifting crc_a past the second chunk
+    shift = _x_pow_mod(8 * len_b, poly)
+    return _gf2_mulmod(crc_a ^ init_crc, shift, poly) ^ crc_b
+
+
 # Example Usage
-input_data = "1101011011"  # Binary string representation of the input data
-crc_result = crc_ccitt(input_data)
-print(f"Input Data: {input_data}")
-print(f"CRC-CCITT Checksum: {crc_result}")
+if __name__ == "__main__":
+    input_data = "1101011011"  # Binary string representation of the input data
+    crc_result = crc_ccitt(input_data)
+    print(f"Input Data: {input_data}")
+    print(f"CRC-CCITT Checksum: {crc_result}")
+
+    # Incremental CRC-CCITT over bytes, fed in two chunks
+    stream = CrcCcitt()
+    stream.update(b"12345")
+    stream.update(b"6789")
+    print(f"CRC-CCITT of b'123456789': {stream.hexdigest()}")  # 29b1
+
+    # Combine CRCs of chunks computed separately
+    crc_a = CrcCcitt(b"12345").crc
+    crc_b = CrcCcitt(b"6789").crc
+    print(f"Combined CRC: {crc_combine(crc_a, crc_b, 4):04x}")  # 29b1
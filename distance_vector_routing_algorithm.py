@@ -1,5 +1,13 @@
 # Importing threading so we can run multiple parts of the program at the same time (multithreading)
 import threading
+# Importing heapq for the event queue of the event-driven simulator
+import heapq
+# Importing random for random test topologies and message delays
+import random
+# Importing array for the compact routing tables of the event-driven simulator
+from array import array
+# Importing numpy for the matrix-backed distance-vector rounds
+import numpy as np
 # Importing time so we can pause the program for a bit (sleep) between operations
 import time
 
@@ -83,6 +91,570 @@ def simulate_network():
     router3.start()
     router4.start()
 
+# Event-driven simulation engine. Instead of one thread per router, every message is an event
+# in a single priority queue ordered by delivery time, so thousands of routers can be simulated
+# in one process, and the simulation ends (converges) when no messages are left in flight.
+class DistanceVectorSimulator:
+    """
+    Discrete-event distance-vector routing simulation.
+
+    Routers send triggered updates: when a router's table changes it waits
+    update_delay, then sends the changed entries (not the whole vector) to all
+    of its neighbours, so changes that arrive close together share one message.
+    A router that receives a worse route than the one it has itself sends its
+    own route back, which lets the network recover when links get more
+    expensive or fail. Costs at or above infinity count as unreachable, which
+    bounds count-to-infinity after a partition.
+
+    Routers are numbered internally and each one keeps its distances and next
+    hops in flat arrays. benchmark_distance_vector(10000) peaks at about 2.6 GB.
+    """
+
+    def __init__(self, links, link_delay=1.0, update_delay=0.1, jitter=0.0, infinity=None, seed=None):
+        """
+        Parameters:
+            links: Dictionary {router: {neighbour: cost}}, in the same form as Router's neighbors.
+                Links are bidirectional; a link listed only at one end gets the same cost at the other.
+            link_delay: Time for a message to cross a link
+            update_delay: Time a router waits after a change before sending its update
+            jitter: Random extra delay per message, uniform in [0, jitter) (messages on a link stay in order)
+            infinity: Cost treated as unreachable. The default, the number of routers times the
+                largest link cost, is raised by change_link when a link gets more expensive; an
+                explicit value is kept, and routes costing that much or more are dropped.
+            seed: Seed for the jitter
+        """
+        self.nodes = list(links)
+        for neighbours in links.values():
+            self.nodes.extend(neighbour for neighbour in neighbours if neighbour not in links)
+        self.nodes = list(dict.fromkeys(self.nodes))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        count = len(self.nodes)
+
+        # links[i] is {neighbour index: cost}
+        self.links = [{} for _ in range(count)]
+        for node, neighbours in links.items():
+            for neighbour, cost in neighbours.items():
+                self.links[self.index[node]][self.index[neighbour]] = cost
+        for i, neighbours in enumerate(self.links):
+            for j, cost in neighbours.items():
+                self.links[j].setdefault(i, cost)
+
+        self.link_delay = link_delay
+        self.update_delay = update_delay
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        # The default bound grows with the largest link cost, so no shortest path ever reaches it
+        self.automatic_infinity = infinity is None
+        if infinity is None:
+            largest = max((cost for neighbours in self.links for cost in neighbours.values()), default=1)
+            infinity = count * largest
+        self.infinity = infinity
+
+        # Each router knows only its own distance (0) and next hop (itself) to start with;
+        # a next hop of -1 means the destination is unreachable
+        self.distance = []
+        self.next_hop = []
+        for i in range(count):
+            distance = array('d', [float('inf')]) * count
+            next_hop = array('l', [-1]) * count
+            distance[i], next_hop[i] = 0.0, i
+            self.distance.append(distance)
+            self.next_hop.append(next_hop)
+        # Destinations changed since the last update, as a list plus a flag per destination
+        # (a set per router would need far more memory when every router has thousands pending)
+        self.pending = [array('l', [i]) for i in range(count)]
+        self.flagged = []
+        for i in range(count):
+            flags = bytearray(count)
+            flags[i] = 1
+            self.flagged.append(flags)
+
+        # Event queue entries are (time, sequence number, kind, data); the sequence number keeps
+        # events at the same time in the order they were scheduled
+        self.events = []
+        self.sequence = 0
+        self.now = 0.0
+        self.flush_scheduled = set()
+        self.last_delivery = {}  # (sender, receiver) -> time of the last message on that link
+
+        # Statistics
+        self.messages = 0
+        self.entries_sent = 0
+        self.table_changes = 0
+        self.last_change = 0.0
+
+        for i in range(count):
+            self._schedule_flush(i)
+
+    def _push(self, time, kind, data):
+        heapq.heappush(self.events, (time, self.sequence, kind, data))
+        self.sequence += 1
+
+    def _schedule_flush(self, i):
+        if i not in self.flush_scheduled:
+            self.flush_scheduled.add(i)
+            self._push(self.now + self.update_delay, "flush", i)
+
+    def _mark(self, i, destination):
+        # Add destination to router i's next update
+        if not self.flagged[i][destination]:
+            self.flagged[i][destination] = 1
+            self.pending[i].append(destination)
+
+    def _set_route(self, i, destination, cost, via):
+        # Record a new route; unreachable destinations keep no next hop
+        if cost >= self.infinity:
+            cost, via = float('inf'), -1
+        self.distance[i][destination] = cost
+        self.next_hop[i][destination] = via
+        self._mark(i, destination)
+        self.table_changes += 1
+        self.last_change = self.now
+
+    def _flush(self, i):
+        # Send the changed entries of router i's distance vector to every neighbour
+        self.flush_scheduled.discard(i)
+        if not self.pending[i]:
+            return
+        # The entries go out as a pair of flat arrays, shared by all the messages of this update
+        distance = self.distance[i]
+        destinations = self.pending[i]
+        entries = (destinations, array('d', [distance[destination] for destination in destinations]))
+        self.pending[i] = array('l')
+        flags = self.flagged[i]
+        for destination in destinations:
+            flags[destination] = 0
+        for neighbour in self.links[i]:
+            delivery = self.now + self.link_delay
+            if self.jitter:
+                delivery += self.random.random() * self.jitter
+                delivery = max(delivery, self.last_delivery.get((i, neighbour), 0.0))
+                self.last_delivery[(i, neighbour)] = delivery
+            self._push(delivery, "deliver", (neighbour, i, entries))
+            self.messages += 1
+            self.entries_sent += len(destinations)
+
+    def _receive(self, i, sender, entries):
+        cost = self.links[i].get(sender)
+        if cost is None:
+            return  # The link went down while the message was in flight
+        distance = self.distance[i]
+        next_hop = self.next_hop[i]
+        mark = self._mark
+        infinity = self.infinity
+        for destination, advertised in zip(*entries):
+            if destination == i:
+                if cost < advertised:
+                    mark(i, i)  # The sender has lost its best route to us
+                continue
+            new_cost = advertised + cost
+            if new_cost >= infinity:
+                new_cost = float('inf')
+            current = distance[destination]
+            if next_hop[destination] == sender:
+                # Our route goes through the sender, so follow its cost up or down
+                if new_cost != current:
+                    self._set_route(i, destination, new_cost, sender)
+            elif new_cost < current:
+                self._set_route(i, destination, new_cost, sender)
+            elif current + cost < min(advertised, infinity):
+                # We know a better route than the sender does (and one it can use): tell it
+                mark(i, destination)
+        if self.pending[i]:
+            self._schedule_flush(i)
+
+    def _change_link(self, a, b, cost):
+        if self.automatic_infinity and cost is not None:
+            self.infinity = max(self.infinity, len(self.nodes) * cost)
+        for i, other in ((a, b), (b, a)):
+            old = self.links[i].get(other)
+            if cost == old:
+                continue
+            if cost is None:
+                self.links[i].pop(other, None)
+            else:
+                self.links[i][other] = cost
+            # Routes through the changed link change by the same amount (or are lost)
+            distance, next_hop = self.distance[i], self.next_hop[i]
+            for destination, via in enumerate(next_hop):
+                if via == other and destination != i:
+                    new_cost = float('inf') if cost is None else distance[destination] - old + cost
+                    self._set_route(i, destination, new_cost, other)
+            # A new or cheaper link may offer better routes, so advertise the whole table over it
+            if cost is not None and (old is None or cost < old):
+                for destination, reached in enumerate(distance):
+                    if reached < float('inf'):
+                        self._mark(i, destination)
+            self._schedule_flush(i)
+
+    def change_link(self, a, b, cost, at=None):
+        """
+        Schedules a change to the link between a and b.
+
+        Parameters:
+            a, b: The routers at the ends of the link
+            cost: The new cost, or None to take the link down (a link that does not exist is added)
+            at: Simulation time of the change (default: now)
+        """
+        self._push(self.now if at is None else at, "link", (self.index[a], self.index[b], cost))
+
+    def run(self, until=None):
+        """
+        Processes events until the network converges (no messages left) or until the given time.
+
+        Parameters:
+            until: Simulation time to stop at, or None to run to convergence
+
+        Returns:
+            dict: Whether the network converged, the convergence time (last routing table change),
+                message, entry and table change counts, and the wall-clock time taken.
+        """
+        start = time.perf_counter()
+        events = self.events
+        processed = 0
+        while events and (until is None or events[0][0] <= until):
+            self.now, _, kind, data = heapq.heappop(events)
+            processed += 1
+            if kind == "deliver":
+                self._receive(*data)
+            elif kind == "flush":
+                self._flush(data)
+            else:
+                self._change_link(*data)
+        return {
+            "converged": not events,
+            "convergence_time": self.last_change,
+            "messages": self.messages,
+            "entries": self.entries_sent,
+            "table_changes": self.table_changes,
+            "events": processed,
+            "wall_time": time.perf_counter() - start,
+        }
+
+    def routing_table(self, node):
+        """
+        Returns:
+            dict: {destination: next hop} for every destination node can reach.
+        """
+        nodes = self.nodes
+        return {nodes[d]: nodes[via] for d, via in enumerate(self.next_hop[self.index[node]]) if via >= 0}
+
+    def distance_vector(self, node):
+        """
+        Returns:
+            dict: {destination: cost} for every destination node can reach.
+        """
+        nodes = self.nodes
+        return {nodes[d]: cost for d, cost in enumerate(self.distance[self.index[node]]) if cost < float('inf')}
+
+
+# Matrix-backed distance-vector routing. All routers' distance vectors live in one (R, R) NumPy
+# array, and each synchronous exchange round (every router hears its neighbours' vectors from the
+# previous round) is a vectorised min-plus relaxation instead of a Python loop per message.
+class DistanceVectorMatrix:
+    """
+    Synchronous distance-vector rounds over a dense (R, R) distance matrix.
+
+    Each round every router recomputes its whole vector from its neighbours'
+    vectors of the previous round,
+        D[i, d] = min over neighbours j of cost(i, j) + D[j, d],
+    which is the Bellman-Ford exchange the Router objects perform one message
+    at a time. Neighbours are held as an (R, K) padded index array (K = largest
+    degree); a round gathers the rows D[neighbours[:, k]] for each slot k and
+    keeps a running minimum and next hop, in row blocks to bound memory.
+    Ties go to the neighbour listed first.
+
+    With split_horizon a router does not advertise a route back to the
+    neighbour it goes through, which stops two-router count-to-infinity loops;
+    longer loops still count up until costs reach infinity.
+    """
+
+    def __init__(self, links, infinity=None, split_horizon=True, block_elements=1 << 18):
+        """
+        Parameters:
+            links: Dictionary {router: {neighbour: cost}}, in the same form as Router's neighbors.
+                Links are bidirectional; a link listed only at one end gets the same cost at the other.
+            infinity: Cost treated as unreachable. The default, the number of routers times the
+                largest link cost, is raised by change_link when a link gets more expensive; an
+                explicit value is kept, and routes costing that much or more are dropped.
+            split_horizon: If True, routes are not advertised back to their next hop
+            block_elements: Size of the (rows, R) blocks of candidate routes (small blocks stay in cache)
+        """
+        self.nodes = list(links)
+        for neighbours in links.values():
+            self.nodes.extend(neighbour for neighbour in neighbours if neighbour not in links)
+        self.nodes = list(dict.fromkeys(self.nodes))
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        count = len(self.nodes)
+
+        # Symmetric link costs, {neighbour index: cost} per router; only used to build the
+        # neighbour arrays, so no dense (R, R) cost matrix is kept
+        costs = [{} for _ in range(count)]
+        for node, neighbours in links.items():
+            for neighbour, cost in neighbours.items():
+                costs[self.index[node]][self.index[neighbour]] = cost
+        for i, neighbours in enumerate(costs):
+            neighbours.pop(i, None)
+            for j, cost in neighbours.items():
+                costs[j].setdefault(i, cost)
+
+        # The default bound grows with the largest link cost, so no shortest path ever reaches it
+        self.automatic_infinity = infinity is None
+        if infinity is None:
+            largest = max((cost for neighbours in costs for cost in neighbours.values()), default=1)
+            infinity = count * largest
+        self.infinity = infinity
+        self.split_horizon = split_horizon
+        self.block_elements = block_elements
+
+        # Each router starts knowing only itself; a next hop of -1 means unreachable
+        self.distance = np.full((count, count), np.inf)
+        np.fill_diagonal(self.distance, 0.0)
+        self.next_hop = np.full((count, count), -1, dtype=np.int32)
+        np.fill_diagonal(self.next_hop, np.arange(count))
+        self.changed = np.ones(count, dtype=bool)  # Routers whose vector changed in the last round
+        self.relinked = np.zeros(count, dtype=bool)  # Routers whose links changed since the last round
+        self._build_neighbours(costs)
+
+        # Statistics
+        self.rounds = 0
+        self.messages = 0
+
+    @classmethod
+    def from_routers(cls, routers, **options):
+        """
+        Builds the matrix model from Router objects, using their neighbour costs.
+        """
+        return cls({router.node_id: router.neighbors for router in routers}, **options)
+
+    def _build_neighbours(self, costs):
+        # Padded (R, K) neighbour indices and link costs, in index order within each row
+        count = len(self.nodes)
+        self.degree = np.array([len(neighbours) for neighbours in costs], dtype=np.int64)
+        K = max(int(self.degree.max()) if count else 0, 1)
+        self.neighbours = np.zeros((count, K), dtype=np.int32)
+        self.neighbour_cost = np.full((count, K), np.inf)
+        for i, neighbours in enumerate(costs):
+            order = sorted(neighbours)
+            self.neighbours[i, :len(order)] = order
+            self.neighbour_cost[i, :len(order)] = [neighbours[j] for j in order]
+
+    def _set_neighbour(self, i, j, cost):
+        # Insert, update or (cost None) remove j in router i's neighbour slots, keeping index order
+        degree = int(self.degree[i])
+        neighbours, neighbour_cost = self.neighbours[i], self.neighbour_cost[i]
+        slot = int(np.searchsorted(neighbours[:degree], j))
+        present = slot < degree and neighbours[slot] == j
+        if cost is None:
+            if present:
+                neighbours[slot:degree - 1] = neighbours[slot + 1:degree].copy()
+                neighbour_cost[slot:degree - 1] = neighbour_cost[slot + 1:degree].copy()
+                neighbours[degree - 1], neighbour_cost[degree - 1] = 0, np.inf
+                self.degree[i] -= 1
+        elif present:
+            neighbour_cost[slot] = cost
+        else:
+            if degree == self.neighbours.shape[1]:
+                # Every slot of this row is in use: add a column for all routers
+                count = len(self.nodes)
+                self.neighbours = np.hstack([self.neighbours, np.zeros((count, 1), dtype=np.int32)])
+                self.neighbour_cost = np.hstack([self.neighbour_cost, np.full((count, 1), np.inf)])
+                neighbours, neighbour_cost = self.neighbours[i], self.neighbour_cost[i]
+            neighbours[slot + 1:degree + 1] = neighbours[slot:degree].copy()
+            neighbour_cost[slot + 1:degree + 1] = neighbour_cost[slot:degree].copy()
+            neighbours[slot], neighbour_cost[slot] = j, cost
+            self.degree[i] += 1
+
+    def step(self):
+        """
+        Runs one synchronous exchange round.
+
+        Returns:
+            bool: True if any routing table changed.
+        """
+        count = len(self.nodes)
+
+        # A router's vector can only change if one of its neighbours' vectors or its own links did
+        has_slot = np.arange(self.neighbours.shape[1]) < self.degree[:, None]
+        active = np.flatnonzero((self.changed[self.neighbours] & has_slot).any(axis=1) | self.relinked)
+        # Most linked first, so the routers with a k-th neighbour are a prefix of each block
+        active = active[np.argsort(-self.degree[active], kind="stable")]
+        block = max(1, self.block_elements // max(count, 1))
+        results = []
+
+        for start in range(0, len(active), block):
+            routers = active[start:start + block]
+            degree = self.degree[routers]
+            distance = np.full((len(routers), count), np.inf)
+            next_hop = np.full((len(routers), count), -1, dtype=self.next_hop.dtype)
+
+            # Relax over the k-th neighbour of every router in the block that has one,
+            # so the work is proportional to the number of links, not rows x largest degree
+            for k in range(self.neighbours.shape[1]):
+                linked = np.count_nonzero(degree > k)
+                if not linked:
+                    break
+                rows = routers[:linked]
+                via = self.neighbours[rows, k]
+
+                # Step 1: What the neighbour advertises, with split horizon removing the
+                # routes that go back through this router
+                candidates = self.distance[via]
+                candidates += self.neighbour_cost[rows, k][:, None]
+                if self.split_horizon:
+                    np.copyto(candidates, np.inf, where=self.next_hop[via] == rows[:, None])
+
+                # Step 2: Keep the cheaper of the best route so far and the route via this neighbour
+                better = candidates < distance[:linked]
+                np.copyto(distance[:linked], candidates, where=better)
+                np.copyto(next_hop[:linked], via[:, None], where=better)
+
+            # Step 3: Every router reaches itself for free; costs at infinity are unreachable
+            unreachable = distance >= self.infinity
+            distance[unreachable] = np.inf
+            next_hop[unreachable] = -1
+            distance[np.arange(len(routers)), routers] = 0.0
+            next_hop[np.arange(len(routers)), routers] = routers
+            results.append((routers, distance, next_hop))
+
+        # Only routers whose vector changed last round needed to send it to their neighbours
+        self.messages += int(self.degree[self.changed].sum())
+        self.rounds += 1
+        self.relinked[:] = False
+
+        # Write back only after every router has used the previous round's vectors
+        self.changed = np.zeros(count, dtype=bool)
+        for routers, distance, next_hop in results:
+            changed = ((distance != self.distance[routers]) | (next_hop != self.next_hop[routers])).any(axis=1)
+            self.changed[routers] = changed
+            self.distance[routers] = distance
+            self.next_hop[routers] = next_hop
+        return bool(self.changed.any())
+
+    def run(self, max_rounds=None):
+        """
+        Runs rounds until no routing table changes.
+
+        Parameters:
+            max_rounds: Largest number of rounds to run (default: no limit)
+
+        Returns:
+            dict: Whether the network converged, the rounds taken, message count and wall-clock time.
+        """
+        start = time.perf_counter()
+        rounds = 0
+        converged = False
+        while max_rounds is None or rounds < max_rounds:
+            rounds += 1
+            if not self.step():
+                converged = True
+                break
+        return {
+            "converged": converged,
+            "rounds": rounds,
+            "messages": self.messages,
+            "wall_time": time.perf_counter() - start,
+        }
+
+    def change_link(self, a, b, cost):
+        """
+        Changes the cost of the link between a and b; the next rounds re-converge.
+
+        Parameters:
+            a, b: The routers at the ends of the link
+            cost: The new cost, or None to take the link down (a link that does not exist is added)
+        """
+        i, j = self.index[a], self.index[b]
+        if self.automatic_infinity and cost is not None:
+            self.infinity = max(self.infinity, len(self.nodes) * cost)
+        self._set_neighbour(i, j, cost)
+        self._set_neighbour(j, i, cost)
+        self.relinked[[i, j]] = True
+
+    def routing_table(self, node):
+        """
+        Returns:
+            dict: {destination: next hop} for every destination node can reach.
+        """
+        nodes = self.nodes
+        return {nodes[d]: nodes[via] for d, via in enumerate(self.next_hop[self.index[node]].tolist()) if via >= 0}
+
+    def distance_vector(self, node):
+        """
+        Returns:
+            dict: {destination: cost} for every destination node can reach.
+        """
+        nodes = self.nodes
+        row = self.distance[self.index[node]].tolist()
+        return {nodes[d]: cost for d, cost in enumerate(row) if cost < float('inf')}
+
+
+# Builds a random connected topology for testing: a ring through all routers plus random extra links
+def random_topology(routers, extra_links=None, max_cost=10, seed=None):
+    rng = random.Random(seed)
+    extra_links = routers if extra_links is None else extra_links
+    links = {node: {} for node in range(routers)}
+    for node in range(routers):
+        other = (node + 1) % routers
+        if other != node:
+            links[node][other] = links[other][node] = rng.randint(1, max_cost)
+    for _ in range(extra_links):
+        a, b = rng.randrange(routers), rng.randrange(routers)
+        if a != b:
+            links[a][b] = links[b][a] = rng.randint(1, max_cost)
+    return links
+
+
+# Simulates convergence of a random network, then a link failure, and prints the statistics
+def benchmark_distance_vector(routers=2000, extra_links=None, seed=0):
+    links = random_topology(routers, extra_links, seed=seed)
+    simulator = DistanceVectorSimulator(links, seed=seed)
+    report = simulator.run()
+    print(f"{routers} routers, cold start:   converged at t={report['convergence_time']:.1f}, "
+          f"{report['messages']:,} messages, {report['entries']:,} entries, {report['wall_time']:.2f} s")
+
+    a, b = 0, next(iter(links[0]))
+    simulator.change_link(a, b, None)
+    before = simulator.messages, simulator.entries_sent
+    report = simulator.run()
+    print(f"{routers} routers, link {a}-{b} down: converged at t={report['convergence_time']:.1f}, "
+          f"{report['messages'] - before[0]:,} messages, {report['entries'] - before[1]:,} entries, "
+          f"{report['wall_time']:.2f} s")
+
+
+# Converges a random network with the event-driven simulator and with matrix rounds,
+# prints both timings and checks that they agree
+def benchmark_distance_vector_matrix(routers=2000, extra_links=None, seed=0):
+    links = random_topology(routers, extra_links, seed=seed)
+    simulator = DistanceVectorSimulator(links, seed=seed)
+    report = simulator.run()
+    print(f"{routers} routers, event-driven:  {report['messages']:,} messages, {report['wall_time']:.2f} s")
+
+    matrix = DistanceVectorMatrix(links)
+    report = matrix.run()
+    print(f"{routers} routers, matrix rounds: {report['rounds']} rounds, {report['messages']:,} messages, "
+          f"{report['wall_time']:.2f} s")
+
+    # Equal-cost paths may be broken differently, so check every next hop lies on a shortest path
+    distance = np.array([[simulator.distance[i][d] for d in range(routers)] for i in range(routers)])
+    via = matrix.next_hop
+    link_cost = np.array([[simulator.links[i].get(hop, np.inf) for hop in row] for i, row in enumerate(via.tolist())])
+    on_shortest_path = link_cost + distance[via, np.arange(routers)] == distance
+    np.fill_diagonal(on_shortest_path, True)
+    print(f"distances match: {np.array_equal(distance, matrix.distance)}, "
+          f"next hops on shortest paths: {on_shortest_path.all()}, "
+          f"identical next hops: {np.mean(via == np.array(simulator.next_hop)):.1%}")
+
+# This function runs the same four-router network through the event-driven simulator and prints the tables
+def simulate_network_events():
+    simulator = DistanceVectorSimulator({'A': {'B': 1, 'C': 4}, 'B': {'A': 1, 'C': 2, 'D': 5},
+                                         'C': {'A': 4, 'B': 2}, 'D': {'B': 5}})
+    report = simulator.run()
+    print(f"Converged at t={report['convergence_time']:.1f} after {report['messages']} messages")
+    for node in simulator.nodes:
+        print(f"Router {node}: distances {simulator.distance_vector(node)}, next hops {simulator.routing_table(node)}")
+
 # This ensures that the network simulation starts only when this file is run directly
 if __name__ == "__main__":
+    simulate_network_events()  # Run the event-driven simulation to convergence
     simulate_network()  # Set up the network and start the simulation
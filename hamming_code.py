@@ -1,6 +1,11 @@
+import functools
+
+import numpy as np
+
+
 def calculate_parity_bits(m):
     # Calculate the number of parity bits required
-    for i in range(m):
+    for i in range(m + 2):  # Small inputs (m = 1, 2) need more parity bits than data bits
         if 2**i >= m + i + 1:
             return i
 
@@ -72,6 +77,308 @@ def hamming_decode(encoded):
 
     return ''.join(decoded), error_position
 
+
+@functools.lru_cache(maxsize=None)
+def hamming_matrices(k):
+    """
+    Build the matrices used by the batch Hamming encoder/decoder for k data bits.
+    Bit positions follow hamming_encode: position p (1-based) is a parity bit
+    when p is a power of 2, otherwise it carries the next data bit.
+
+    :param k: Number of data bits per codeword (e.g. 4 for Hamming(7,4))
+    :return: (G, H, data_positions, error_patterns) where
+             G is the k x n generator matrix,
+             H is the r x n parity-check matrix,
+             data_positions are the codeword columns holding the data bits,
+             error_patterns maps every syndrome value to the n-bit error vector to XOR in
+    """
+    r = calculate_parity_bits(k)
+    n = k + r
+    positions = np.arange(1, n + 1)
+
+    # Parity-check matrix: column p holds the binary representation of position p
+    H = ((positions[None, :] >> np.arange(r)[:, None]) & 1).astype(np.uint8)
+
+    # Generator matrix: each data bit is copied to its position and
+    # contributes to every parity bit whose check covers that position
+    data_positions = np.flatnonzero(positions & (positions - 1))
+    parity_positions = (1 << np.arange(r)) - 1
+    G = np.zeros((k, n), dtype=np.uint8)
+    G[np.arange(k), data_positions] = 1
+    G[:, parity_positions] = H[:, data_positions].T
+
+    # Syndrome lookup table: syndrome s means position s is in error. Syndromes
+    # pointing past the end of a shortened code cannot be corrected and map to no change
+    error_patterns = np.zeros((1 << r, n), dtype=np.uint8)
+    error_patterns[positions, positions - 1] = 1
+
+    return G, H, data_positions, error_patterns
+
+
+def hamming_encode_batch(data_bits, k=4):
+    """
+    Encode a whole batch of data words at once with the generator matrix.
+    :param data_bits: 2-D uint8 array of shape (N, k) holding one data word of 0/1 per row
+    :param k: Number of data bits per codeword
+    :return: uint8 array of shape (N, n) holding the codewords
+    """
+    G = hamming_matrices(k)[0]
+    data_bits = np.asarray(data_bits, dtype=np.uint8).reshape(-1, k)
+    # uint8 sums wrap modulo 256, which keeps the parity (lowest bit) intact
+    return (data_bits @ G) & 1
+
+
+def hamming_decode_batch(codewords, k=4):
+    """
+    Decode a whole batch of codewords, correcting any single-bit error in each,
+    with one syndrome product and one table lookup for the entire batch.
+    :param codewords: 2-D uint8 array of shape (N, n) holding one codeword of 0/1 per row
+    :param k: Number of data bits per codeword
+    :return: Decoded (N, k) data array and the (N,) array of error positions (0 if no error)
+    """
+    _, H, data_positions, error_patterns = hamming_matrices(k)
+    r, n = H.shape
+    codewords = np.asarray(codewords, dtype=np.uint8).reshape(-1, n)
+
+    # Syndrome bits for every codeword, combined into the 1-based error position
+    syndromes = ((codewords @ H.T) & 1).astype(np.intp) @ (1 << np.arange(r))
+
+    # Flip the erroneous bit of every codeword in one vectorised pass
+    corrected = codewords ^ error_patterns[syndromes]
+    return corrected[:, data_positions], syndromes
+
+
+def hamming_encode_packed(data, k=4):
+    """
+    Encode packed bytes, splitting their bits into k-bit data words.
+    :param data: Input bytes
+    :param k: Number of data bits per codeword
+    :return: Packed bytes holding the concatenated codewords (zero padded to a whole byte)
+    """
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+    pad = -len(bits) % k
+    if pad:
+        bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
+    return np.packbits(hamming_encode_batch(bits.reshape(-1, k), k)).tobytes()
+
+
+def hamming_decode_packed(packed, n_bytes, k=4):
+    """
+    Decode bytes produced by hamming_encode_packed, correcting single-bit errors.
+    :param packed: Encoded bytes
+    :param n_bytes: Length of the original data in bytes
+    :param k: Number of data bits per codeword
+    :return: Decoded bytes and the number of codewords that had an error corrected
+    """
+    n = hamming_matrices(k)[1].shape[1]
+    n_codewords = -(-n_bytes * 8 // k)
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=n_codewords * n)
+    decoded, syndromes = hamming_decode_batch(bits.reshape(-1, n), k)
+    data = np.packbits(decoded.reshape(-1)[:n_bytes * 8]).tobytes()
+    return data, int(np.count_nonzero(syndromes))
+
+
+class SECDEDCodec:
+    """
+    Extended Hamming (SECDED) codec for a fixed number of data bits.
+
+    Codewords use the same layout as hamming_encode (positions 1..n-1, parity
+    bits at powers of 2) plus an overall parity bit at position n, so single-bit
+    errors are corrected and double-bit errors are detected. Codewords and data
+    words are Python ints: bit p-1 holds position p, bit i holds data bit i.
+
+    Everything that depends only on the block size is built once in __init__,
+    so encode and decode are just byte-table lookups and XORs.
+    """
+
+    def __init__(self, k):
+        """
+        :param k: Number of data bits per codeword (e.g. 64 for SECDED(72,64))
+        """
+        self.k = k
+        self.r = calculate_parity_bits(k)
+        self.n = k + self.r + 1  # Hamming bits plus the overall parity bit
+        self.n_bytes = (self.n + 7) // 8
+
+        # Position masks: parity bit 2^i checks every position with bit i set
+        hamming_length = self.n - 1
+        self.data_positions = [p for p in range(1, hamming_length + 1) if p & (p - 1)]
+        self.position_masks = [
+            sum(1 << (p - 1) for p in range(1, hamming_length + 1) if p & (1 << i))
+            for i in range(self.r)
+        ]
+
+        # Generator matrix rows: the codeword produced by each single data bit
+        self.generator = []
+        for p in self.data_positions:
+            row = 1 << (p - 1)
+            for i in range(self.r):
+                if p & (1 << i):
+                    row |= 1 << ((1 << i) - 1)
+            if row.bit_count() & 1:  # Overall parity keeps every codeword even
+                row |= 1 << (self.n - 1)
+            self.generator.append(row)
+
+        # Syndrome table: data-bit mask to flip for each error position
+        # (parity positions and the overall parity bit carry no data)
+        self.syndrome_table = [0] * (self.n + 1)
+        for i, p in enumerate(self.data_positions):
+            self.syndrome_table[p] = 1 << i
+
+        # Byte tables: encode maps data bytes to codeword bits, while decode maps
+        # codeword bytes to their syndrome contribution and their data bits
+        self._encode_tables = self._byte_table(lambda bit: self.generator[bit] if bit < k else 0)
+        self._syndrome_tables = self._byte_table(
+            lambda bit: bit + 1 if bit < hamming_length else 0, self.n_bytes)
+        self._extract_tables = self._byte_table(
+            lambda bit: self.syndrome_table[bit + 1] if bit < hamming_length else 0, self.n_bytes)
+
+    def _byte_table(self, contribution, n_chunks=None):
+        """
+        Build one 256-entry table per byte of input, XORing together the
+        contribution of each set bit.
+        """
+        if n_chunks is None:
+            n_chunks = (self.k + 7) // 8
+        tables = []
+        for chunk in range(n_chunks):
+            bits = [contribution(8 * chunk + t) for t in range(8)]
+            table = [0] * 256
+            for value in range(1, 256):
+                low = value & -value  # Lowest set bit builds on an already computed entry
+                table[value] = table[value ^ low] ^ bits[low.bit_length() - 1]
+            tables.append(table)
+        return tables
+
+    def encode(self, data):
+        """
+        Encode one data word.
+        :param data: Data word as an int of k bits
+        :return: Codeword as an int of n bits
+        """
+        codeword = 0
+        for table in self._encode_tables:
+            codeword ^= table[data & 0xFF]
+            data >>= 8
+        return codeword
+
+    def decode(self, codeword):
+        """
+        Decode one codeword, correcting a single-bit error.
+        :param codeword: Codeword as an int of n bits
+        :return: Decoded data word and error position (0 if no error, n for the overall parity bit)
+        :raises ValueError: If a double-bit (uncorrectable) error is detected
+        """
+        syndrome = 0
+        data = 0
+        word = codeword
+        for syndrome_table, extract_table in zip(self._syndrome_tables, self._extract_tables):
+            byte = word & 0xFF
+            syndrome ^= syndrome_table[byte]
+            data ^= extract_table[byte]
+            word >>= 8
+
+        if not codeword.bit_count() & 1:
+            if syndrome:
+                raise ValueError("double-bit error detected")
+            return data, 0
+
+        # Odd overall parity: a single error, at the syndrome position or in the parity bit itself
+        error_position = syndrome or self.n
+        if error_position > self.n:
+            raise ValueError("uncorrectable error detected")
+        return data ^ self.syndrome_table[error_position], error_position
+
+    def encode_stream(self, src, dst, chunk_size=1 << 16):
+        """
+        Protect a whole byte stream in one pass, framing it into codewords.
+        The data is padded with 0x80 then zeros to a whole block, so the
+        decoder can strip the padding without knowing the length in advance.
+        :param src: Readable binary file-like object
+        :param dst: Writable binary file-like object
+        :param chunk_size: Bytes to read at a time (rounded to whole blocks)
+        :return: Number of codewords written
+        """
+        if self.k % 8:
+            raise ValueError("stream mode needs a whole number of data bytes per codeword")
+        block = self.k // 8
+        chunk_size = max(block, chunk_size - chunk_size % block)
+        encode = self.encode
+        n_bytes = self.n_bytes
+        written = 0
+        pending = b""
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            usable = len(pending) - len(pending) % block
+            out = bytearray(usable // block * n_bytes)
+            for i, offset in enumerate(range(0, usable, block)):
+                data = int.from_bytes(pending[offset:offset + block], "little")
+                out[i * n_bytes:(i + 1) * n_bytes] = encode(data).to_bytes(n_bytes, "little")
+            dst.write(out)
+            written += usable // block
+            pending = pending[usable:]
+
+        # Final block always carries the padding marker
+        tail = pending + b"\x80" + bytes(block - len(pending) - 1)
+        dst.write(encode(int.from_bytes(tail, "little")).to_bytes(n_bytes, "little"))
+        return written + 1
+
+    def decode_stream(self, src, dst, chunk_size=1 << 16):
+        """
+        Decode a stream written by encode_stream, correcting single-bit errors.
+        :param src: Readable binary file-like object
+        :param dst: Writable binary file-like object
+        :param chunk_size: Bytes to read at a time (rounded to whole codewords)
+        :return: Number of codewords that had an error corrected
+        :raises ValueError: If a double-bit error is detected or the stream is malformed
+        """
+        if self.k % 8:
+            raise ValueError("stream mode needs a whole number of data bytes per codeword")
+        block = self.k // 8
+        n_bytes = self.n_bytes
+        chunk_size = max(n_bytes, chunk_size - chunk_size % n_bytes)
+        decode = self.decode
+        corrected = 0
+        held = b""  # The last decoded block is held back until we know it is not the final one
+        pending = b""
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            pending += chunk
+            usable = len(pending) - len(pending) % n_bytes
+            out = bytearray(held)
+            for offset in range(0, usable, n_bytes):
+                data, error_position = decode(int.from_bytes(pending[offset:offset + n_bytes], "little"))
+                corrected += error_position != 0
+                out += data.to_bytes(block, "little")
+            pending = pending[usable:]
+            if out:
+                dst.write(out[:-block])
+                held = bytes(out[-block:])
+
+        if pending or not held:
+            raise ValueError("stream is not a whole number of codewords")
+        marker = held.rstrip(b"\x00")
+        if not marker.endswith(b"\x80"):
+            raise ValueError("missing padding marker")
+        dst.write(marker[:-1])
+        return corrected
+
+
+@functools.lru_cache(maxsize=None)
+def secded_codec(k):
+    """
+    Return the shared SECDEDCodec for k data bits, building its tables only once.
+    :param k: Number of data bits per codeword
+    :return: SECDEDCodec instance
+    """
+    return SECDEDCodec(k)
+
+
 # Example usage
 data = "1011"
 encoded_data = hamming_encode(data)
@@ -88,3 +395,24 @@ print(f"Encoded Data with Error: {error_encoded_data}")
 
 decoded_data, error_position = hamming_decode(error_encoded_data)
 print(f"Decoded Data: {decoded_data}, Error Position: {error_position}")
+
+# Batch Hamming(7,4) over a NumPy bit array
+data_words = np.array([[1, 0, 1, 1], [0, 1, 1, 0], [1, 1, 1, 1]], dtype=np.uint8)
+codewords = hamming_encode_batch(data_words)
+print(f"Batch Encoded: {[''.join(map(str, row)) for row in codewords]}")
+codewords[1, 2] ^= 1  # Introduce an error in the second codeword
+decoded_words, error_positions = hamming_decode_batch(codewords)
+print(f"Batch Decoded: {[''.join(map(str, row)) for row in decoded_words]}, Error Positions: {error_positions}")
+
+# Packed bytes in and out
+packed = hamming_encode_packed(b"Hamming")
+print(f"Packed Round Trip: {hamming_decode_packed(packed, len(b'Hamming'))}")
+
+# SECDED(72,64): correct single-bit errors and detect double-bit errors
+codec = secded_codec(64)
+codeword = codec.encode(0x0123456789ABCDEF)
+print(f"SECDED Decoded: {codec.decode(codeword ^ (1 << 10))[0]:#x}, Error Position: {codec.decode(codeword ^ (1 << 10))[1]}")
+try:
+    codec.decode(codeword ^ 0b101)
+except ValueError as error:
+    print(f"SECDED: {error}")
@@ -1,4 +1,10 @@
+import time
+
 import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+
+_MISSING = object()  # Sentinel for an exhausted control iterator
+
 
 def kalman_filter(A, B, H, Q, R, x_initial, P_initial, measurements, controls):
     """
@@ -44,6 +50,471 @@ def kalman_filter(A, B, H, Q, R, x_initial, P_initial, measurements, controls):
     
     return np.array(x_estimates), np.array(P_estimates)
 
+def cholesky_gain(P, H, R):
+    """
+    Computes the Kalman gain K = P H^T (H P H^T + R)^-1 without forming an inverse.
+    The innovation covariance S is symmetric positive definite, so it is factored
+    once as S = L L^T (cho_factor) and K^T = S^-1 H P comes from the two
+    triangular solves in cho_solve.
+
+    Parameters:
+        P: Predicted estimate covariance
+        H: Observation matrix
+        R: Measurement noise covariance
+
+    Returns:
+        K: Kalman gain
+    """
+    HP = H @ P
+    factor = cho_factor(HP @ H.T + R, check_finite=False)
+    return cho_solve(factor, HP, check_finite=False).T
+
+
+def solve_dare(A, H, Q, R, tol=1e-12, max_iter=100):
+    """
+    Solves the filter's discrete algebraic Riccati equation
+        P = A P A^T - A P H^T (H P H^T + R)^-1 H P A^T + Q
+    for the steady-state predicted covariance, using the structured doubling
+    algorithm (quadratic convergence, each step doubles the horizon).
+
+    Parameters:
+        A: State transition matrix
+        H: Observation matrix
+        Q: Process noise covariance
+        R: Measurement noise covariance
+        tol: Relative convergence tolerance
+        max_iter: Maximum number of doubling steps
+
+    Returns:
+        P: Steady-state predicted covariance
+    """
+    n = A.shape[0]
+    I = np.eye(n)
+    A_k = A.T.astype(float)
+    G_k = H.T @ np.linalg.solve(R, H)
+    H_k = Q.astype(float)
+    for _ in range(max_iter):
+        W = I + G_k @ H_k
+        W_inv_A = np.linalg.solve(W, A_k)
+        W_inv_G = np.linalg.solve(W, G_k)
+        H_next = H_k + A_k.T @ H_k @ W_inv_A
+        G_k = G_k + A_k @ W_inv_G @ A_k.T
+        A_k = A_k @ W_inv_A
+        converged = np.abs(H_next - H_k).max() <= tol * np.abs(H_next).max()
+        H_k = (H_next + H_next.T) / 2
+        if converged:
+            return H_k
+    raise ValueError("Riccati equation did not converge (is the model detectable and stabilisable?)")
+
+
+def kalman_filter_fast(A, B, H, Q, R, x_initial, P_initial, measurements, controls,
+                       steady_state="detect", tol=1e-9, store_covariance=True):
+    """
+    Kalman Filter fast path for time-invariant models and long measurement traces.
+
+    The gain comes from Cholesky solves and the covariance from the Joseph form
+    (I - K H) P (I - K H)^T + K R K^T, which stays symmetric positive definite.
+    Once the covariance stops changing, the gain is frozen and each step is a
+    single affine update x = F x + w[n], with the driving terms w computed for
+    all remaining steps in one matrix product. Outputs are written into
+    preallocated arrays.
+
+    Parameters:
+        A, B, H, Q, R, x_initial, P_initial, measurements, controls: As for kalman_filter
+        steady_state: "detect" to switch to the steady-state gain once the predicted
+            covariance changes by less than tol (relative), "dare" to use the gain
+            from solve_dare from the first step, or None to run the full recursion
+        tol: Relative change in the predicted covariance treated as converged
+        store_covariance: If False, P_estimates is not stored (None is returned)
+
+    Returns:
+        x_estimates: (T, n) array of state estimates
+        P_estimates: (T, n, n) array of estimate covariance matrices, or None
+    """
+    if steady_state not in ("detect", "dare", None):
+        raise ValueError("steady_state must be 'detect', 'dare' or None")
+
+    # Step 1: Bring inputs into (T, m) arrays and allocate the outputs once
+    T = len(measurements)
+    measurements = np.asarray(measurements, dtype=float).reshape(T, H.shape[0])
+    controls = np.asarray(controls, dtype=float).reshape(T, B.shape[1])
+    x = np.asarray(x_initial, dtype=float).ravel()
+    P = np.asarray(P_initial, dtype=float)
+    n = len(x)
+    I = np.eye(n)
+    x_estimates = np.empty((T, n))
+    P_estimates = np.empty((T, n, n)) if store_covariance else None
+    control_terms = controls @ B.T  # B u for every step
+
+    # Step 2: Full recursion until the covariance settles
+    start = 0
+    if steady_state == "dare":
+        K = cholesky_gain(solve_dare(A, H, Q, R), H, R)
+    else:
+        P_previous = None
+        while start < T:
+            x = A @ x + control_terms[start]
+            P_predicted = A @ P @ A.T + Q
+            K = cholesky_gain(P_predicted, H, R)
+            x = x + K @ (measurements[start] - H @ x)
+            I_KH = I - K @ H
+            P = I_KH @ P_predicted @ I_KH.T + K @ R @ K.T
+
+            x_estimates[start] = x
+            if store_covariance:
+                P_estimates[start] = P
+            start += 1
+
+            if (steady_state == "detect" and P_previous is not None
+                    and np.abs(P_predicted - P_previous).max() <= tol * np.abs(P_predicted).max()):
+                break
+            P_previous = P_predicted
+
+    if start == T:
+        return x_estimates, P_estimates
+
+    # Step 3: Steady state, x = (I - K H)(A x + B u) + K z = F x + w
+    I_KH = I - K @ H
+    F = I_KH @ A
+    driving_terms = control_terms[start:] @ I_KH.T + measurements[start:] @ K.T
+    for n_step, w in enumerate(driving_terms, start):
+        x = F @ x + w
+        x_estimates[n_step] = x
+    if store_covariance:
+        P_predicted = A @ P @ A.T + Q if steady_state == "detect" else solve_dare(A, H, Q, R)
+        P_estimates[start:] = I_KH @ P_predicted @ I_KH.T + K @ R @ K.T
+
+    return x_estimates, P_estimates
+
+
+def benchmark_kalman(steps=100_000, n=4):
+    """
+    Prints the time for kalman_filter and each kalman_filter_fast mode on a
+    constant-velocity tracking model, and the largest difference in the estimates.
+
+    Parameters:
+        steps: Number of measurements
+        n: State dimension (position and velocity for n // 2 axes)
+    """
+    rng = np.random.default_rng(0)
+    axes = n // 2
+    A = np.kron(np.eye(axes), np.array([[1.0, 1.0], [0.0, 1.0]]))
+    B = np.zeros((2 * axes, 1))
+    H = np.kron(np.eye(axes), np.array([[1.0, 0.0]]))
+    Q = 0.01 * np.eye(2 * axes)
+    R = 0.5 * np.eye(axes)
+    measurements = np.cumsum(rng.normal(size=(steps, axes)), axis=0)
+    controls = np.zeros((steps, 1))
+    x0, P0 = np.zeros(2 * axes), np.eye(2 * axes)
+
+    start = time.perf_counter()
+    reference, _ = kalman_filter(A, B, H, Q, R, x0, P0, measurements, controls)
+    baseline = time.perf_counter() - start
+    print(f"kalman_filter          {baseline:8.3f} s")
+
+    for mode in (None, "detect", "dare"):
+        start = time.perf_counter()
+        estimates, _ = kalman_filter_fast(A, B, H, Q, R, x0, P0, measurements, controls, steady_state=mode)
+        elapsed = time.perf_counter() - start
+        print(f"fast ({str(mode):<6})          {elapsed:8.3f} s  {baseline / elapsed:6.1f}x  "
+              f"max difference {np.abs(estimates - reference).max():.2e}")
+
+
+def _stacked_gain(P, H, R):
+    """
+    Kalman gains for a (T, n, n) stack of covariances, with one batched solve
+    (K^T = S^-1 H P). scipy's Cholesky routines take one matrix at a time, so
+    the stack goes through np.linalg.solve instead: for many tiny systems one
+    batched LU solve is cheaper than a Python loop of cho_factor/cho_solve calls.
+    """
+    HP = H @ P
+    return np.swapaxes(np.linalg.solve(HP @ H.T + R, HP), -1, -2)
+
+
+def kalman_filter_batched(A, B, H, Q, R, x_initial, P_initial, measurements, controls=None,
+                          mask=None, store_covariance=False):
+    """
+    Runs the same Kalman Filter model over many independent tracks at once.
+    States are kept as a (T, n) array and covariances as a (T, n, n) stack, so
+    every time step is a handful of stacked matmuls and batched solves
+    instead of a Python loop over tracks.
+
+    While every track has been observed at every step, all tracks share the same
+    covariance (it does not depend on the measurements), so a single (n, n)
+    covariance is propagated until the first missing measurement splits them.
+
+    Parameters:
+        A, B, H, Q, R: Model matrices, shared by all tracks
+        x_initial: (T, n) initial state estimates
+        P_initial: (n, n) initial covariance shared by all tracks, or (T, n, n)
+        measurements: (S, T, m) array of measurements for S steps and T tracks
+        controls: Control inputs broadcastable to (S, T, k), e.g. (k,) for one control for
+            every track and step or (S, 1, k) per step, or None for no control
+        mask: (S, T) boolean array, False where a measurement is missing (None: all present)
+        store_covariance: If True, also return the covariance of every track at every step
+
+    Returns:
+        x_estimates: (S, T, n) array of state estimates
+        P_estimates: (S, T, n, n) array if store_covariance, else the final (T, n, n) covariances
+    """
+    measurements = np.asarray(measurements, dtype=float)
+    steps, tracks = measurements.shape[:2]
+    x = np.array(x_initial, dtype=float).reshape(tracks, -1)
+    P = np.array(P_initial, dtype=float)
+    n = x.shape[1]
+    I = np.eye(n)
+    control_terms = None
+    if controls is not None:
+        # B u first, then broadcast, so a shared (k,) control never materialises an (S, T, k) copy
+        control_terms = np.broadcast_to(np.asarray(controls, dtype=float) @ B.T, (steps, tracks, n))
+
+    x_estimates = np.empty((steps, tracks, n))
+    P_estimates = np.empty((steps, tracks, n, n)) if store_covariance else None
+
+    for step in range(steps):
+        # Step 1: Predict every track
+        x = x @ A.T
+        if control_terms is not None:
+            x += control_terms[step]
+        P = A @ P @ A.T + Q
+
+        # Step 2: Once a track misses a measurement its covariance diverges from the others
+        observed = None if mask is None else np.asarray(mask[step], dtype=bool)
+        if observed is not None and observed.all():
+            observed = None
+        if observed is not None and P.ndim == 2:
+            P = np.repeat(P[None], tracks, axis=0)
+
+        # Step 3: Update the observed tracks (Joseph form)
+        if observed is None:
+            K = cholesky_gain(P, H, R) if P.ndim == 2 else _stacked_gain(P, H, R)
+            x += np.einsum("...ij,...j->...i", K, measurements[step] - x @ H.T)
+            I_KH = I - K @ H
+            P = I_KH @ P @ np.swapaxes(I_KH, -1, -2) + K @ R @ np.swapaxes(K, -1, -2)
+        else:
+            seen = np.flatnonzero(observed)
+            K = _stacked_gain(P[seen], H, R)
+            innovation = measurements[step, seen] - x[seen] @ H.T
+            x[seen] += np.einsum("tij,tj->ti", K, innovation)
+            I_KH = I - K @ H
+            P[seen] = I_KH @ P[seen] @ np.swapaxes(I_KH, -1, -2) + K @ R @ np.swapaxes(K, -1, -2)
+
+        x_estimates[step] = x
+        if store_covariance:
+            P_estimates[step] = P
+
+    if not store_covariance:
+        P_estimates = np.broadcast_to(P, (tracks, n, n)).copy() if P.ndim == 2 else P
+    return x_estimates, P_estimates
+
+
+def benchmark_kalman_batched(tracks=2000, steps=200, missing=0.1):
+    """
+    Prints tracks x steps per second for kalman_filter_batched (with and without
+    missing measurements) against calling kalman_filter once per track.
+
+    Parameters:
+        tracks: Number of independent tracks
+        steps: Number of time steps
+        missing: Fraction of measurements dropped in the masked run
+    """
+    rng = np.random.default_rng(0)
+    A = np.kron(np.eye(2), np.array([[1.0, 1.0], [0.0, 1.0]]))
+    B = np.zeros((4, 1))
+    H = np.kron(np.eye(2), np.array([[1.0, 0.0]]))
+    Q = 0.01 * np.eye(4)
+    R = 0.5 * np.eye(2)
+    measurements = np.cumsum(rng.normal(size=(steps, tracks, 2)), axis=0)
+    controls = np.zeros((steps, 1))
+    x0, P0 = np.zeros((tracks, 4)), np.eye(4)
+    work = tracks * steps
+
+    start = time.perf_counter()
+    reference = np.stack([kalman_filter(A, B, H, Q, R, x0[t], P0, measurements[:, t], controls)[0]
+                          for t in range(tracks)], axis=1)
+    looped = time.perf_counter() - start
+    print(f"kalman_filter per track  {work / looped:12,.0f} track-steps/s")
+
+    start = time.perf_counter()
+    estimates, _ = kalman_filter_batched(A, B, H, Q, R, x0, P0, measurements)
+    elapsed = time.perf_counter() - start
+    print(f"batched                  {work / elapsed:12,.0f} track-steps/s  {looped / elapsed:6.1f}x  "
+          f"max difference {np.abs(estimates - reference).max():.2e}")
+
+    mask = rng.random((steps, tracks)) >= missing
+    start = time.perf_counter()
+    kalman_filter_batched(A, B, H, Q, R, x0, P0, measurements, mask=mask)
+    elapsed = time.perf_counter() - start
+    print(f"batched, {missing:.0%} missing     {work / elapsed:12,.0f} track-steps/s  {looped / elapsed:6.1f}x")
+
+
+class KalmanFilter:
+    """
+    Kalman Filter that is stepped one measurement at a time, for sensor feeds
+    that are too long (or unbounded) to hold as arrays.
+
+    The state and covariance live in buffers allocated once in __init__, and
+    every matmul in step() writes into a preallocated buffer, so memory stays
+    constant however many measurements are processed. The only per-step
+    allocation is the m x m innovation solve, and scalar measurements avoid
+    even that.
+    """
+
+    def __init__(self, A, B, H, Q, R, x_initial, P_initial):
+        """
+        Parameters:
+            A, B, H, Q, R: Model matrices, as for kalman_filter (B may be None for no control)
+            x_initial: Initial state estimate
+            P_initial: Initial estimate covariance
+        """
+        self.A = np.array(A, dtype=float)
+        self.B = None if B is None else np.array(B, dtype=float)
+        self.H = np.array(H, dtype=float)
+        self.Q = np.array(Q, dtype=float)
+        self.R = np.array(R, dtype=float)
+        self.x = np.array(x_initial, dtype=float).ravel()
+        self.P = np.array(P_initial, dtype=float)
+        n, m = len(self.x), self.H.shape[0]
+
+        # Work buffers, reused by every step
+        self._I = np.eye(n)
+        self._x_next = np.empty(n)
+        self._Bu = np.empty(n)
+        self._dx = np.empty(n)
+        self._Hx = np.empty(m)
+        self._innovation = np.empty(m)
+        self._HP = np.empty((m, n))
+        self._S = np.empty((m, m))
+        self._KT = np.empty((m, n))  # Kalman gain, stored transposed
+        self._KR = np.empty((n, m))
+        self._I_KH = np.empty((n, n))
+        self._work = np.empty((n, n))
+
+    def step(self, z, u=None):
+        """
+        Runs one predict and update step.
+
+        Parameters:
+            z: Measurement for this step, or None to only predict (missing measurement)
+            u: Control input for this step, or None for no control
+
+        Returns:
+            x: The updated state estimate. This is the filter's own buffer and is
+               overwritten by the next step, so copy it to keep it.
+        """
+        A, H, x, P = self.A, self.H, self.x, self.P
+
+        # Step 1: Predict, x = A x + B u and P = A P A^T + Q
+        np.matmul(A, x, out=self._x_next)
+        if u is not None and self.B is not None:
+            np.matmul(self.B, u, out=self._Bu)
+            self._x_next += self._Bu
+        x[:] = self._x_next
+        np.matmul(A, P, out=self._work)
+        np.matmul(self._work, A.T, out=P)
+        P += self.Q
+        if z is None:
+            return x
+
+        # Step 2: Kalman gain, K^T = S^-1 H P with S = H P H^T + R
+        np.matmul(H, P, out=self._HP)
+        np.matmul(self._HP, H.T, out=self._S)
+        self._S += self.R
+        if self._S.shape[0] == 1:
+            np.divide(self._HP, self._S[0, 0], out=self._KT)
+        else:
+            self._KT[:] = np.linalg.solve(self._S, self._HP)
+        K = self._KT.T
+
+        # Step 3: Update the state, x = x + K (z - H x)
+        np.matmul(H, x, out=self._Hx)
+        np.subtract(z, self._Hx, out=self._innovation)
+        np.matmul(self._innovation, self._KT, out=self._dx)
+        x += self._dx
+
+        # Step 4: Update the covariance (Joseph form), P = (I - K H) P (I - K H)^T + K R K^T
+        np.matmul(K, H, out=self._I_KH)
+        np.subtract(self._I, self._I_KH, out=self._I_KH)
+        np.matmul(self._I_KH, P, out=self._work)
+        np.matmul(self._work, self._I_KH.T, out=P)
+        np.matmul(K, self.R, out=self._KR)
+        np.matmul(self._KR, self._KT, out=self._work)
+        P += self._work
+        return x
+
+    def stream(self, measurements, controls=None, covariance_every=None):
+        """
+        Filters a stream of measurements, yielding each estimate as it is made.
+        Only the current step is held in memory, so the stream may be unbounded.
+
+        Parameters:
+            measurements: Iterable of measurements (None entries are missing measurements)
+            controls: Iterable of control inputs matching measurements, or None for no control
+            covariance_every: Yield a copy of the covariance every this many steps
+                (None never yields it)
+
+        Yields:
+            (x, P): Copy of the state estimate, and a copy of the covariance on
+                decimated steps (None otherwise)
+
+        Raises:
+            ValueError: If controls and measurements have different lengths
+        """
+        controls = None if controls is None else iter(controls)
+        count = 0
+        for z in measurements:
+            u = self._next_control(controls)
+            count += 1
+            x = self.step(z, u).copy()
+            yield x, self._decimated_covariance(count, covariance_every)
+        self._check_controls_exhausted(controls)
+
+    async def astream(self, measurements, controls=None, covariance_every=None):
+        """
+        Asynchronous version of stream(), for measurements arriving from an
+        async iterable (a socket reader, an asyncio.Queue consumer, ...).
+
+        Parameters:
+            measurements: Async iterable of measurements (None entries are missing measurements)
+            controls: Iterable of control inputs matching measurements, or None for no control
+            covariance_every: Yield a copy of the covariance every this many steps
+                (None never yields it)
+
+        Yields:
+            (x, P): As for stream()
+
+        Raises:
+            ValueError: As for stream()
+        """
+        controls = None if controls is None else iter(controls)
+        count = 0
+        async for z in measurements:
+            u = self._next_control(controls)
+            count += 1
+            x = self.step(z, u).copy()
+            yield x, self._decimated_covariance(count, covariance_every)
+        self._check_controls_exhausted(controls)
+
+    @staticmethod
+    def _next_control(controls):
+        if controls is None:
+            return None
+        u = next(controls, _MISSING)
+        if u is _MISSING:
+            raise ValueError("controls ran out before measurements")
+        return u
+
+    @staticmethod
+    def _check_controls_exhausted(controls):
+        if controls is not None and next(controls, _MISSING) is not _MISSING:
+            raise ValueError("more controls than measurements")
+
+    def _decimated_covariance(self, count, covariance_every):
+        if covariance_every and count % covariance_every == 0:
+            return self.P.copy()
+        return None
+
+
 # Example usage
 if __name__ == "__main__":
     # Define matrices and parameters (example values)
@@ -68,3 +539,19 @@ if __name__ == "__main__":
         print(f"State Estimate: {x}")
         print(f"Estimate Covariance: {P}")
         print()
+
+    # Fast path: the same filter with Cholesky solves and a steady-state gain
+    x_fast, P_fast = kalman_filter_fast(A, B, H, Q, R, x_initial, P_initial, measurements, controls)
+    print(f"Fast path matches: {np.allclose(x_fast, x_estimates.reshape(x_fast.shape))}")
+
+    # Batched: three tracks with the same model, the second misses its third measurement
+    tracks = np.array([[i, i + 10, i - 5] for i in [1, 2, 3, 4, 5]], dtype=float)[..., None]
+    mask = np.ones((5, 3), dtype=bool)
+    mask[2, 1] = False
+    x_batched, P_batched = kalman_filter_batched(A, B, H, Q, R, np.zeros((3, 1)), P_initial, tracks, mask=mask)
+    print(f"Batched final states: {x_batched[-1].ravel()}, variances: {P_batched[:, 0, 0]}")
+
+    # Streaming: the same filter, one measurement at a time, with every second covariance
+    kf = KalmanFilter(A, B, H, Q, R, x_initial, P_initial)
+    for i, (x, P) in enumerate(kf.stream(measurements, controls, covariance_every=2)):
+        print(f"Stream step {i+1}: state {x}, covariance {P}")
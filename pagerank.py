@@ -1,3 +1,9 @@
+import heapq
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 def pagerank(links, d=0.85, tol=1e-6, max_iter=100):
@@ -45,6 +51,525 @@ def pagerank(links, d=0.85, tol=1e-6, max_iter=100):
     
     return pagerank
 
+class SparseGraph:
+    """
+    Link graph stored for sparse PageRank.
+
+    The adjacency is kept as CSR over *incoming* links: the sources linking to
+    page v are in_sources[in_indptr[v]:in_indptr[v + 1]]. Together with the
+    out-degree of every page this is all a power iteration needs, using
+    O(N + E) memory instead of the O(N^2) dense transition matrix.
+    """
+
+    def __init__(self, in_indptr, in_sources, out_degree, weights=None):
+        self.in_indptr = in_indptr
+        self.in_sources = in_sources
+        self.out_degree = out_degree
+        self.weights = weights  # Per-edge weights (None means every link counts once)
+        self.N = len(out_degree)
+        self.dangling = np.flatnonzero(out_degree == 0)
+        # Pages with at least one incoming link, and where their links start
+        self._targets = np.flatnonzero(np.diff(in_indptr))
+        self._starts = in_indptr[self._targets]
+
+    @classmethod
+    def from_edges(cls, sources, targets, N=None, weights=None):
+        """
+        Build the graph from an edge list (COO form).
+
+        Args:
+            sources: Array of link sources.
+            targets: Array of link targets.
+            N: Number of pages (default: largest page index + 1).
+            weights: Optional array of link weights (default: 1 per link).
+
+        Returns:
+            A SparseGraph.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if N is None:
+            N = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        index_dtype = np.int32 if N < 2**31 else np.int64
+
+        # Out-degree (or total out-weight) of every page, computed vectorially
+        if weights is None:
+            out_degree = np.bincount(sources, minlength=N).astype(float)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            out_degree = np.bincount(sources, weights=weights, minlength=N)
+
+        # Group the links by target page (a stable sort keeps the input order within a page)
+        order = np.argsort(targets, kind="stable")
+        in_indptr = np.zeros(N + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=N), out=in_indptr[1:])
+        in_sources = sources[order].astype(index_dtype)
+        return cls(in_indptr, in_sources, out_degree, None if weights is None else weights[order])
+
+    @classmethod
+    def from_csr(cls, indptr, indices, N=None, weights=None):
+        """
+        Build the graph from a CSR adjacency over outgoing links, where page i
+        links to indices[indptr[i]:indptr[i + 1]].
+        """
+        indptr = np.asarray(indptr, dtype=np.int64)
+        sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        return cls.from_edges(sources, indices, N if N is not None else len(indptr) - 1, weights)
+
+    @classmethod
+    def from_sparse_matrix(cls, matrix):
+        """
+        Build the graph from any sparse matrix with a tocoo() method (e.g. SciPy
+        CSR/COO), where entry (i, j) is the weight of the link from page i to page j.
+        """
+        coo = matrix.tocoo()
+        weights = None if np.all(coo.data == 1) else coo.data
+        return cls.from_edges(coo.row, coo.col, coo.shape[0], weights)
+
+    def propagate(self, scaled):
+        """
+        Sum scaled[u] over the incoming links u -> v of every page v.
+        """
+        values = scaled[self.in_sources]
+        if self.weights is not None:
+            values = values * self.weights
+        result = np.zeros(self.N)
+        if len(values):
+            result[self._targets] = np.add.reduceat(values, self._starts)
+        return result
+
+
+def pagerank_sparse(graph, d=0.85, tol=1e-6, max_iter=100):
+    """
+    Computes PageRank on a SparseGraph without forming any N x N matrix.
+
+    Dangling pages (no outgoing links) and teleportation are applied as
+    rank-one corrections: their contribution is the same for every page,
+    so each is a single scalar added to the whole vector.
+
+    Args:
+        graph: A SparseGraph (see SparseGraph.from_edges / from_csr / from_sparse_matrix).
+        d: Damping factor (default 0.85).
+        tol: Convergence tolerance (default 1e-6).
+        max_iter: Maximum number of iterations (default 100).
+
+    Returns:
+        A numpy array containing the PageRank of each page.
+    """
+    N = graph.N
+    pagerank = np.ones(N) / N
+
+    # Pages with no out-links would divide by zero; their rank goes to the dangling term instead
+    inverse_degree = np.zeros(N)
+    has_links = graph.out_degree > 0
+    inverse_degree[has_links] = 1.0 / graph.out_degree[has_links]
+
+    for _ in range(max_iter):
+        dangling_mass = pagerank[graph.dangling].sum()
+        new_pagerank = d * graph.propagate(pagerank * inverse_degree)
+        new_pagerank += (d * dangling_mass + (1 - d) * pagerank.sum()) / N
+
+        # Check for convergence (as in pagerank, the step below tol is not taken)
+        if np.linalg.norm(new_pagerank - pagerank, 1) < tol:
+            break
+
+        pagerank = new_pagerank
+
+    return pagerank
+
+
+class IncrementalPageRank:
+    """
+    PageRank for a link graph that changes a few edges at a time.
+
+    The ranks p are kept together with their residual
+        r = (1 - d) / N - p + d * M p
+    (M is the column-stochastic link matrix, dangling pages spread over every
+    page), which measures how far p is from the fixed point. Inserting or
+    deleting a link u -> v only changes column u of M, so the residual is
+    patched locally at u's out-links instead of being recomputed. update() then
+    either warm-starts the power iteration from p, or runs Gauss-Southwell
+    pushes that move residual only where it exceeds tolerance.
+
+    The links are kept as a sorted array of keys u * N + v (duplicates allowed),
+    so the out-links of any page are one binary search away.
+    """
+
+    def __init__(self, sources, targets, N=None, d=0.85, tol=1e-6, max_iter=100):
+        """
+        Build the graph and compute its PageRank from a uniform start.
+
+        Args:
+            sources: Array of link sources.
+            targets: Array of link targets.
+            N: Number of pages (default: largest page index + 1).
+            d: Damping factor (default 0.85).
+            tol: Convergence tolerance on the L1 residual (default 1e-6).
+            max_iter: Maximum number of power iterations per update (default 100).
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if N is None:
+            N = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        self.N = N
+        self.d = d
+        self.tol = tol
+        self.max_iter = max_iter
+
+        self._check_pages(sources, targets)
+        self.keys = np.sort(sources * N + targets)
+        self.out_degree = np.bincount(sources, minlength=N).astype(float)
+        self._edges = None  # (sources, targets) cache for the power iteration
+
+        self.pagerank = np.ones(N) / N
+        self.residual = np.zeros(N)
+        self.uniform_residual = 0.0  # Residual shared by every page (from dangling pages)
+        self.pending = 0
+
+        # The cold start is the baseline that warm-started updates are compared against
+        self.cold_iterations = self._power_iterations()
+
+    def _check_pages(self, sources, targets):
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+        for pages in (sources, targets):
+            if len(pages) and (pages.min() < 0 or pages.max() >= self.N):
+                raise ValueError(f"Page ids must be in [0, {self.N})")
+
+    def _out_links(self, pages):
+        """
+        Targets of the out-links of every given page, and how many each page has.
+        """
+        lo = np.searchsorted(self.keys, pages * self.N, side="left")
+        hi = np.searchsorted(self.keys, (pages + 1) * self.N, side="left")
+        counts = hi - lo
+        # Concatenate the ranges keys[lo:hi] without a Python loop
+        index = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - lo, counts)
+        return self.keys[index] % self.N, counts
+
+    def _add_contributions(self, pages, sign):
+        """
+        Add (sign = 1) or remove (sign = -1) the term d * p[u] * M[:, u] of each
+        page u to the residual, using the current out-links of u.
+        """
+        targets, counts = self._out_links(pages)
+        shares = sign * self.d * self.pagerank[pages]
+        np.add.at(self.residual, targets, np.repeat(shares / np.maximum(counts, 1), counts))
+        self.uniform_residual += shares[counts == 0].sum() / self.N
+
+    def _edit(self, sources, targets, sign):
+        sources = np.asarray(sources, dtype=np.int64).ravel()
+        targets = np.asarray(targets, dtype=np.int64).ravel()
+        self._check_pages(sources, targets)
+        new_keys = np.sort(sources * self.N + targets)
+
+        if sign < 0:
+            # Match every deleted link to its own copy, so duplicates remove several copies
+            first = np.searchsorted(new_keys, new_keys, side="left")
+            positions = np.searchsorted(self.keys, new_keys, side="left") + np.arange(len(new_keys)) - first
+            found = positions < len(self.keys)
+            found[found] = self.keys[positions[found]] == new_keys[found]
+            if not found.all():
+                missing = new_keys[~found][0]
+                raise ValueError(f"No link {missing // self.N} -> {missing % self.N} to delete")
+
+        # Swap the old column of M for the new one in the residual
+        pages = np.unique(sources)
+        self._add_contributions(pages, -1)
+        if sign > 0:
+            self.keys = np.insert(self.keys, np.searchsorted(self.keys, new_keys), new_keys)
+        else:
+            self.keys = np.delete(self.keys, positions)
+        np.add.at(self.out_degree, sources, sign)
+        self._add_contributions(pages, 1)
+
+        self._edges = None
+        self.pending += len(new_keys)
+
+    def insert_edges(self, sources, targets):
+        """
+        Add links sources[i] -> targets[i]. Ranks are not refreshed until update().
+        """
+        self._edit(sources, targets, 1)
+
+    def delete_edges(self, sources, targets):
+        """
+        Remove links sources[i] -> targets[i] (one copy per entry). Raises
+        ValueError if a link is not in the graph.
+        """
+        self._edit(sources, targets, -1)
+
+    def _power_iterations(self):
+        """
+        Power iteration warm-started from the current ranks. Returns the number
+        of iterations. On exit the residual is exact: it is the step the next
+        iteration would take from the current ranks, including when max_iter
+        runs out before tol is reached.
+        """
+        if self._edges is None:
+            self._edges = (self.keys // self.N, self.keys % self.N)
+        sources, targets = self._edges
+        N, d = self.N, self.d
+
+        inverse_degree = np.zeros(N)
+        has_links = self.out_degree > 0
+        inverse_degree[has_links] = 1.0 / self.out_degree[has_links]
+
+        # The fixed point sums to 1; a mass error would only decay at rate d, so remove it up front
+        self.pagerank /= self.pagerank.sum()
+
+        def step():
+            scaled = self.pagerank * inverse_degree
+            new_pagerank = d * np.bincount(targets, weights=scaled[sources], minlength=N)
+            new_pagerank += (d * self.pagerank[~has_links].sum() + 1 - d) / N
+            return new_pagerank - self.pagerank
+
+        for iteration in range(1, self.max_iter + 1):
+            self.residual = step()
+            if np.abs(self.residual).sum() < self.tol:
+                break
+            self.pagerank += self.residual
+        else:
+            # Out of iterations: the last step was applied, so measure it again from the final ranks
+            self.residual = step()
+        self.uniform_residual = 0.0
+        return iteration
+
+    def _push(self, max_pushes):
+        """
+        Gauss-Southwell: repeatedly move the largest residual into the ranks of
+        its page and spread d times it over the page's out-links. Stops when
+        every residual is below tol / N, or after max_pushes pushes.
+        """
+        N, d = self.N, self.d
+        threshold = self.tol / N
+        pushes = 0
+        while True:
+            # Pages whose residual is above the threshold, largest first (lazy max-heap)
+            self.residual += self.uniform_residual
+            self.uniform_residual = 0.0
+            active = np.flatnonzero(np.abs(self.residual) > threshold)
+            heap = list(zip((-np.abs(self.residual[active])).tolist(), active.tolist()))
+            heapq.heapify(heap)
+            if not heap:
+                return pushes, True
+
+            while heap:
+                priority, u = heapq.heappop(heap)
+                mass = self.residual[u]
+                if -priority != abs(mass):  # Stale entry
+                    continue
+                if pushes == max_pushes:
+                    return pushes, False
+                pushes += 1
+
+                self.residual[u] = 0.0
+                self.pagerank[u] += mass
+                targets, _ = self._out_links(np.array([u]))
+                if len(targets) == 0:
+                    self.uniform_residual += d * mass / N
+                    continue
+                np.add.at(self.residual, targets, d * mass / len(targets))
+                for w in np.unique(targets).tolist():
+                    value = abs(self.residual[w])
+                    if value > threshold:
+                        heapq.heappush(heap, (-value, w))
+
+            if abs(self.uniform_residual) <= threshold:
+                return pushes, True
+
+    def update(self, method="push", max_pushes=None):
+        """
+        Refresh the ranks after insert_edges / delete_edges calls.
+
+        Args:
+            method: "push" for local Gauss-Southwell updates, which fall back to
+                warm-started power iteration once max_pushes is reached, or "power"
+                for warm-started power iteration only.
+            max_pushes: Push budget for method="push" (default: E // 1000 + 1000,
+                about the cost of a few vectorised power iterations).
+
+        Returns:
+            A dict with the edits applied, the iterations and pushes performed, and
+            how many were saved against the cold start. One power iteration
+            updates every page, so it is counted as N pushes.
+        """
+        if method not in ("push", "power"):
+            raise ValueError("method must be 'push' or 'power'")
+        if max_pushes is None:
+            max_pushes = len(self.keys) // 1000 + 1000
+
+        pushes, converged = 0, False
+        if method == "push":
+            pushes, converged = self._push(max_pushes)
+        iterations = 0 if converged else self._power_iterations()
+
+        stats = {
+            "edits": self.pending,
+            "iterations": iterations,
+            "pushes": pushes,
+            "iterations_saved": self.cold_iterations - iterations,
+            "pushes_saved": (self.cold_iterations - iterations) * self.N - pushes,
+        }
+        self.pending = 0
+        return stats
+
+
+# Out-of-core PageRank: the graph lives on disk as memory-mapped .npy files
+#   offsets.npy     int64 (N + 1)  incoming links of page v are sources[offsets[v]:offsets[v + 1]]
+#   sources.npy     int32 (E)      source page of every link, grouped by target page
+#   out_degree.npy  int64 (N)      number of outgoing links of every page
+def _read_edge_chunks(edge_path, chunk_bytes):
+    """
+    Yield (sources, targets) arrays from a text edge list with one "source target"
+    pair per line; lines starting with '#' are comments.
+
+    Raises:
+        ValueError: If a line does not hold exactly two non-negative integer page ids.
+    """
+    with open(edge_path) as f:
+        while True:
+            lines = f.readlines(chunk_bytes)
+            if not lines:
+                break
+            lines = [line for line in lines if line.strip() and not line.startswith("#")]
+            if not lines:
+                continue
+            try:
+                pairs = np.loadtxt(lines, dtype=np.int64, comments="#", ndmin=2)
+            except ValueError as error:
+                raise ValueError(f"Malformed edge list {edge_path}: {error}") from None
+            if pairs.shape[1] != 2:
+                raise ValueError(f"Malformed edge list {edge_path}: expected 2 columns "
+                                 f"(source target), found {pairs.shape[1]}")
+            if pairs.min() < 0:
+                raise ValueError(f"Malformed edge list {edge_path}: negative page id")
+            yield pairs[:, 0], pairs[:, 1]
+
+
+def convert_edge_list(edge_path, graph_dir, chunk_bytes=64 << 20):
+    """
+    Convert a text edge list into the on-disk CSR layout used by pagerank_mmap.
+    The edge list is read in chunks, so it never has to fit in memory.
+
+    Args:
+        edge_path: Text file with one "source target" pair per line ('#' starts a comment).
+        graph_dir: Directory to write offsets.npy, sources.npy and out_degree.npy into.
+        chunk_bytes: Approximate amount of text to parse at a time.
+
+    Returns:
+        (N, E): number of pages and links.
+
+    Raises:
+        ValueError: If a line does not hold exactly two non-negative integer page ids.
+    """
+    os.makedirs(graph_dir, exist_ok=True)
+
+    # Pass 1: count links per target and per source, growing the counts as pages appear
+    in_degree = np.zeros(0, dtype=np.int64)
+    out_degree = np.zeros(0, dtype=np.int64)
+    for sources, targets in _read_edge_chunks(edge_path, chunk_bytes):
+        N = max(len(in_degree), int(sources.max(initial=-1)) + 1, int(targets.max(initial=-1)) + 1)
+        in_degree = np.pad(in_degree, (0, N - len(in_degree))) + np.bincount(targets, minlength=N)
+        out_degree = np.pad(out_degree, (0, N - len(out_degree))) + np.bincount(sources, minlength=N)
+    N = len(in_degree)
+    if N >= 2**31:
+        raise ValueError("Page ids must fit in int32")
+
+    offsets = np.zeros(N + 1, dtype=np.int64)
+    np.cumsum(in_degree, out=offsets[1:])
+    E = int(offsets[-1])
+    np.save(os.path.join(graph_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(graph_dir, "out_degree.npy"), out_degree)
+
+    # Pass 2: place every link in its target's slot, chunk by chunk
+    sources_out = np.lib.format.open_memmap(os.path.join(graph_dir, "sources.npy"), mode="w+",
+                                            dtype=np.int32, shape=(E,))
+    cursor = offsets[:-1].copy()
+    for sources, targets in _read_edge_chunks(edge_path, chunk_bytes):
+        order = np.argsort(targets, kind="stable")
+        targets = targets[order]
+        # Rank of each link among the links to the same target in this chunk
+        group_start = np.searchsorted(targets, targets, side="left")
+        positions = cursor[targets] + np.arange(len(targets)) - group_start
+        sources_out[positions] = sources[order]
+        cursor += np.bincount(targets, minlength=N)
+    sources_out.flush()
+    del sources_out
+    return N, E
+
+
+def pagerank_mmap(graph_dir, d=0.85, tol=1e-6, max_iter=100, workers=None, block_edges=1 << 22, verbose=True):
+    """
+    Computes PageRank over a graph written by convert_edge_list, streaming the
+    memory-mapped links in blocks. Each block covers a range of target pages,
+    so blocks write disjoint parts of the new rank vector and run in a thread pool.
+    Only the rank vectors (O(N)) are held in memory; links are paged in from disk.
+
+    Args:
+        graph_dir: Directory written by convert_edge_list.
+        d: Damping factor (default 0.85).
+        tol: Convergence tolerance (default 1e-6).
+        max_iter: Maximum number of iterations (default 100).
+        workers: Number of threads (default: os.cpu_count()).
+        block_edges: Approximate number of links per block.
+        verbose: Print the throughput of every iteration.
+
+    Returns:
+        A numpy array containing the PageRank of each page, and a list with the
+        (L1 change, edges per second) of every iteration.
+    """
+    offsets = np.load(os.path.join(graph_dir, "offsets.npy"), mmap_mode="r")
+    sources = np.load(os.path.join(graph_dir, "sources.npy"), mmap_mode="r")
+    out_degree = np.load(os.path.join(graph_dir, "out_degree.npy"))
+    N = len(out_degree)
+    E = len(sources)
+
+    # Split the target pages into blocks of about block_edges links each
+    cuts = np.searchsorted(offsets, np.arange(0, E, max(block_edges, 1)), side="right") - 1
+    bounds = np.unique(np.concatenate([cuts, [N]]))
+    blocks = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    inverse_degree = np.zeros(N)
+    has_links = out_degree > 0
+    inverse_degree[has_links] = 1.0 / out_degree[has_links]
+    dangling = np.flatnonzero(~has_links)
+
+    pagerank = np.ones(N) / N
+    history = []
+
+    def propagate_block(block, scaled, result):
+        first, last = block
+        block_offsets = np.asarray(offsets[first:last + 1])
+        values = scaled[np.asarray(sources[block_offsets[0]:block_offsets[-1]])]
+        nonempty = np.flatnonzero(np.diff(block_offsets))
+        if len(nonempty):
+            result[first + nonempty] = np.add.reduceat(values, block_offsets[nonempty] - block_offsets[0])
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for iteration in range(max_iter):
+            start = time.perf_counter()
+            scaled = pagerank * inverse_degree
+            new_pagerank = np.zeros(N)
+            list(pool.map(lambda block: propagate_block(block, scaled, new_pagerank), blocks))
+
+            # Dangling pages and teleportation as rank-one corrections
+            new_pagerank *= d
+            new_pagerank += (d * pagerank[dangling].sum() + (1 - d) * pagerank.sum()) / N
+
+            delta = np.linalg.norm(new_pagerank - pagerank, 1)
+            edges_per_second = E / (time.perf_counter() - start)
+            history.append((delta, edges_per_second))
+            if verbose:
+                print(f"Iteration {iteration + 1}: change {delta:.3e}, {edges_per_second / 1e6:.1f}M edges/s")
+
+            if delta < tol:
+                break
+            pagerank = new_pagerank
+
+    return pagerank, history
+
+
 # Example usage
 if __name__ == "__main__":
     # Example adjacency matrix where a link from page i to page j is represented by a 1 at (i, j)
@@ -60,3 +585,24 @@ if __name__ == "__main__":
     print("PageRank values:")
     for i, rank in enumerate(ranks):
         print(f"Page {i+1}: {rank:.6f}")
+
+    # The same graph as an edge list, run through the sparse engine
+    sources, targets = np.nonzero(links)
+    graph = SparseGraph.from_edges(sources, targets, N=links.shape[0])
+    print("Sparse PageRank values:", np.round(pagerank_sparse(graph), 6))
+
+    # Out-of-core: convert an edge-list file once, then iterate over the memory-mapped CSR
+    with tempfile.TemporaryDirectory() as directory:
+        edge_path = os.path.join(directory, "edges.txt")
+        with open(edge_path, "w") as f:
+            f.write("# source target\n")
+            f.writelines(f"{s} {t}\n" for s, t in zip(sources, targets))
+        convert_edge_list(edge_path, os.path.join(directory, "graph"))
+        mmap_ranks, _ = pagerank_mmap(os.path.join(directory, "graph"), verbose=False)
+        print("Memory-mapped PageRank values:", np.round(mmap_ranks, 6))
+
+    # Incremental: add a link from the sink page and refresh from the previous ranks
+    incremental = IncrementalPageRank(sources, targets, N=links.shape[0])
+    incremental.insert_edges([3], [0])
+    stats = incremental.update()
+    print("Incremental PageRank values:", np.round(incremental.pagerank, 6), stats)
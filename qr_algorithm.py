@@ -1,19 +1,29 @@
+import math
+
 import numpy as np
 
 #QR algorithm to compute the eigenvalues of a given square matrix
 
-def qr_algorithm(matrix, max_iterations=1000, tolerance=1e-10):
+def qr_algorithm(matrix, max_iterations=1000, tolerance=1e-10, method="unshifted"):
     """
     Perform the QR algorithm to compute the eigenvalues of a square matrix.
 
     Parameters:
     - matrix (numpy.ndarray): The input square matrix for which eigenvalues are computed.
-    - max_iterations (int): The maximum number of iterations allowed.
+    - max_iterations (int): The maximum number of iterations allowed
+      (per eigenvalue for the "shifted" method).
     - tolerance (float): The convergence tolerance for determining eigenvalues.
+    - method (str): "unshifted" runs plain QR iterations on the full matrix.
+      "shifted" reduces to Hessenberg/tridiagonal form once and runs
+      Wilkinson-shifted QR with deflation (see shifted_qr_eigenvalues).
 
     Returns:
     - numpy.ndarray: An array containing the eigenvalues of the matrix.
     """
+    if method == "shifted":
+        return shifted_qr_eigenvalues(matrix, max_iterations, tolerance)
+    if method != "unshifted":
+        raise ValueError(f"Unknown method: {method}")
 
     # Step 1: Make a copy of the matrix to avoid modifying the original
     A = np.copy(matrix)
@@ -39,7 +49,645 @@ def qr_algorithm(matrix, max_iterations=1000, tolerance=1e-10):
     
     return eigenvalues
 
+
+def hessenberg_reduction(matrix, block_size=32):
+    """
+    Reduce a square matrix to upper Hessenberg form with Householder reflections.
+    The result is similar to the input (same eigenvalues), and is tridiagonal
+    when the input is symmetric.
+
+    Real matrices are reduced in panels of block_size columns: the reflectors of
+    a panel are collected as I - V T V^T and applied to the rest of the matrix
+    with two matrix products, so most of the work runs as BLAS-3 instead of one
+    rank-1 update of the whole trailing matrix per column.
+
+    Parameters:
+    - matrix (numpy.ndarray): The input square matrix.
+    - block_size (int): Number of columns reduced per panel (real input only).
+
+    Returns:
+    - numpy.ndarray: The Hessenberg matrix H (zeros below the first subdiagonal).
+    """
+    H = np.array(matrix, dtype=np.result_type(matrix, float))
+    n = H.shape[0]
+    if np.isrealobj(H):
+        for k in range(0, n - 2, block_size):
+            _reduce_panel(H, k, min(block_size, n - 2 - k))
+        return H
+
+    for k in range(n - 2):
+        # Step 1: Householder vector that zeroes H[k+2:, k]
+        x = H[k + 1:, k]
+        norm_x = np.linalg.norm(x)
+        if norm_x == 0:
+            continue
+        phase = x[0] / abs(x[0]) if x[0] != 0 else 1.0
+        v = x.copy()
+        v[0] += phase * norm_x
+        v /= np.linalg.norm(v)
+
+        # Step 2: Apply the reflection from the left and right (a similarity transform)
+        H[k + 1:, k:] -= 2.0 * np.outer(v, v.conj() @ H[k + 1:, k:])
+        H[:, k + 1:] -= 2.0 * np.outer(H[:, k + 1:] @ v, v.conj())
+        H[k + 2:, k] = 0
+
+    return H
+
+
+def _reduce_panel(H, k, nb):
+    """
+    Reduce columns k..k+nb-1 of the real matrix H in place and apply the panel's
+    reflectors Q = I - V T V^T to the trailing columns as H <- Q^T H Q.
+    Y = H V T is built alongside (with H as it was before the panel), so each
+    panel column can be brought up to date without touching the trailing matrix.
+    """
+    n = H.shape[0]
+    V, T, Y = np.zeros((n, nb)), np.zeros((nb, nb)), np.zeros((n, nb))
+    for j in range(nb):
+        c = k + j
+        # Step 1: Column c after the panel's first j reflectors, from the right then from the left
+        b = H[:, c] - Y[:, :j] @ V[c, :j]
+        lower = V[k + 1:, :j]
+        b[k + 1:] -= lower @ (T[:j, :j].T @ (lower.T @ b[k + 1:]))
+        H[:c + 1, c] = b[:c + 1]
+        H[c + 2:, c] = 0.0
+
+        # Step 2: Reflector I - tau v v^T (v[0] = 1) that maps b[c+1:] onto beta e1
+        x = b[c + 1:]
+        alpha, tail = x[0], np.linalg.norm(x[1:])
+        if tail == 0:
+            H[c + 1, c] = alpha
+            continue
+        beta = -math.copysign(math.hypot(alpha, tail), alpha)
+        tau = (beta - alpha) / beta
+        v = V[c + 1:, j]
+        np.divide(x, alpha - beta, out=v)
+        v[0] = 1.0
+        H[c + 1, c] = beta
+
+        # Step 3: Extend T and Y = H V T by one column
+        projection = V[c + 1:, :j].T @ v
+        T[:j, j] = -tau * (T[:j, :j] @ projection)
+        T[j, j] = tau
+        Y[:, j] = tau * (H[:, c + 1:] @ v - Y[:, :j] @ projection)
+
+    # Step 4: Apply the whole panel to the trailing columns, H Q = H - Y V^T and then Q^T from the left
+    trailing = slice(k + nb, n)
+    H[:, trailing] -= Y @ V[trailing].T
+    lower = V[k + 1:]
+    H[k + 1:, trailing] -= lower @ (T.T @ (lower.T @ H[k + 1:, trailing]))
+
+
+def _tridiagonal_eigenvalues(d, e, max_iterations, tolerance):
+    """
+    Eigenvalues of a symmetric tridiagonal matrix (diagonal d, subdiagonal e)
+    by implicit Wilkinson-shifted QR. Each step chases a bulge down the
+    unreduced block with Givens rotations, costing O(n) work. The chase is
+    sequential, so it runs on Python floats with the math module rather than
+    on NumPy scalars, which are several times slower one at a time.
+    """
+    d = list(map(float, d))
+    e = list(map(float, e))
+    hypot, sqrt = math.hypot, math.sqrt
+    m = len(d) - 1
+    iterations = 0
+
+    while m > 0:
+        # Step 1: Deflate converged eigenvalues from the bottom of the active window
+        if abs(e[m - 1]) <= tolerance * (abs(d[m - 1]) + abs(d[m])) or iterations >= max_iterations:
+            e[m - 1] = 0.0
+            m -= 1
+            iterations = 0
+            continue
+
+        # Step 2: Find the start l of the unreduced block ending at m
+        l = m - 1
+        while l > 0 and abs(e[l - 1]) > tolerance * (abs(d[l - 1]) + abs(d[l])):
+            l -= 1
+
+        # Step 3: Wilkinson shift, the eigenvalue of the trailing 2x2 closer to d[m]
+        delta = (d[m - 1] - d[m]) / 2.0
+        sign = 1.0 if delta >= 0 else -1.0
+        mu = d[m] - e[m - 1] ** 2 / (delta + sign * hypot(delta, e[m - 1]))
+
+        # Step 4: Implicit QR step, chasing the bulge from l to m
+        x = d[l] - mu
+        z = e[l]
+        for k in range(l, m):
+            r = hypot(x, z)
+            c, s = (x / r, z / r) if r != 0 else (1.0, 0.0)
+            if k > l:
+                e[k - 1] = r
+            dk, dk1, ek = d[k], d[k + 1], e[k]
+            cs2 = 2 * c * s * ek
+            d[k] = c * c * dk + cs2 + s * s * dk1
+            d[k + 1] = s * s * dk - cs2 + c * c * dk1
+            e[k] = c * s * (dk1 - dk) + (c * c - s * s) * ek
+            if k < m - 1:
+                z = s * e[k + 1]  # The bulge
+                e[k + 1] *= c
+                x = e[k]
+        iterations += 1
+
+    return np.array(d)
+
+
+def _eigenvalues_2x2(a, b, c, d):
+    """
+    Eigenvalues of the real 2x2 block [[a, b], [c, d]], as a complex pair when they are not real.
+    """
+    half_trace = (a + d) / 2
+    discriminant = ((a - d) / 2) ** 2 + b * c
+    if discriminant >= 0:
+        root = math.sqrt(discriminant)
+        # Avoid cancellation: compute the larger root directly and the other from the determinant
+        big = half_trace + math.copysign(root, half_trace) if half_trace else root
+        small = (a * d - b * c) / big if big else half_trace - root
+        return complex(big), complex(small)
+    root = math.sqrt(-discriminant)
+    return complex(half_trace, root), complex(half_trace, -root)
+
+
+def _householder_3(x, y, z, v):
+    """
+    Write into v the Householder vector of P = I - v v^T that maps (x, y, z)
+    onto a multiple of e1, with v scaled so that no beta factor is needed.
+    Returns False when (x, y, z) is already zero below its first entry.
+    """
+    norm = math.sqrt(x * x + y * y + z * z)
+    if norm == 0 or (y == 0 and z == 0):
+        return False
+    alpha = -math.copysign(norm, x)
+    v0 = x - alpha
+    scale = math.sqrt(2.0 / (v0 * v0 + y * y + z * z))
+    v[0], v[1], v[2] = v0 * scale, y * scale, z * scale
+    return True
+
+
+def _double_shift_qr(H, max_iterations, tolerance, Z=None):
+    """
+    Eigenvalues of a real upper Hessenberg matrix by the Francis implicit
+    double-shift QR algorithm, working in place on H. Each step uses the two
+    eigenvalues of the trailing 2x2 block as a conjugate pair of shifts, so it
+    stays in real arithmetic, and chases a 3x3 bulge down the active window with
+    Householder reflectors. Each reflector is applied in place to three row and
+    three column views through preallocated buffers, and 1x1 and 2x2 blocks
+    deflate from the bottom.
+
+    By default only the unreduced window H[l:m+1, l:m+1] is touched. When Z is
+    given, H is carried all the way to real Schur form (quasi-triangular) and
+    the reflectors are accumulated into Z, so that Z^T H_in Z = H_out.
+    """
+    n = H.shape[0]
+    eigenvalues = np.empty(n, dtype=complex)
+    v = np.empty(3)
+    row_buffer, row_update = np.empty(n), np.empty((3, n))
+    column_buffer, column_update = np.empty(n), np.empty((n, 3))
+    m = n - 1
+    iterations = 0
+
+    while m >= 0:
+        # Step 1: Find the start l of the unreduced block ending at m
+        l = m
+        while l > 0 and abs(H[l, l - 1]) > tolerance * (abs(H[l - 1, l - 1]) + abs(H[l, l])):
+            l -= 1
+        if l > 0:
+            H[l, l - 1] = 0.0
+
+        # Step 2: Deflate a 1x1 or 2x2 block, or give up on this eigenvalue after max_iterations
+        if l == m or iterations >= max_iterations:
+            eigenvalues[m] = H[m, m]
+            m -= 1
+            iterations = 0
+            continue
+        if l == m - 1:
+            eigenvalues[m - 1], eigenvalues[m] = _eigenvalues_2x2(H[m - 1, m - 1], H[m - 1, m], H[m, m - 1], H[m, m])
+            m -= 2
+            iterations = 0
+            continue
+
+        # Step 3: Double shift from the trailing 2x2 block, via its trace s and determinant t;
+        # exceptional shifts every 10 iterations break rare cycles
+        iterations += 1
+        if iterations % 10 == 0:
+            w = abs(H[m, m - 1]) + abs(H[m - 1, m - 2])
+            s, t = 2 * (0.75 * w + H[m, m]), (0.75 * w + H[m, m]) ** 2 - 0.4375 * w * w
+        else:
+            s = H[m - 1, m - 1] + H[m, m]
+            t = H[m - 1, m - 1] * H[m, m] - H[m - 1, m] * H[m, m - 1]
+
+        # Step 4: First column of (H - mu1 I)(H - mu2 I), which starts the bulge
+        h00, h01, h10, h11, h21 = H[l, l], H[l, l + 1], H[l + 1, l], H[l + 1, l + 1], H[l + 2, l + 1]
+        x = h00 * h00 + h01 * h10 - s * h00 + t
+        y = h10 * (h00 + h11 - s)
+        z = h10 * h21
+
+        # Step 5: Chase the bulge down the window with reflectors on rows/columns k..k+2
+        right, top = (n, 0) if Z is not None else (m + 1, l)
+        for k in range(l, m - 1):
+            if _householder_3(x, y, z, v):
+                # Rows k..k+2, from column max(l, k - 1) to the right edge: B -= v (v^T B)
+                block = H[k:k + 3, max(l, k - 1):right]
+                w = row_buffer[:block.shape[1]]
+                np.dot(v, block, out=w)
+                block -= np.multiply.outer(v, w, out=row_update[:, :len(w)])
+
+                # Columns k..k+2, from the top row to min(k + 3, m), and of Z: B -= (B v) v^T
+                blocks = (H[top:min(k + 3, m) + 1, k:k + 3],) if Z is None else (H[:min(k + 3, m) + 1, k:k + 3], Z[:, k:k + 3])
+                for block in blocks:
+                    w = column_buffer[:block.shape[0]]
+                    np.dot(block, v, out=w)
+                    block -= np.multiply.outer(w, v, out=column_update[:len(w)])
+
+                if k > l:
+                    H[k + 1, k - 1] = H[k + 2, k - 1] = 0.0
+
+            x, y = H[k + 1, k], H[k + 2, k]
+            z = H[k + 3, k] if k < m - 2 else 0.0
+
+        # Step 6: A last 2x2 reflector on rows/columns m-1, m removes what is left of the bulge
+        if y != 0:
+            alpha = -math.copysign(math.hypot(x, y), x)
+            scale = math.sqrt(2.0 / ((x - alpha) ** 2 + y * y))
+            u = v[:2]
+            u[0], u[1] = (x - alpha) * scale, y * scale
+            block = H[m - 1:m + 1, m - 2:right]
+            w = row_buffer[:block.shape[1]]
+            np.dot(u, block, out=w)
+            block -= np.multiply.outer(u, w, out=row_update[:2, :len(w)])
+            blocks = (H[top:m + 1, m - 1:m + 1],) if Z is None else (H[:m + 1, m - 1:m + 1], Z[:, m - 1:m + 1])
+            for block in blocks:
+                w = column_buffer[:block.shape[0]]
+                np.dot(block, u, out=w)
+                block -= np.multiply.outer(w, u, out=column_update[:len(w), :2])
+            H[m, m - 2] = 0.0
+
+    return eigenvalues
+
+
+def _shift_pairs(shifts):
+    """
+    Group shifts into (trace, determinant) pairs, the form a double-shift bulge
+    needs: conjugate pairs stay together and real shifts are paired up (an odd
+    one out is used twice).
+    """
+    pairs = [(2 * z.real, z.real ** 2 + z.imag ** 2) for z in shifts if z.imag > 0]
+    reals = sorted(z.real for z in shifts if z.imag == 0)
+    if len(reals) % 2:
+        reals.append(reals[-1])
+    pairs.extend((a + b, a * b) for a, b in zip(reals[::2], reals[1::2]))
+    return pairs
+
+
+def _multishift_sweep(H, l, m, pairs, chunk):
+    """
+    One multishift QR sweep over the window H[l:m+1, l:m+1]: one bulge per shift
+    pair, introduced four rows apart and chased down the window in lockstep.
+    Bulges four rows apart act on disjoint rows and columns, so the reflectors of
+    one lockstep step are applied together as a handful of array operations.
+
+    The chase runs in chunks of `chunk` steps on a small copy of the diagonal
+    block the chain passes through; the chunk's reflectors are accumulated in an
+    orthogonal U and applied to the rest of the window with two matrix products.
+    """
+    nb = len(pairs)
+    steps = (m - 1 - l) + 4 * (nb - 1) + 1  # Bulge j sits at row k = l + step - 4j
+    for first in range(0, steps, chunk):
+        last = min(steps, first + chunk)
+        # Step 1: Copy out the diagonal block touched by this chunk, padded so a bulge
+        # leaving at k = m - 1 can still address rows k..k+2
+        a = max(l, l + first - 4 * (nb - 1) - 1)
+        b = min(m, l + last + 2)
+        size = b - a + 1
+        W = np.zeros((size + 3, size + 3))
+        W[:size, :size] = H[a:b + 1, a:b + 1]
+        UT = np.eye(size + 3)  # U^T, so that accumulating U is a row update too
+        columns = np.empty((4 * nb, size + 3))
+
+        for step in range(first, last):
+            # Step 2: Bulges j in [j_low, j_high] are inside the window; their rows k..k+2
+            # are the first three of each group of four from `low`
+            j_low = max(0, -((m - 1 - l - step) // 4))
+            j_high = min(nb - 1, step // 4)
+            count = j_high - j_low + 1
+            low = l + step - 4 * j_high - a
+            high = low + 4 * count
+            previous = np.arange(low - 1, high - 1, 4)
+
+            # Step 3: Column k-1, rows k..k+2 of each bulge; a new bulge starts at the
+            # first column of (H - mu1 I)(H - mu2 I) instead
+            X = W[low:high].reshape(count, 4, -1)[:, :3][np.arange(count), :, previous]
+            if low + a == l:
+                s, t = pairs[j_high]
+                h00, h01, h10, h11, h21 = W[0, 0], W[0, 1], W[1, 0], W[1, 1], W[2, 1]
+                X[0] = h00 * h00 + h01 * h10 - s * h00 + t, h10 * (h00 + h11 - s), h10 * h21
+                previous = previous[1:]
+
+            # Step 4: Householder vectors, scaled so that P = I - v v^T (zero where nothing to do)
+            squares = X * X
+            tail = squares[:, 1] + squares[:, 2]
+            x = X[:, 0]
+            x += np.copysign(np.sqrt(squares[:, 0] + tail), x)
+            X *= np.sqrt(2.0 / np.where(tail > 0, x * x + tail, np.inf))[:, None]
+            v = X[:, :, None]
+
+            # Step 5: Apply every reflector to its rows and columns of W, and to U
+            rows = W[low:high].reshape(count, 4, -1)[:, :3]
+            rows -= v * np.matmul(X[:, None, :], rows)
+            block = columns[:high - low]
+            np.copyto(block, W[:, low:high].T)
+            rows = block.reshape(count, 4, -1)[:, :3]
+            rows -= v * np.matmul(X[:, None, :], rows)
+            W[:, low:high] = block.T
+            rows = UT[low:high].reshape(count, 4, -1)[:, :3]
+            rows -= v * np.matmul(X[:, None, :], rows)
+            W[np.concatenate((previous + 2, previous + 3)), np.concatenate((previous, previous))] = 0.0
+
+        # Step 6: Write the block back and apply U to the rest of the window
+        H[a:b + 1, a:b + 1] = W[:size, :size]
+        U = UT[:size, :size].T
+        if b < m:
+            H[a:b + 1, b + 1:m + 1] = U.T @ H[a:b + 1, b + 1:m + 1]
+        if a > l:
+            H[l:a, a:b + 1] = H[l:a, a:b + 1] @ U
+
+
+def _restore_hessenberg(H, l, first, m):
+    """
+    Householder-reduce columns first..m-2 of the window H[l:m+1, l:m+1] back to
+    Hessenberg form after early deflation has filled column `first` with a spike.
+    """
+    for c in range(first, m - 1):
+        x = H[c + 1:m + 1, c]
+        if not x[1:].any():
+            continue
+        norm = np.linalg.norm(x)
+        v = x.copy()
+        v[0] += math.copysign(norm, v[0])
+        v *= math.sqrt(2.0) / np.linalg.norm(v)
+        block = H[c + 1:m + 1, c:m + 1]
+        block -= np.outer(v, v @ block)
+        block = H[l:m + 1, c + 1:m + 1]
+        block -= np.outer(block @ v, v)
+        H[c + 2:m + 1, c] = 0.0
+
+
+def _hessenberg_eigenvalues(H, max_iterations, tolerance, small_window=75, max_shifts=32):
+    """
+    Eigenvalues of a real upper Hessenberg matrix. Windows smaller than
+    small_window go to the double-shift QR above. Larger ones alternate
+    aggressive early deflation with multishift sweeps (the approach of LAPACK's
+    xHSEQR, without its reordering of the deflation window):
+    - the trailing window of about 1.5 * max_shifts rows is brought to Schur
+      form, T = Z^T W Z; the spike H[top, top-1] * Z[0] tells which of its
+      eigenvalues have converged, and the bottom run of those deflates at once;
+    - the remaining Schur eigenvalues are the shifts of the next sweep, which
+      chases up to max_shifts / 2 bulges together (_multishift_sweep).
+    """
+    H = np.array(H, dtype=float)
+    n = H.shape[0]
+    eigenvalues = np.empty(n, dtype=complex)
+    m = n - 1
+    iterations = 0
+
+    while m >= 0:
+        # Step 1: Find the start l of the unreduced block ending at m
+        l = m
+        while l > 0 and abs(H[l, l - 1]) > tolerance * (abs(H[l - 1, l - 1]) + abs(H[l, l])):
+            l -= 1
+        if l > 0:
+            H[l, l - 1] = 0.0
+
+        # Step 2: Small blocks go to the double-shift QR, which deflates them completely
+        if m - l + 1 < small_window or iterations >= max_iterations:
+            eigenvalues[l:m + 1] = _double_shift_qr(H[l:m + 1, l:m + 1].copy(), max_iterations, tolerance)
+            m = l - 1
+            iterations = 0
+            continue
+
+        # Step 3: Schur form of the trailing deflation window, and its spike
+        shifts = min(max_shifts, 2 * ((m - l + 1) // 16))
+        top = m - min(m - l, shifts + shifts // 2) + 1
+        T = H[top:m + 1, top:m + 1].copy()
+        Z = np.eye(m - top + 1)
+        window = _double_shift_qr(T, max_iterations, tolerance, Z)
+        spike = H[top, top - 1] * Z[0]
+
+        # Step 4: Deflate the bottom 1x1 and 2x2 blocks whose spike entries are negligible
+        keep = len(window)
+        while keep > 0:
+            size = 2 if keep > 1 and T[keep - 1, keep - 2] != 0 else 1
+            if np.abs(spike[keep - size:keep]).max() > tolerance * abs(window[keep - 1]):
+                break
+            keep -= size
+        if keep < len(window):
+            H[top:m + 1, top:m + 1] = T
+            H[top:m + 1, top - 1] = spike
+            H[top + keep:m + 1, top - 1] = 0.0
+            H[l:top, top:m + 1] = H[l:top, top:m + 1] @ Z
+            eigenvalues[top + keep:m + 1] = window[keep:]
+            m = top + keep - 1
+            _restore_hessenberg(H, l, top - 1, m)
+            iterations = 0
+            # Deflating a good share of the window is worth another look before sweeping
+            if len(window) - keep > len(window) // 7 or m - l + 1 < small_window:
+                continue
+
+        # Step 5: Multishift sweep with the undeflated Schur eigenvalues; exceptional
+        # shifts every 10 sweeps without a deflation break rare cycles
+        iterations += 1
+        if iterations % 10 == 0:
+            w = np.abs(np.diagonal(H, -1)[m - shifts:m]) + np.abs(np.diagonal(H, -1)[m - shifts - 1:m - 1])
+            d = np.diagonal(H)[m - shifts + 1:m + 1] + 0.75 * w
+            pairs = list(zip(2 * d[::2], d[::2] ** 2 - 0.4375 * w[::2] ** 2))
+        else:
+            pairs = _shift_pairs(window[max(0, keep - shifts):keep])
+        _multishift_sweep(H, l, m, pairs, chunk=4 * len(pairs))
+
+    return eigenvalues
+
+
+def _complex_hessenberg_eigenvalues(H, max_iterations, tolerance):
+    """
+    Eigenvalues of a complex upper Hessenberg matrix by Wilkinson-shifted QR
+    using Givens rotations. Only the active window H[l:m+1, l:m+1] is updated,
+    and each rotation is applied in place to two row or column views.
+    """
+    H = np.array(H, dtype=complex)
+    n = H.shape[0]
+    eigenvalues = np.empty(n, dtype=complex)
+    rotations = np.empty((n, 2), dtype=complex)
+    buffer, product = np.empty(n, dtype=complex), np.empty(n, dtype=complex)
+    m = n - 1
+    iterations = 0
+
+    while m >= 0:
+        # Step 1: Find the start l of the unreduced block ending at m
+        l = m
+        while l > 0 and abs(H[l, l - 1]) > tolerance * (abs(H[l - 1, l - 1]) + abs(H[l, l])):
+            l -= 1
+        if l > 0:
+            H[l, l - 1] = 0.0
+
+        # Step 2: Deflate a converged eigenvalue, or give up on it after max_iterations
+        if l == m or iterations >= max_iterations:
+            eigenvalues[m] = H[m, m]
+            m -= 1
+            iterations = 0
+            continue
+
+        # Step 3: Wilkinson shift from the trailing 2x2 block; an exceptional
+        # shift every 10 iterations breaks rare cycles
+        a, b, c, d = complex(H[m - 1, m - 1]), complex(H[m - 1, m]), complex(H[m, m - 1]), complex(H[m, m])
+        iterations += 1
+        if iterations % 10 == 0:
+            mu = d + abs(c)
+        else:
+            half_trace = (a + d) / 2
+            root = (((a - d) / 2) ** 2 + b * c) ** 0.5
+            mu1, mu2 = half_trace + root, half_trace - root
+            mu = mu1 if abs(mu1 - d) < abs(mu2 - d) else mu2
+
+        # Step 4: W - mu I = QR with Givens rotations [[c, s], [-conj(s), c]] on rows k, k+1...
+        W = H[l:m + 1, l:m + 1]
+        size = m - l + 1
+        W[np.diag_indices(size)] -= mu
+        for k in range(size - 1):
+            x, y = complex(W[k, k]), complex(W[k + 1, k])
+            r = math.hypot(abs(x), abs(y))
+            if r == 0:
+                cos, sin = 1.0, 0j
+            elif x == 0:
+                cos, sin = 0.0, 1 + 0j
+            else:
+                cos = abs(x) / r
+                sin = (x / abs(x)) * y.conjugate() / r
+            rotations[k] = cos, sin
+            upper, lower = W[k, k:], W[k + 1, k:]
+            new_upper = np.multiply(upper, cos, out=buffer[:len(upper)])
+            new_upper += np.multiply(lower, sin, out=product[:len(upper)])
+            lower *= cos
+            lower -= np.multiply(upper, sin.conjugate(), out=product[:len(upper)])
+            upper[:] = new_upper
+
+        # Step 5: ...then W = RQ + mu I, applying the conjugate-transposed rotations to columns k, k+1
+        for k in range(size - 1):
+            cos, sin = rotations[k]
+            left, right = W[:k + 2, k], W[:k + 2, k + 1]
+            new_left = np.multiply(left, cos.real, out=buffer[:k + 2])
+            new_left += np.multiply(right, sin.conjugate(), out=product[:k + 2])
+            right *= cos.real
+            right -= np.multiply(left, sin, out=product[:k + 2])
+            left[:] = new_left
+        W[np.diag_indices(size)] += mu
+
+    return eigenvalues
+
+
+def shifted_qr_eigenvalues(matrix, max_iterations=100, tolerance=1e-12):
+    """
+    Compute eigenvalues with the practical QR algorithm:
+    1. reduce to Hessenberg form once (tridiagonal for symmetric input), so each
+       QR step costs O(n^2) (O(n) for tridiagonal) instead of O(n^3);
+    2. use Wilkinson shifts, which converge quadratically (cubically when symmetric);
+       real non-symmetric input uses Francis double shifts, so complex-conjugate
+       pairs are found in real arithmetic, and large windows chase many shifts
+       at once with aggressive early deflation;
+    3. deflate each converged eigenvalue so the active window keeps shrinking.
+
+    Parameters:
+    - matrix (numpy.ndarray): The input square matrix.
+    - max_iterations (int): The maximum number of QR steps spent on one eigenvalue.
+    - tolerance (float): Relative size below which a subdiagonal entry counts as zero.
+
+    Returns:
+    - numpy.ndarray: The eigenvalues (real for symmetric input, otherwise complex
+      unless every imaginary part is negligible).
+    """
+    A = np.asarray(matrix)
+    if A.shape[0] == 0:
+        return np.empty(0)
+
+    if np.isrealobj(A) and np.allclose(A, A.T):
+        T = hessenberg_reduction((A + A.T) / 2)
+        return _tridiagonal_eigenvalues(np.diag(T), np.diag(T, -1), max_iterations, tolerance)
+
+    H = hessenberg_reduction(A)
+    if np.iscomplexobj(H):
+        return _complex_hessenberg_eigenvalues(H, max_iterations, tolerance)
+    eigenvalues = _hessenberg_eigenvalues(H, max_iterations, tolerance)
+    if np.all(np.abs(eigenvalues.imag) <= tolerance * np.maximum(np.abs(eigenvalues), 1)):
+        return eigenvalues.real
+    return eigenvalues
+
+
+def qr_algorithm_batched(stack, max_iterations=1000, tolerance=1e-10):
+    """
+    Perform the QR algorithm on a whole stack of small square matrices at once.
+
+    All matrices still iterating are factorised together with NumPy's stacked
+    np.linalg.qr, so the Python overhead is paid once per iteration rather than
+    once per matrix. Each matrix uses the same convergence test as qr_algorithm
+    and is removed from the working set as soon as it converges.
+
+    Parameters:
+    - stack (numpy.ndarray): Array of shape (N, n, n) holding N square matrices.
+    - max_iterations (int): The maximum number of iterations allowed.
+    - tolerance (float): The convergence tolerance for determining eigenvalues.
+
+    Returns:
+    - numpy.ndarray: (N, n) array with the eigenvalues of each matrix.
+    - numpy.ndarray: (N,) array with the number of QR iterations each matrix took.
+    - numpy.ndarray: (N,) boolean array, True where the matrix converged.
+    """
+    # Step 1: Copy the stack; `work` holds only the matrices still iterating
+    A = np.array(stack, dtype=float)
+    N = A.shape[0]
+    iterations = np.zeros(N, dtype=int)
+    converged = np.zeros(N, dtype=bool)
+    active = np.arange(N)
+    work = A.copy()
+
+    for i in range(max_iterations):
+        if active.size == 0:
+            break
+
+        # Step 2: One QR iteration for every active matrix (A_next = R * Q)
+        Q, R = np.linalg.qr(work)
+        work_next = R @ Q
+        iterations[active] += 1
+
+        # Step 3: Per-matrix convergence check, as np.allclose in qr_algorithm
+        done = np.all(np.isclose(work, work_next, atol=tolerance), axis=(1, 2))
+
+        # Step 4: Store converged matrices and drop them from the working set
+        if done.any():
+            A[active[done]] = work[done]
+            converged[active[done]] = True
+            active = active[~done]
+            work = work_next[~done]
+        else:
+            work = work_next
+
+    A[active] = work  # Matrices that ran out of iterations keep their last iterate
+
+    # Step 5: Extract the diagonal elements of each matrix as its eigenvalues
+    eigenvalues = np.diagonal(A, axis1=1, axis2=2).copy()
+    return eigenvalues, iterations, converged
+
+
 # Example usage
-A = np.array([[4, 1], [2, 3]])  # Define a 2x2 matrix
-eigenvalues = qr_algorithm(A)   # Compute the eigenvalues
-print("Computed Eigenvalues:", eigenvalues)
+if __name__ == "__main__":
+    A = np.array([[4, 1], [2, 3]])  # Define a 2x2 matrix
+    eigenvalues = qr_algorithm(A)   # Compute the eigenvalues
+    print("Computed Eigenvalues:", eigenvalues)
+
+    # Shifted QR with deflation also finds complex-conjugate pairs
+    R = np.array([[0, -1, 2], [1, 0, 3], [0, 0, 5]])  # Eigenvalues 5 and +/- i
+    print("Shifted QR Eigenvalues:", qr_algorithm(R, method="shifted"))
+
+    # Batched QR over a stack of small matrices
+    stack = np.array([[[4, 1], [2, 3]], [[2, 0], [0, 1]], [[6, 2], [2, 3]]])
+    batch_eigenvalues, batch_iterations, batch_converged = qr_algorithm_batched(stack)
+    print("Batched Eigenvalues:", batch_eigenvalues)
+    print("Iterations:", batch_iterations, "Converged:", batch_converged)
@@ -0,0 +1,93 @@
+import random
+import zlib
+
+import pytest
+
+import CRC
+from CRC import CRC_PRESETS, CRCEngine
+
+# Published check values: the CRC of b"123456789" for each preset
+CHECK_VALUES = {
+    "CRC-8": 0xF4,
+    "CRC-16/ARC": 0xBB3D,
+    "CRC-16/CCITT-FALSE": 0x29B1,
+    "CRC-16/KERMIT": 0x2189,
+    "CRC-32": 0xCBF43926,
+    "CRC-32C": 0xE3069283,
+}
+
+
+def random_messages(seed):
+    rng = random.Random(seed)
+    yield ""
+    yield "0"
+    yield "1"
+    for length in (5, 8, 13, 64, 200):
+        yield "".join(rng.choice("01") for _ in range(length))
+    yield "0" * 20 + "1011"  # Leading zeros are padded away
+
+
+@pytest.mark.parametrize("generator", ["11", "1101", "100000111", "10001000000100001", "1" + "0" * 39 + "11"])
+def test_calculate_crc_matches_bitwise(generator):
+    for message in random_messages(len(generator)):
+        crc = CRC.CRC(message, generator)
+        assert crc.calculate_crc() == crc.calculate_crc_bitwise()
+
+
+def test_calculate_crc_reuses_engine_per_polynomial():
+    CRC.CRC("1011", "1101").calculate_crc()
+    engine = CRC._ENGINES[3, 0b1101]
+    CRC.CRC("1110011", "1101").calculate_crc()
+    assert CRC._ENGINES[3, 0b1101] is engine
+
+
+@pytest.mark.parametrize("name", sorted(CHECK_VALUES))
+def test_presets_match_check_values(name):
+    engine = CRCEngine(**CRC_PRESETS[name])
+    assert engine.checksum(b"123456789") == CHECK_VALUES[name]
+    data = bytes(random.Random(0).randrange(256) for _ in range(1000))
+    for length in (0, 1, 7, 8, 9, 63, 1000):
+        assert engine.checksum(data[:length]) == engine.checksum(data[:length], slicing=False)
+
+
+def test_narrow_and_wide_engines_match_bitwise():
+    # Widths below a byte use a padded register and widths above 64 skip slicing-by-8
+    for generator in ("1101", "1" + "0" * 69 + "1001"):
+        width, poly = len(generator) - 1, int(generator, 2)
+        engine = CRCEngine(width=width, poly=poly)
+        for message in random_messages(width):
+            padded = message.zfill(-(-len(message) // 8) * 8)
+            data = int(padded, 2).to_bytes(len(padded) // 8, "big") if message else b""
+            expected = int(CRC.CRC(message, generator).calculate_crc_bitwise(), 2)
+            assert engine.checksum(data) == expected
+
+
+@pytest.mark.parametrize("name", sorted(CHECK_VALUES))
+def test_combine_matches_whole_message(name):
+    engine = CRCEngine(**CRC_PRESETS[name])
+    data = bytes(random.Random(1).randrange(256) for _ in range(2000))
+    whole = engine.checksum(data)
+    for split in (0, 1, 8, 1023, 2000):
+        combined = engine.combine(engine.checksum(data[:split]), engine.checksum(data[split:]), len(data) - split)
+        assert combined == whole
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, None), (2, 1), (3, 70_000)])
+def test_crc_file_matches_in_memory_checksum(tmp_path, workers, chunk_size):
+    data = random.Random(2).randbytes(300_000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    for spec in ("CRC-32", "CRC-16/CCITT-FALSE", CRC_PRESETS["CRC-8"]):
+        engine = CRCEngine(**(CRC_PRESETS[spec] if isinstance(spec, str) else spec))
+        assert CRC.crc_file(path, spec=spec, workers=workers, chunk_size=chunk_size) == engine.checksum(data)
+
+
+def test_crc_file_matches_zlib_and_handles_empty_file(tmp_path):
+    data = random.Random(3).randbytes(100_000)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+    assert CRC.crc_file(path, workers=2, chunk_size=1) == zlib.crc32(data)
+
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert CRC.crc_file(empty) == zlib.crc32(b"")
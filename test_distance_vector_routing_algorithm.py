@@ -0,0 +1,149 @@
+import heapq
+import random
+
+import pytest
+
+from distance_vector_routing_algorithm import DistanceVectorMatrix, DistanceVectorSimulator, Router, random_topology
+
+RING = {0: {1: 1, 4: 3}, 1: {0: 1, 2: 2}, 2: {1: 2, 3: 2}, 3: {2: 2, 4: 6}, 4: {3: 6, 0: 3}}
+
+
+def dijkstra(links, source):
+    # Reference shortest-path costs from source over a {router: {neighbour: cost}} topology
+    distance = {source: 0}
+    queue = [(0, source)]
+    while queue:
+        cost, node = heapq.heappop(queue)
+        if cost > distance[node]:
+            continue
+        for neighbour, weight in links[node].items():
+            if cost + weight < distance.get(neighbour, float('inf')):
+                distance[neighbour] = cost + weight
+                heapq.heappush(queue, (cost + weight, neighbour))
+    return distance
+
+
+def set_link(links, a, b, cost):
+    if cost is None:
+        links[a].pop(b, None)
+        links[b].pop(a, None)
+    else:
+        links[a][b] = links[b][a] = cost
+
+
+def assert_shortest_paths(model, links):
+    expected = {source: dijkstra(links, source) for source in links}
+    for source in links:
+        assert model.distance_vector(source) == pytest.approx(expected[source])
+        for destination, via in model.routing_table(source).items():
+            if destination != source:
+                assert links[source][via] + expected[via][destination] == pytest.approx(expected[source][destination])
+
+
+@pytest.mark.parametrize("jitter", [0.0, 0.5])
+def test_simulator_matches_dijkstra_after_link_changes(jitter):
+    for seed in range(10):
+        links = random_topology(30, 20, seed=seed)
+        simulator = DistanceVectorSimulator(links, jitter=jitter, seed=seed)
+        assert simulator.run()["converged"]
+        assert_shortest_paths(simulator, links)
+
+        rng = random.Random(seed)
+        for _ in range(5):
+            a = rng.randrange(30)
+            b = rng.choice(list(links[a]))
+            cost = rng.choice([None, 1, 40])
+            simulator.change_link(a, b, cost)
+            set_link(links, a, b, cost)
+            assert simulator.run()["converged"]
+            assert_shortest_paths(simulator, links)
+
+
+def test_simulator_raises_infinity_with_link_costs():
+    links = {node: dict(neighbours) for node, neighbours in RING.items()}
+    simulator = DistanceVectorSimulator(links)
+    simulator.run()
+    for a, b, cost in [(0, 4, 24), (2, 3, 20), (0, 1, 21)]:
+        simulator.change_link(a, b, cost)
+        set_link(links, a, b, cost)
+    report = simulator.run(until=simulator.now + 2000)
+    assert report["converged"]
+    assert simulator.distance_vector(0)[3] == 30
+    assert_shortest_paths(simulator, links)
+
+
+def test_simulator_explicit_infinity_drops_long_routes():
+    simulator = DistanceVectorSimulator(RING, infinity=25)
+    simulator.run()
+    for a, b, cost in [(0, 4, 24), (2, 3, 20), (0, 1, 21)]:
+        simulator.change_link(a, b, cost)
+    assert simulator.run(until=simulator.now + 2000)["converged"]
+    assert 3 not in simulator.distance_vector(0)
+
+
+def test_simulator_partition_becomes_unreachable():
+    simulator = DistanceVectorSimulator({'A': {'B': 1}, 'B': {'C': 1}})
+    simulator.run()
+    simulator.change_link('B', 'C', None)
+    assert simulator.run()["converged"]
+    assert simulator.distance_vector('A') == {'A': 0, 'B': 1}
+    assert simulator.routing_table('C') == {'C': 'C'}
+
+
+@pytest.mark.parametrize("split_horizon", [True, False])
+def test_matrix_matches_simulator_after_link_changes(split_horizon):
+    for seed in range(8):
+        rng = random.Random(seed)
+        links = random_topology(40, 30, seed=seed)
+        for a in links:
+            for b in links[a]:
+                if a < b:
+                    links[a][b] = links[b][a] = rng.random() * 10 + 0.1  # Unique shortest paths
+        simulator = DistanceVectorSimulator(links)
+        simulator.run()
+        matrix = DistanceVectorMatrix(links, split_horizon=split_horizon, block_elements=500)
+        assert matrix.run()["converged"]
+
+        for _ in range(6):
+            # Drop a link, make one more expensive, or add a new one (possibly widening the slots)
+            a, b = rng.sample(range(40), 2)
+            cost = rng.choice([None, 25.0, 0.5]) if b in links[a] else rng.random() * 5 + 0.1
+            simulator.change_link(a, b, cost)
+            simulator.run()
+            matrix.change_link(a, b, cost)
+            set_link(links, a, b, cost)
+            assert matrix.run()["converged"]
+            assert_shortest_paths(matrix, links)
+            for node in links:
+                assert matrix.routing_table(node) == simulator.routing_table(node)
+
+
+def test_matrix_raises_infinity_with_link_costs():
+    links = {node: dict(neighbours) for node, neighbours in RING.items()}
+    matrix = DistanceVectorMatrix(links)
+    matrix.run()
+    for a, b, cost in [(0, 4, 24), (2, 3, 20), (0, 1, 21), (3, 4, 15)]:
+        matrix.change_link(a, b, cost)
+        set_link(links, a, b, cost)
+        assert matrix.run()["converged"]
+        assert_shortest_paths(matrix, links)
+
+
+def test_matrix_split_horizon_stops_two_router_count_to_infinity():
+    rounds = {}
+    for split_horizon in (False, True):
+        matrix = DistanceVectorMatrix({'A': {'B': 1}, 'B': {'C': 1}}, split_horizon=split_horizon, infinity=16)
+        matrix.run()
+        matrix.change_link('B', 'C', None)
+        rounds[split_horizon] = matrix.run()["rounds"]
+        assert matrix.distance_vector('A') == {'A': 0, 'B': 1}
+    assert rounds[True] < rounds[False]
+
+
+def test_matrix_from_routers():
+    routers = [Router('A', {'B': 1, 'C': 4}), Router('B', {'A': 1, 'C': 2, 'D': 5}),
+               Router('C', {'A': 4, 'B': 2}), Router('D', {'B': 5})]
+    matrix = DistanceVectorMatrix.from_routers(routers)
+    matrix.run()
+    assert matrix.routing_table('A') == {'A': 'A', 'B': 'B', 'C': 'B', 'D': 'B'}
+    assert matrix.distance_vector('D') == {'A': 6, 'B': 5, 'C': 7, 'D': 0}
@@ -0,0 +1,97 @@
+import io
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from hamming_code import (SECDEDCodec, hamming_decode, hamming_decode_batch, hamming_decode_packed, hamming_encode,
+                          hamming_encode_batch, hamming_encode_packed, secded_codec)
+
+
+def random_words(k, count, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2, size=(count, k), dtype=np.uint8)
+
+
+def as_string(bits):
+    return "".join(map(str, bits))
+
+
+@pytest.mark.parametrize("k", [1, 4, 5, 11, 26])
+def test_batch_matches_string_codec(k):
+    words = random_words(k, 200, k)
+    codewords = hamming_encode_batch(words, k)
+    n = codewords.shape[1]
+    for word, codeword in zip(words, codewords):
+        assert as_string(codeword) == hamming_encode(as_string(word))
+
+    # Flip one bit of every codeword (or none, at position 0)
+    positions = np.random.default_rng(k + 1).integers(0, n + 1, len(words))
+    received = codewords.copy()
+    flipped = positions > 0
+    received[flipped, positions[flipped] - 1] ^= 1
+    decoded, syndromes = hamming_decode_batch(received, k)
+    assert np.array_equal(decoded, words)
+    assert np.array_equal(syndromes, positions)
+    for word, codeword, position in zip(words, received, positions):
+        assert hamming_decode(as_string(codeword)) == (as_string(word), position)
+
+
+@pytest.mark.parametrize("k", [4, 8, 11])
+def test_packed_round_trip_corrects_single_errors(k):
+    data = random.Random(k).randbytes(301)
+    packed = bytearray(hamming_encode_packed(data, k))
+    n = hamming_encode_batch(np.zeros((1, k), dtype=np.uint8), k).shape[1]
+    # One flipped bit in every other codeword
+    for codeword in range(0, len(data) * 8 // k, 2):
+        bit = codeword * n + random.Random(codeword).randrange(n)
+        packed[bit // 8] ^= 0x80 >> (bit % 8)
+    decoded, corrected = hamming_decode_packed(bytes(packed), len(data), k)
+    assert decoded == data
+    assert corrected == len(range(0, len(data) * 8 // k, 2))
+
+
+@pytest.mark.parametrize("k", [4, 11, 26])
+def test_secded_matches_string_codec_and_detects_double_errors(k):
+    codec = SECDEDCodec(k)
+    for data in random.Random(k).sample(range(1 << k), min(1 << k, 40)):
+        codeword = codec.encode(data)
+        # Positions 1..n-1 are the plain Hamming codeword, position n makes the parity even
+        bits = format(data, f"0{k}b")[::-1]
+        assert format(codeword & ((1 << (codec.n - 1)) - 1), f"0{codec.n - 1}b")[::-1] == hamming_encode(bits)
+        assert codeword.bit_count() % 2 == 0
+        assert codec.decode(codeword) == (data, 0)
+
+        for position in range(1, codec.n + 1):
+            assert codec.decode(codeword ^ (1 << (position - 1))) == (data, position)
+        for a, b in itertools.combinations(range(codec.n), 2):
+            with pytest.raises(ValueError):
+                codec.decode(codeword ^ (1 << a) ^ (1 << b))
+
+
+@pytest.mark.parametrize("length, chunk_size", [(0, 64), (7, 64), (8, 1), (1000, 64), (1000, 1 << 16)])
+def test_secded_stream_round_trip(length, chunk_size):
+    codec = secded_codec(64)
+    data = random.Random(length).randbytes(length)
+    encoded = io.BytesIO()
+    count = codec.encode_stream(io.BytesIO(data), encoded, chunk_size=chunk_size)
+    stream = bytearray(encoded.getvalue())
+    assert len(stream) == count * codec.n_bytes
+
+    # Flip one bit in every codeword
+    rng = random.Random(length + 1)
+    for i in range(count):
+        bit = rng.randrange(codec.n)
+        stream[i * codec.n_bytes + bit // 8] ^= 1 << (bit % 8)
+    decoded = io.BytesIO()
+    assert codec.decode_stream(io.BytesIO(bytes(stream)), decoded, chunk_size=chunk_size) == count
+    assert decoded.getvalue() == data
+
+    with pytest.raises(ValueError):
+        codec.decode_stream(io.BytesIO(bytes(stream[:-1])), io.BytesIO())
+
+
+def test_secded_codec_is_cached_per_size():
+    assert secded_codec(32) is secded_codec(32)
+    assert secded_codec(32) is not secded_codec(64)
@@ -0,0 +1,61 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from Hamming_distance import MultiIndexHash, flip_masks, hamming_distance, hamming_distance_many_to_many, hamming_distance_one_to_many
+
+
+def random_codes(n, words, seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 2**64, size=(n, words), dtype=np.uint64, endpoint=False)
+
+
+def baseline_distances(queries, codes):
+    # Per-pair distances on Python ints built from the words of each code
+    as_int = lambda code: sum(int(word) << (64 * i) for i, word in enumerate(code))
+    return np.array([[hamming_distance(as_int(q), as_int(c)) for c in codes] for q in queries])
+
+
+@pytest.mark.parametrize("words", [1, 4])
+def test_batched_distances_match_baseline(words):
+    queries, codes = random_codes(13, words, 0), random_codes(37, words, 1)
+    expected = baseline_distances(queries, codes)
+    assert np.array_equal(hamming_distance_one_to_many(queries[0], codes), expected[0])
+    for block_size in (1, 5, 1024):
+        assert np.array_equal(hamming_distance_many_to_many(queries, codes, block_size=block_size), expected)
+
+
+@pytest.mark.parametrize("length, radius", [(1, 1), (7, 0), (7, 3), (12, 12), (16, 20)])
+def test_flip_masks_match_combinations(length, radius):
+    expected = sorted(sum(1 << p for p in positions)
+                      for weight in range(min(radius, length) + 1)
+                      for positions in itertools.combinations(range(length), weight))
+    assert sorted(flip_masks(length, radius).tolist()) == expected
+
+
+@pytest.mark.parametrize("words, m", [(1, 4), (1, 3), (4, 5)])
+def test_multi_index_hash_matches_linear_scan(words, m):
+    codes = random_codes(2000, words, 2)
+    rng = np.random.default_rng(3)
+    index = MultiIndexHash(codes, m=m)
+    for radius in (0, 3, 9, 14):
+        # Plant near duplicates of one code so the radius query has something to find
+        query = codes[rng.integers(len(codes))].copy()
+        query[0] ^= np.uint64(int(rng.integers(0, 2**16)))
+        distances = hamming_distance_one_to_many(query, codes)
+        ids, found = index.query(query, radius)
+        assert np.array_equal(ids, np.flatnonzero(distances <= radius))
+        assert np.array_equal(found, distances[ids])
+
+
+def test_large_radius_falls_back_to_linear_scan():
+    # r=17 with m=2 would need about 15 million probes per substring
+    codes = random_codes(1000, 1, 4)
+    index = MultiIndexHash(codes, m=2)
+    assert index._probe_count(17 // 2) == 2 * sum(math.comb(32, w) for w in range(9))
+    ids, distances = index.query(codes[0], radius=17)
+    expected = hamming_distance_one_to_many(codes[0], codes)
+    assert np.array_equal(ids, np.flatnonzero(expected <= 17))
+    assert np.array_equal(distances, expected[ids])
@@ -0,0 +1,121 @@
+import random
+
+import numpy as np
+import pytest
+
+from Huffman_coding import (CanonicalCodebook, code_lengths_from_tree, huffman_code_lengths,
+                            huffman_code_lengths_limited, huffman_compress, huffman_decompress, huffman_tree)
+
+
+def fibonacci_frequencies(count):
+    # Fibonacci weights give the deepest possible Huffman tree
+    weights = [1, 1]
+    while len(weights) < count:
+        weights.append(weights[-1] + weights[-2])
+    return weights[:count]
+
+
+def bit_string_encode(codebook, data):
+    # Concatenate each symbol's code as a '0'/'1' string, then pack MSB first
+    bits = "".join(format(codebook.codes[s], f"0{codebook.lengths[s]}b") for s in data)
+    bits += "0" * (-len(bits) % 8)
+    return bytes(int(bits[i:i + 8], 2) for i in range(0, len(bits), 8))
+
+
+def sample_data():
+    rng = random.Random(0)
+    yield b"a"
+    yield b"this is an example of a huffman tree" * 20
+    yield bytes(rng.randrange(256) for _ in range(5000))
+    # Skewed data whose rarest symbols get codes longer than the decode table
+    frequencies = fibonacci_frequencies(24)
+    yield bytes(rng.choices(range(24), weights=frequencies, k=20000)) + bytes(range(24))
+
+
+@pytest.mark.parametrize("block_size", [7, 1 << 16])
+def test_codebook_matches_bit_string_baseline(block_size):
+    for data in sample_data():
+        codebook = CanonicalCodebook.from_data(data)
+        encoded = codebook.encode(data, block_size=block_size)
+        assert bytes(encoded) == bit_string_encode(codebook, data)
+        assert codebook.decode(encoded, len(data), block_size=block_size) == data
+
+
+def test_long_codes_use_the_slow_path():
+    codebook = CanonicalCodebook.from_frequencies(fibonacci_frequencies(24))
+    assert codebook.max_length > CanonicalCodebook.TABLE_BITS
+    data = bytes(range(24)) * 3
+    assert codebook.decode(codebook.encode(data), len(data)) == data
+
+
+def test_serialize_round_trip_and_compress():
+    for data in sample_data():
+        codebook = CanonicalCodebook.from_data(data)
+        header = codebook.serialize()
+        assert len(header) == (128 if codebook.max_length <= 15 else 256)
+        assert CanonicalCodebook.deserialize(header).codes == codebook.codes
+        assert huffman_decompress(huffman_compress(data)) == data
+
+
+def test_invalid_codebooks_and_data_are_rejected():
+    with pytest.raises(ValueError):
+        CanonicalCodebook([1, 1, 1])
+    codebook = CanonicalCodebook.from_data(b"ab")
+    with pytest.raises(ValueError):
+        codebook.encode(b"abc")
+    with pytest.raises(ValueError):
+        codebook.decode(b"", 5)
+
+
+def textbook_package_merge(frequencies, max_length):
+    # Reference package-merge that carries the symbols of every package explicitly
+    leaves = sorted((weight, (symbol,)) for symbol, weight in enumerate(frequencies) if weight > 0)
+    items = list(leaves)
+    for _ in range(max_length - 1):
+        packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                    for i in range(0, len(items) - 1, 2)]
+        items = sorted(leaves + packages, key=lambda item: item[0])
+    lengths = [0] * len(frequencies)
+    for _, symbols in items[:2 * len(leaves) - 2]:
+        for symbol in symbols:
+            lengths[symbol] += 1
+    return lengths
+
+
+def random_frequencies(seed):
+    rng = np.random.default_rng(seed)
+    yield [0, 5]
+    yield [3, 3, 3, 3]
+    yield fibonacci_frequencies(30)
+    yield rng.integers(0, 50, 40).tolist()
+    yield rng.zipf(1.3, 300).tolist()
+
+
+def test_two_queue_matches_heap_tree():
+    for frequencies in random_frequencies(0):
+        lengths = huffman_code_lengths(frequencies)
+        tree = huffman_tree([(s, f) for s, f in enumerate(frequencies) if f])
+        assert np.dot(frequencies, lengths) == np.dot(frequencies, code_lengths_from_tree(tree, len(frequencies)))
+        presorted = sorted(frequencies)
+        assert np.array_equal(huffman_code_lengths(presorted, presorted=True), huffman_code_lengths(presorted))
+
+
+@pytest.mark.parametrize("slack", [0, 1, 3, 64])
+def test_package_merge_matches_textbook_version(slack):
+    for frequencies in random_frequencies(1):
+        symbols = int(np.count_nonzero(frequencies))
+        if symbols < 2:
+            continue
+        max_length = (symbols - 1).bit_length() + slack
+        lengths = huffman_code_lengths_limited(frequencies, max_length)
+        expected = textbook_package_merge(frequencies, max_length)
+        assert np.dot(frequencies, lengths) == np.dot(frequencies, expected)
+        assert lengths.max() <= max_length
+        assert sum(2.0 ** -int(l) for l in lengths if l) <= 1
+        if max_length >= huffman_code_lengths(frequencies).max():
+            assert np.dot(frequencies, lengths) == np.dot(frequencies, huffman_code_lengths(frequencies))
+
+
+def test_package_merge_rejects_impossible_limit():
+    with pytest.raises(ValueError):
+        huffman_code_lengths_limited([1] * 9, 3)
@@ -0,0 +1,158 @@
+import asyncio
+
+import numpy as np
+import pytest
+from scipy.linalg import solve_discrete_are
+
+from kalman_filter import KalmanFilter, cholesky_gain, kalman_filter, kalman_filter_batched, kalman_filter_fast, solve_dare
+
+
+def tracking_model(axes=2):
+    # Constant-velocity model: position and velocity per axis, position observed
+    A = np.kron(np.eye(axes), np.array([[1.0, 1.0], [0.0, 1.0]]))
+    B = np.kron(np.eye(axes), np.array([[0.5], [1.0]]))
+    H = np.kron(np.eye(axes), np.array([[1.0, 0.0]]))
+    Q = 0.01 * np.eye(2 * axes)
+    R = 0.5 * np.eye(axes)
+    return A, B, H, Q, R
+
+
+def test_cholesky_gain_matches_inverse():
+    A, B, H, Q, R = tracking_model()
+    P = np.array([[2.0, 0.3, 0.1, 0.0], [0.3, 1.0, 0.0, 0.2], [0.1, 0.0, 3.0, 0.5], [0.0, 0.2, 0.5, 1.5]])
+    np.testing.assert_allclose(cholesky_gain(P, H, R), P @ H.T @ np.linalg.inv(H @ P @ H.T + R))
+
+
+@pytest.mark.parametrize("steady_state", [None, "detect", "dare"])
+def test_fast_matches_baseline(steady_state):
+    rng = np.random.default_rng(0)
+    A, B, H, Q, R = tracking_model()
+    measurements = np.cumsum(rng.normal(size=(500, 2)), axis=0)
+    controls = rng.normal(size=(500, 2))
+    x0, P0 = np.zeros(4), np.eye(4)
+    expected_x, expected_P = kalman_filter(A, B, H, Q, R, x0, P0, measurements, controls)
+    x, P = kalman_filter_fast(A, B, H, Q, R, x0, P0, measurements, controls, steady_state=steady_state)
+    if steady_state == "dare":
+        # The steady-state gain from the first step only agrees once the baseline has converged
+        x, expected_x, P, expected_P = x[100:], expected_x[100:], P[100:], expected_P[100:]
+    np.testing.assert_allclose(x, expected_x, atol=1e-6)
+    np.testing.assert_allclose(P, expected_P, atol=1e-6)
+
+    # An empty trace gives empty estimates, as the baseline does
+    x, P = kalman_filter_fast(A, B, H, Q, R, x0, P0, measurements[:0], controls[:0], steady_state=steady_state)
+    assert x.shape == (0, 4) and P.shape == (0, 4, 4)
+    assert len(kalman_filter(A, B, H, Q, R, x0, P0, measurements[:0], controls[:0])[0]) == 0
+
+
+def test_solve_dare_is_fixed_point():
+    A, B, H, Q, R = tracking_model()
+    P = solve_dare(A, H, Q, R)
+    K = cholesky_gain(P, H, R)
+    np.testing.assert_allclose(A @ (P - K @ H @ P) @ A.T + Q, P, atol=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solve_dare_matches_scipy_and_riccati_recursion(seed):
+    # Random stable and unstable models; the filter DARE is scipy's control DARE for (A^T, H^T)
+    rng = np.random.default_rng(seed)
+    n, m = 4, 2
+    A = rng.normal(size=(n, n)) * (0.5 if seed % 2 else 0.9)
+    H = rng.normal(size=(m, n))
+    root_Q, root_R = rng.normal(size=(n, n)), rng.normal(size=(m, m))
+    Q, R = root_Q @ root_Q.T + 0.1 * np.eye(n), root_R @ root_R.T + 0.1 * np.eye(m)
+    P = solve_dare(A, H, Q, R)
+    np.testing.assert_allclose(P, solve_discrete_are(A.T, H.T, Q, R), rtol=1e-8, atol=1e-10)
+
+    # The one-step-at-a-time Riccati recursion (Joseph form, which stays symmetric
+    # positive definite for unstable A) converges to the same covariance
+    P_iter = Q.copy()
+    for _ in range(2000):
+        K = cholesky_gain(P_iter, H, R)
+        I_KH = np.eye(n) - K @ H
+        P_iter = A @ (I_KH @ P_iter @ I_KH.T + K @ R @ K.T) @ A.T + Q
+    np.testing.assert_allclose(P, P_iter, rtol=1e-8, atol=1e-10)
+
+
+def test_solve_dare_reports_non_convergence():
+    A, B, H, Q, R = tracking_model()
+    with pytest.raises(ValueError):
+        solve_dare(A, H, Q, R, max_iter=1)
+
+
+def test_batched_matches_baseline_per_track():
+    rng = np.random.default_rng(1)
+    A, B, H, Q, R = tracking_model()
+    steps, tracks = 60, 5
+    measurements = np.cumsum(rng.normal(size=(steps, tracks, 2)), axis=0)
+    controls = rng.normal(size=(steps, 1, 2))
+    x0 = rng.normal(size=(tracks, 4))
+    mask = rng.random((steps, tracks)) > 0.2
+    x, P = kalman_filter_batched(A, B, H, Q, R, x0, np.eye(4), measurements, controls, mask=mask, store_covariance=True)
+
+    for track in range(tracks):
+        # Missing measurements are predict-only steps, i.e. a zero-gain update
+        kf = KalmanFilter(A, B, H, Q, R, x0[track], np.eye(4))
+        for step in range(steps):
+            z = measurements[step, track] if mask[step, track] else None
+            np.testing.assert_allclose(x[step, track], kf.step(z, controls[step, 0]), atol=1e-9)
+            np.testing.assert_allclose(P[step, track], kf.P, atol=1e-9)
+
+        if mask[:, track].all():
+            expected_x, _ = kalman_filter(A, B, H, Q, R, x0[track], np.eye(4), measurements[:, track], controls[:, 0])
+            np.testing.assert_allclose(x[:, track], expected_x, atol=1e-9)
+
+
+
+@pytest.mark.parametrize("shape", [(2,), (5, 2), (1, 5, 2), (60, 1, 2)])
+def test_batched_broadcasts_controls(shape):
+    # Any control shape broadcastable to (S, T, k) matches the same controls spelled out in full
+    rng = np.random.default_rng(4)
+    A, B, H, Q, R = tracking_model()
+    measurements = np.cumsum(rng.normal(size=(60, 5, 2)), axis=0)
+    controls = rng.normal(size=shape)
+    x0 = rng.normal(size=(5, 4))
+    full = np.broadcast_to(controls, (60, 5, 2)).copy()
+    x, P = kalman_filter_batched(A, B, H, Q, R, x0, np.eye(4), measurements, controls)
+    expected_x, expected_P = kalman_filter_batched(A, B, H, Q, R, x0, np.eye(4), measurements, full)
+    np.testing.assert_allclose(x, expected_x)
+    np.testing.assert_allclose(P, expected_P)
+    expected_track, _ = kalman_filter(A, B, H, Q, R, x0[3], np.eye(4), measurements[:, 3], full[:, 3])
+    np.testing.assert_allclose(x[:, 3], expected_track, atol=1e-9)
+
+def test_stream_matches_baseline():
+    rng = np.random.default_rng(2)
+    A, B, H, Q, R = tracking_model()
+    measurements = np.cumsum(rng.normal(size=(50, 2)), axis=0)
+    controls = rng.normal(size=(50, 2))
+    expected_x, expected_P = kalman_filter(A, B, H, Q, R, np.zeros(4), np.eye(4), measurements, controls)
+    kf = KalmanFilter(A, B, H, Q, R, np.zeros(4), np.eye(4))
+    results = list(kf.stream(measurements, controls, covariance_every=10))
+    np.testing.assert_allclose([x for x, _ in results], expected_x, atol=1e-9)
+    assert [P is not None for _, P in results] == [(i + 1) % 10 == 0 for i in range(50)]
+    np.testing.assert_allclose(results[9][1], expected_P[9], atol=1e-9)
+
+
+def test_stream_and_astream_agree_and_reject_length_mismatch():
+    rng = np.random.default_rng(3)
+    A, B, H, Q, R = tracking_model()
+    measurements = list(rng.normal(size=(20, 2)))
+    controls = list(rng.normal(size=(20, 2)))
+
+    async def arrive(items):
+        for item in items:
+            yield item
+
+    async def collect(filter_, items, controls):
+        return [x async for x, _ in filter_.astream(arrive(items), controls)]
+
+    new_filter = lambda: KalmanFilter(A, B, H, Q, R, np.zeros(4), np.eye(4))
+    expected = [x for x, _ in new_filter().stream(measurements, controls)]
+    np.testing.assert_allclose(asyncio.run(collect(new_filter(), measurements, controls)), expected)
+    np.testing.assert_allclose([x for x, _ in new_filter().stream(measurements)],
+                               [x for x, _ in new_filter().stream(measurements, np.zeros((20, 2)))])
+
+    for short_measurements, short_controls in ((measurements, controls[:-1]), (measurements[:-1], controls)):
+        with pytest.raises(ValueError):
+            list(new_filter().stream(short_measurements, short_controls))
+        with pytest.raises(ValueError):
+            asyncio.run(collect(new_filter(), short_measurements, short_controls))
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from LZW import FIRST_CODE, LZWCompressor, compress, decompress, lzw_decode, lzw_encoding
+
+BYTE_DICTIONARY = {chr(i): i for i in range(256)}  # lzw_encoding then numbers new entries from 257
+
+
+def samples():
+    rng = random.Random(0)
+    yield b""
+    yield b"A"
+    yield b"ABABABA"  # Hits the code-not-yet-in-table case
+    yield b"TOBEORNOTTOBEORTOBEORNOT" * 50
+    yield bytes(rng.randrange(4) + 65 for _ in range(5000))
+    yield bytes(rng.randrange(256) for _ in range(3000))
+
+
+def unpack_codes(data):
+    # Code i is written with the width of the largest code the encoder could have emitted by then
+    value = int.from_bytes(data, "little")
+    codes = []
+    position = 0
+    while True:
+        width = min((FIRST_CODE + len(codes) - 1).bit_length(), 16)
+        if position + width > len(data) * 8:
+            return codes
+        codes.append((value >> position) & ((1 << width) - 1))
+        position += width
+
+
+@pytest.mark.parametrize("initial_dictionary", [{"A": 1, "B": 2}, {"a": 1, "b": 2, "c": 3}])
+def test_decode_inverts_encoding(initial_dictionary):
+    rng = random.Random(1)
+    alphabet = "".join(initial_dictionary)
+    for length in (0, 1, 2, 7, 100, 2000):
+        text = "".join(rng.choice(alphabet) for _ in range(length))
+        assert lzw_decode(lzw_encoding(text, initial_dictionary), initial_dictionary) == text
+    with pytest.raises(ValueError):
+        lzw_decode([1, 99], initial_dictionary)
+
+
+def test_compress_emits_the_same_codes_as_lzw_encoding():
+    for data in samples():
+        expected = lzw_encoding(data.decode("latin-1"), BYTE_DICTIONARY)
+        assert unpack_codes(compress(data)) == expected
+        assert decompress(compress(data)) == data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_streaming_matches_one_shot(chunk_size):
+    for data in samples():
+        compressor = LZWCompressor()
+        parts = [compressor.feed(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size)]
+        parts.append(compressor.flush())
+        assert b"".join(parts) == compress(data)
+
+
+def test_dictionary_reset_round_trips_and_compressor_is_reusable():
+    # Random bytes barely repeat, so the 2^16-entry dictionary fills and CLEAR_CODE is emitted
+    data = random.Random(2).randbytes(200_000) + b"ABCD" * 20_000
+    compressor = LZWCompressor()
+    packed = compressor.feed(data[:123_457]) + compressor.feed(data[123_457:]) + compressor.flush()
+    assert packed == compress(data)
+    assert decompress(packed) == data
+    assert compressor.feed(b"TOBEORNOT") + compressor.flush() == compress(b"TOBEORNOT")
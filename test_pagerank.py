@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+import pytest
+
+from pagerank import IncrementalPageRank, SparseGraph, convert_edge_list, pagerank, pagerank_mmap, pagerank_sparse
+
+
+def random_graph(N, E, seed):
+    # Dense 0/1 adjacency (duplicate links merged, dangling pages likely) and its edge list
+    rng = np.random.default_rng(seed)
+    links = np.zeros((N, N))
+    links[rng.integers(0, N, E), rng.integers(0, N, E)] = 1
+    sources, targets = np.nonzero(links)
+    return links, sources, targets
+
+
+def write_edges(tmp_path, text):
+    path = tmp_path / "edges.txt"
+    path.write_text(text)
+    return os.fspath(path)
+
+
+def test_convert_edge_list_builds_csr(tmp_path):
+    edge_path = write_edges(tmp_path, "# source target\n0 1\n0 2\n\n2 1\n1\t3\n3 0  # trailing comment\n")
+    N, E = convert_edge_list(edge_path, os.fspath(tmp_path / "graph"), chunk_bytes=8)
+    assert (N, E) == (4, 5)
+    offsets = np.load(tmp_path / "graph" / "offsets.npy")
+    sources = np.load(tmp_path / "graph" / "sources.npy")
+    incoming = {v: sorted(sources[offsets[v]:offsets[v + 1]].tolist()) for v in range(N)}
+    assert incoming == {0: [3], 1: [0, 2], 2: [0], 3: [1]}
+    assert np.load(tmp_path / "graph" / "out_degree.npy").tolist() == [2, 1, 1, 1]
+
+
+@pytest.mark.parametrize("text", [
+    "0 1 5\n1 2 7\n",       # Weighted edge list: three columns, which reshape(-1, 2) used to misread
+    "0 1\n1 2 7\n",         # Column count changes between lines
+    "0 1\n2\n",             # Missing target
+    "0 one\n",              # Not a page id
+    "0 -1\n",               # Negative page id
+])
+def test_convert_edge_list_rejects_malformed_lines(tmp_path, text):
+    with pytest.raises(ValueError, match="Malformed edge list"):
+        convert_edge_list(write_edges(tmp_path, text), os.fspath(tmp_path / "graph"))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_sparse_engines_match_dense(tmp_path, seed):
+    links, sources, targets = random_graph(200, 800, seed)
+    expected = pagerank(links)
+
+    # Same iteration and stopping rule as the dense baseline, so only rounding differs
+    np.testing.assert_allclose(pagerank_sparse(SparseGraph.from_edges(sources, targets, N=200)), expected, atol=1e-15)
+    indptr = np.concatenate([[0], np.cumsum(links.sum(axis=1))]).astype(int)
+    np.testing.assert_allclose(pagerank_sparse(SparseGraph.from_csr(indptr, targets)), expected, atol=1e-15)
+    np.testing.assert_allclose(IncrementalPageRank(sources, targets, N=200).pagerank, expected, atol=1e-15)
+
+    edge_path = write_edges(tmp_path, "".join(f"{s} {t}\n" for s, t in zip(sources, targets)) + "199 199\n")
+    convert_edge_list(edge_path, os.fspath(tmp_path / "graph"), chunk_bytes=1000)
+    links[199, 199] += 1  # Makes sure the file covers all 200 pages
+    ranks, history = pagerank_mmap(os.fspath(tmp_path / "graph"), workers=2, block_edges=50, verbose=False)
+    np.testing.assert_allclose(ranks, pagerank(links), atol=1e-15)
+    assert history[-1][0] < 1e-6
+
+
+def test_weighted_sparse_graph_matches_dense():
+    rng = np.random.default_rng(3)
+    links, sources, targets = random_graph(100, 400, 3)
+    weights = rng.random(len(sources)) + 0.5
+    links[sources, targets] = weights
+    graph = SparseGraph.from_edges(sources, targets, N=100, weights=weights)
+    np.testing.assert_allclose(pagerank_sparse(graph), pagerank(links), atol=1e-15)
+
+
+@pytest.mark.parametrize("method", ["push", "power"])
+def test_incremental_updates_match_recomputation(method):
+    links, sources, targets = random_graph(150, 600, 4)
+    incremental = IncrementalPageRank(sources, targets, N=150, tol=1e-12)
+    rng = np.random.default_rng(5)
+    for _ in range(3):
+        new_sources, new_targets = rng.integers(0, 150, 5), rng.integers(0, 150, 5)
+        incremental.insert_edges(new_sources, new_targets)
+        np.add.at(links, (new_sources, new_targets), 1)
+        drop = rng.choice(len(incremental.keys), 3, replace=False)
+        dropped = incremental.keys[drop]
+        incremental.delete_edges(dropped // 150, dropped % 150)
+        np.add.at(links, (dropped // 150, dropped % 150), -1)
+        incremental.update(method=method)
+        np.testing.assert_allclose(incremental.pagerank, pagerank(links, tol=1e-14, max_iter=1000), atol=1e-10)
+
+
+def test_residual_is_exact_when_iterations_run_out():
+    links, sources, targets = random_graph(150, 600, 6)
+    incremental = IncrementalPageRank(sources, targets, N=150, tol=1e-12, max_iter=3)
+    assert incremental.cold_iterations == 3
+    # r = (1 - d) / N - p + d * M p, with dangling pages spread over every page
+    p, d = incremental.pagerank, incremental.d
+    degree = links.sum(axis=1)
+    spread = np.where(degree[:, None] > 0, links / np.maximum(degree, 1)[:, None], 1 / 150)
+    np.testing.assert_allclose(incremental.residual, (1 - d) / 150 - p + d * spread.T @ p, atol=1e-15)
+
+    # Pushes build on that residual, so a stale one would add the last step twice
+    incremental.max_iter = 1000
+    incremental.insert_edges([0], [1])
+    links[0, 1] += 1
+    incremental.update(method="push", max_pushes=10**6)
+    np.testing.assert_allclose(incremental.pagerank, pagerank(links, tol=1e-14, max_iter=1000), atol=1e-10)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from qr_algorithm import hessenberg_reduction, qr_algorithm, qr_algorithm_batched, shifted_qr_eigenvalues
+
+
+def assert_same_spectrum(eigenvalues, expected, tolerance=1e-9):
+    # Match every eigenvalue to its nearest reference (and back), relative to the spectral radius
+    eigenvalues, expected = np.atleast_1d(eigenvalues), np.atleast_1d(expected)
+    assert eigenvalues.shape == expected.shape
+    scale = max(1.0, np.abs(expected).max())
+    assert np.abs(eigenvalues[:, None] - expected[None, :]).min(axis=1).max() <= tolerance * scale
+    assert np.abs(eigenvalues[:, None] - expected[None, :]).min(axis=0).max() <= tolerance * scale
+
+
+@pytest.mark.parametrize("n", [3, 10, 64, 200])
+def test_hessenberg_reduction_is_similar(n):
+    matrix = np.random.default_rng(n).normal(size=(n, n))
+    H = hessenberg_reduction(matrix)
+    assert np.all(np.tril(H, -2) == 0)
+    assert_same_spectrum(np.linalg.eigvals(H), np.linalg.eigvals(matrix))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 20, 74, 75, 150, 300])
+def test_shifted_matches_numpy_general(n):
+    # Sizes on both sides of the switch between the double-shift and multishift paths
+    matrix = np.random.default_rng(n).normal(size=(n, n))
+    assert_same_spectrum(shifted_qr_eigenvalues(matrix), np.linalg.eigvals(matrix))
+
+
+@pytest.mark.parametrize("n", [1, 2, 10, 150])
+def test_shifted_matches_numpy_symmetric(n):
+    matrix = np.random.default_rng(n).normal(size=(n, n))
+    matrix = matrix + matrix.T
+    eigenvalues = shifted_qr_eigenvalues(matrix)
+    assert np.isrealobj(eigenvalues)
+    np.testing.assert_allclose(np.sort(eigenvalues), np.linalg.eigvalsh(matrix), atol=1e-9)
+
+
+def test_shifted_matches_numpy_complex():
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(40, 40)) + 1j * rng.normal(size=(40, 40))
+    assert_same_spectrum(shifted_qr_eigenvalues(matrix), np.linalg.eigvals(matrix))
+
+
+def test_shifted_finds_conjugate_pairs_and_real_spectra():
+    rotation = np.array([[0, -1, 2], [1, 0, 3], [0, 0, 5]])
+    assert_same_spectrum(shifted_qr_eigenvalues(rotation), np.array([5, 1j, -1j]))
+    triangular = np.triu(np.random.default_rng(1).normal(size=(100, 100)))
+    eigenvalues = shifted_qr_eigenvalues(triangular)
+    assert np.isrealobj(eigenvalues)
+    np.testing.assert_allclose(np.sort(eigenvalues), np.sort(np.diag(triangular)))
+
+
+@pytest.mark.parametrize("matrix", [np.zeros((100, 100)), np.eye(90), np.roll(np.eye(120), 1, axis=0)])
+def test_shifted_handles_structured_matrices(matrix):
+    # The cyclic shift has all its eigenvalues on the unit circle and stalls unshifted QR
+    assert_same_spectrum(shifted_qr_eigenvalues(matrix), np.linalg.eigvals(matrix))
+
+
+def test_unshifted_and_batched_match_numpy():
+    # Positive definite, so the unshifted iteration converges to the sorted diagonal
+    stack = np.random.default_rng(2).normal(size=(6, 4, 4))
+    stack = stack @ stack.transpose(0, 2, 1) + np.eye(4)
+    eigenvalues, iterations, converged = qr_algorithm_batched(stack)
+    assert converged.all()
+    for matrix, batch in zip(stack, eigenvalues):
+        expected = np.linalg.eigvalsh(matrix)
+        np.testing.assert_allclose(np.sort(batch), expected, rtol=1e-6)
+        np.testing.assert_allclose(np.sort(qr_algorithm(matrix)), expected, rtol=1e-6)
+        np.testing.assert_allclose(np.sort(qr_algorithm(matrix, method="shifted")), expected, rtol=1e-9)
@@ -0,0 +1,114 @@
+import os
+import pathlib
+import random
+
+import numpy as np
+import pytest
+
+from Quick_sort import QuickSort
+
+
+def random_lists():
+    rng = random.Random(0)
+    yield []
+    yield [1]
+    yield [rng.randrange(10) for _ in range(500)]  # Many duplicates
+    yield [rng.random() for _ in range(500)]
+    yield list(range(300))
+    yield list(range(300, 0, -1))
+    yield [rng.choice("abcdefgh") * rng.randrange(1, 4) for _ in range(200)]
+
+
+@pytest.mark.parametrize("mode", ["auto", "introsort", "functional"])
+def test_matches_baseline_functional_sort(mode):
+    for values in random_lists():
+        expected = QuickSort(list(values), mode="functional").sort()
+        assert expected == sorted(values)
+        assert QuickSort(list(values), mode=mode).sort() == expected
+
+
+def test_introsort_survives_adversarial_inputs():
+    # Organ pipe and all-equal inputs defeat naive pivots; the heapsort fallback keeps it O(n log n)
+    organ_pipe = list(range(2000)) + list(range(2000, 0, -1))
+    for values in (organ_pipe, [7] * 5000):
+        assert QuickSort(values, mode="introsort").sort() == sorted(values)
+
+
+def test_key_sort_is_stable():
+    words = ["pear", "apple", "fig", "banana", "cherry", "kiwi", "plum"]
+    for mode in ("introsort", "functional", "auto"):
+        assert QuickSort(words, mode=mode, key=len).sort() == sorted(words, key=len)
+
+
+def test_numpy_path_matches_introsort():
+    rng = np.random.default_rng(0)
+    for data in (rng.integers(-1000, 1000, 5000), rng.random(5000)):
+        result = QuickSort(data.tolist(), mode="numpy").sort()
+        assert result == QuickSort(data.tolist(), mode="introsort").sort()
+        assert np.array_equal(QuickSort(data).sort(), np.sort(data))
+    keyed = rng.normal(size=1000)
+    assert np.array_equal(QuickSort(keyed, key=np.abs).sort(), keyed[np.argsort(np.abs(keyed), kind="stable")])
+
+
+def test_large_ints_are_not_promoted_to_float():
+    for values in ([2**63, -1], [2**63, 5], [2**70, 3, -(2**70)], [2**53 + 1, 2**53, 0]):
+        result = QuickSort(values).sort()
+        assert result == sorted(values)
+        assert all(type(x) is int for x in result)
+
+
+def test_sort_returns_copy_unless_in_place():
+    values = [3, 1, 2]
+    assert QuickSort(values).sort() == [1, 2, 3]
+    assert values == [3, 1, 2]
+
+    array = np.array([3.0, 1.0, 2.0])
+    assert np.array_equal(QuickSort(array).sort(), [1.0, 2.0, 3.0])
+    assert np.array_equal(array, [3.0, 1.0, 2.0])
+
+    QuickSort(values, in_place=True).sort()
+    QuickSort(array, in_place=True).sort()
+    assert values == [1, 2, 3]
+    assert np.array_equal(array, [1.0, 2.0, 3.0])
+
+
+def test_parallel_matches_numpy():
+    data = np.random.default_rng(1).random(200_000)
+    result = QuickSort(data, mode="parallel", workers=2).sort()
+    assert np.array_equal(result, np.sort(data))
+    assert np.array_equal(QuickSort(data.tolist(), mode="parallel", workers=2).sort(), np.sort(data).tolist())
+
+
+@pytest.mark.parametrize("run_size", [100_000, 4096, 777])
+def test_external_sort_matches_numpy(tmp_path, run_size):
+    data = np.random.default_rng(2).random(100_000)
+    path = tmp_path / "data.bin"
+    data.tofile(path)
+    result = QuickSort(os.fspath(path), mode="external", run_size=run_size).sort()
+    assert np.array_equal(result, np.sort(data))
+    assert np.array_equal(np.fromfile(os.fspath(path) + ".sorted"), np.sort(data))
+
+
+def test_external_sort_with_key_is_stable(tmp_path):
+    data = np.random.default_rng(3).integers(0, 1000, 50_000)
+    path = tmp_path / "data.bin"
+    data.tofile(path)
+    result = QuickSort(path, dtype=np.int64, run_size=999, key=lambda values: values // 100).sort()
+    assert np.array_equal(result, data[np.argsort(data // 100, kind="stable")])
+
+
+def test_auto_mode_treats_str_as_sequence_and_path_as_file(tmp_path):
+    assert QuickSort("dcba").sort() == ["a", "b", "c", "d"]
+    path = pathlib.Path(tmp_path / "data.bin")
+    np.array([3.0, 1.0, 2.0]).tofile(path)
+    assert np.array_equal(QuickSort(path).sort(), [1.0, 2.0, 3.0])
+
+
+@pytest.mark.parametrize("run_size", [20_000, 50_000])
+def test_external_blocked_merge_with_key_is_stable(tmp_path, run_size):
+    # Runs far larger than one merge block, with long stretches of equal keys spanning blocks
+    data = np.random.default_rng(4).integers(0, 200_000, 200_000)
+    path = tmp_path / "data.bin"
+    data.tofile(path)
+    result = QuickSort(path, dtype=np.int64, run_size=run_size, key=lambda values: values // 100).sort()
+    assert np.array_equal(result, data[np.argsort(data // 100, kind="stable")])
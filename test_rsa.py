@@ -0,0 +1,176 @@
+import io
+import os
+import struct
+import time
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from RSA import (MAX_ENVELOPE_CHUNK_SIZE, KeyPool, KeyStore, KeyWorkerPool, decrypt_batch, envelope_decrypt,
+                 envelope_decrypt_bytes, envelope_encrypt, envelope_encrypt_bytes, oaep_padding, private_key_to_der,
+                 pss_padding, sign_batch)
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="module")
+def ciphertexts(private_key):
+    public_key = private_key.public_key()
+    return [(b"token-%d" % i, public_key.encrypt(b"token-%d" % i, oaep_padding())) for i in range(40)]
+
+
+class TrickleReader(io.BytesIO):
+    # Returns at most a few bytes per read, like a socket or pipe
+    def read(self, size=-1):
+        return super().read(min(size, 5) if size and size > 0 else size)
+
+
+def open_envelope(private_key, envelope, chunk_size):
+    # Decrypt by hand from the documented layout, with the primitives used directly
+    key_length = struct.unpack(">H", envelope[8:10])[0]
+    wrapped_key, prefix = envelope[10:10 + key_length], envelope[10 + key_length:17 + key_length]
+    header = envelope[:17 + key_length]
+    aes = AESGCM(private_key.decrypt(wrapped_key, oaep_padding()))
+    body = envelope[len(header):]
+    chunks = [body[i:i + chunk_size + 16] for i in range(0, len(body), chunk_size + 16)] or [b""]
+    return b"".join(aes.decrypt(prefix + struct.pack(">IB", i, i == len(chunks) - 1), chunk, header)
+                    for i, chunk in enumerate(chunks))
+
+
+@pytest.mark.parametrize("size", [0, 1, 99, 100, 101, 1000])
+def test_envelope_round_trip_matches_layout(private_key, size):
+    plaintext = os.urandom(size)
+    out = io.BytesIO()
+    envelope_encrypt(private_key.public_key(), TrickleReader(plaintext), out, chunk_size=100)
+    envelope = out.getvalue()
+    assert envelope[:8] == b"ENV1" + struct.pack(">I", 100)
+    assert open_envelope(private_key, envelope, 100) == plaintext
+
+    decrypted = io.BytesIO()
+    envelope_decrypt(private_key, TrickleReader(envelope), decrypted)
+    assert decrypted.getvalue() == plaintext
+    assert envelope_decrypt_bytes(private_key, envelope_encrypt_bytes(private_key.public_key(), plaintext)) == plaintext
+
+
+def test_envelope_rejects_tampering(private_key):
+    out = io.BytesIO()
+    envelope_encrypt(private_key.public_key(), io.BytesIO(os.urandom(400)), out, chunk_size=100)
+    envelope = out.getvalue()
+    header_size = 17 + private_key.key_size // 8
+    chunks = [envelope[header_size + i * 116:header_size + (i + 1) * 116] for i in range(4)]
+
+    flipped = bytearray(envelope)
+    flipped[-1] ^= 1
+    header_flipped = bytearray(envelope)
+    header_flipped[header_size - 1] ^= 1  # Last byte of the nonce prefix
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    assert len(envelope) == header_size + 4 * 116
+    for bad, key in [(bytes(flipped), private_key),
+                     (bytes(header_flipped), private_key),
+                     (envelope[:header_size] + chunks[1] + chunks[0] + chunks[2] + chunks[3], private_key),
+                     (envelope[:-116], private_key),  # Last chunk dropped
+                     (envelope[:-1], private_key),
+                     (envelope[:20], private_key),
+                     (b"ENV2" + envelope[4:], private_key),
+                     (envelope, other_key)]:
+        with pytest.raises(ValueError):
+            envelope_decrypt(key, io.BytesIO(bad), io.BytesIO())
+
+
+def test_envelope_chunk_size_is_bounded(private_key):
+    for chunk_size in (0, -1, MAX_ENVELOPE_CHUNK_SIZE + 1):
+        with pytest.raises(ValueError):
+            envelope_encrypt(private_key.public_key(), io.BytesIO(b"data"), io.BytesIO(), chunk_size=chunk_size)
+
+    class CountingReader(io.BytesIO):
+        largest = 0
+
+        def read(self, size=-1):
+            self.largest = max(self.largest, size)
+            return super().read(size)
+
+    envelope = envelope_encrypt_bytes(private_key.public_key(), b"data")
+    for forged in (0, MAX_ENVELOPE_CHUNK_SIZE + 1, 2**32 - 1):
+        src = CountingReader(envelope[:4] + struct.pack(">I", forged) + envelope[8:])
+        with pytest.raises(ValueError):
+            envelope_decrypt(private_key, src, io.BytesIO())
+        assert src.largest <= MAX_ENVELOPE_CHUNK_SIZE
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_matches_single_calls(private_key, ciphertexts, workers):
+    plaintexts = [plaintext for plaintext, _ in ciphertexts]
+    batch = [ciphertext for _, ciphertext in ciphertexts]
+    assert decrypt_batch(private_key, batch, workers=workers, chunksize=4) == plaintexts
+    assert decrypt_batch(private_key_to_der(private_key), batch, workers=workers, chunksize=4) == plaintexts
+    for message, signature in zip(plaintexts, sign_batch(private_key, plaintexts, workers=workers, chunksize=4)):
+        private_key.public_key().verify(signature, message, pss_padding(), hashes.SHA256())
+
+
+def test_worker_pool_is_reused_across_batches(private_key, ciphertexts):
+    plaintexts = [plaintext for plaintext, _ in ciphertexts]
+    batch = [ciphertext for _, ciphertext in ciphertexts]
+    with KeyWorkerPool(private_key, workers=2) as pool:
+        assert pool.decrypt(batch, chunksize=4) == plaintexts
+        processes = set(pool._executor._processes)
+        assert decrypt_batch(pool, batch, chunksize=4) == plaintexts
+        assert len(sign_batch(pool, plaintexts, chunksize=4)) == len(plaintexts)
+        assert set(pool._executor._processes) == processes  # Same workers, key not reloaded
+        assert pool.decrypt(batch[:3]) == plaintexts[:3]  # Small batches run in-process
+
+
+def test_key_store_caches_keys_and_pools(private_key, ciphertexts):
+    with KeyStore() as store:
+        store.add("main", private_key_to_der(private_key))
+        assert store.get("main") is store.get("main")
+        pool = store.worker_pool("main", workers=2)
+        assert store.worker_pool("main") is pool
+        assert pool.decrypt([ciphertexts[0][1]] * 10, chunksize=2) == [ciphertexts[0][0]] * 10
+
+        # Replacing the key retires the pool whose workers hold the old one
+        other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        store.add("main", private_key_to_der(other))
+        assert store.worker_pool("main") is not pool
+        assert store.worker_pool("main").private_key.private_numbers() == other.private_numbers()
+    assert not store._pools
+
+
+def test_get_or_create_generates_once(tmp_path):
+    path = os.fspath(tmp_path / "key.pem")
+    store = KeyStore()
+    key = store.get_or_create(path, key_size=1024)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    reloaded = KeyStore().get_or_create(path)
+    assert reloaded.private_numbers() == key.private_numbers()
+
+
+def test_key_pool_hands_out_pregenerated_keys():
+    with KeyPool(key_size=1024, high_water=2, workers=1) as pool:
+        while pool.metrics()["ready"] < 2:
+            time.sleep(0.01)
+        private_key, public_key = pool.get_keypair()
+        assert public_key.public_numbers() == private_key.public_key().public_numbers()
+        assert pool.metrics()["hits"] == 1
+
+
+def test_key_pool_reports_worker_errors():
+    # cryptography rejects keys under 1024 bits, inside the worker process
+    with KeyPool(key_size=512, high_water=2, workers=1) as pool:
+        while pool.metrics()["pending"]:
+            time.sleep(0.01)
+        with pytest.raises(ValueError):
+            pool.get_keypair()
+        assert pool.metrics()["misses"] == 0  # Raised the worker's error, not an inline attempt
+
+
+def test_key_pool_does_not_submit_after_close():
+    pool = KeyPool(key_size=1024, high_water=1, workers=1)
+    pool.close()
+    private_key, _ = pool.get_keypair()  # Generated inline, no refill on the shut-down executor
+    assert private_key.key_size == 1024
+    assert pool.metrics()["pending"] == 0
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from Week_8_CRC import CrcCcitt, crc_combine
+
+
+def bitwise_ccitt(data, poly=0x1021, init_crc=0xFFFF):
+    # One shift per message bit, MSB first: the reference the table must agree with
+    crc = init_crc
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly if crc & 0x8000 else crc << 1) & 0xFFFF
+    return crc
+
+
+@pytest.mark.parametrize("poly, init_crc", [(0x1021, 0xFFFF), (0x1021, 0x0000), (0x8005, 0x1D0F)])
+def test_incremental_matches_bitwise(poly, init_crc):
+    rng = random.Random(poly)
+    data = bytes(rng.randrange(256) for _ in range(500))
+    expected = bitwise_ccitt(data, poly, init_crc)
+    assert CrcCcitt(data, poly=poly, init_crc=init_crc).crc == expected
+
+    crc = CrcCcitt(poly=poly, init_crc=init_crc)
+    for start in range(0, len(data), 37):
+        crc.update(memoryview(data)[start:start + 37])
+    assert crc.crc == expected
+    assert crc.digest() == expected.to_bytes(2, "big")
+    assert crc.hexdigest() == f"{expected:04x}"
+
+
+def test_copy_is_independent():
+    crc = CrcCcitt(b"12345")
+    branch = crc.copy()
+    crc.update(b"6789")
+    assert crc.hexdigest() == "29b1"
+    assert branch.crc == CrcCcitt(b"12345").crc
+    branch.update(b"6789")
+    assert branch.crc == crc.crc
+
+
+@pytest.mark.parametrize("poly, init_crc", [(0x1021, 0xFFFF), (0x1021, 0x0000), (0x8005, 0x1D0F)])
+def test_combine_matches_whole_stream(poly, init_crc):
+    rng = random.Random(init_crc)
+    data = bytes(rng.randrange(256) for _ in range(3000))
+    whole = CrcCcitt(data, poly=poly, init_crc=init_crc).crc
+    for split in (0, 1, 2, 1000, 2999, 3000):
+        crc_a = CrcCcitt(data[:split], poly=poly, init_crc=init_crc).crc
+        crc_b = CrcCcitt(data[split:], poly=poly, init_crc=init_crc).crc
+        assert crc_combine(crc_a, crc_b, len(data) - split, poly=poly, init_crc=init_crc) == whole
+